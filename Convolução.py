@@ -1,23 +1,46 @@
+import queue
+import shutil
+import tempfile
+import threading
+import time
+
 import numpy as np
-from scipy import integrate, signal
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import tkinter as tk
-from tkinter import ttk, messagebox, Toplevel
+from tkinter import ttk, messagebox, filedialog, Toplevel
+
+# matplotlib (backend TkAgg), scipy e os módulos usados só por janelas secundárias
+# (exemplos, fluxo, varredura, memoria_externa) são importados no primeiro uso, para
+# que a janela principal apareça antes; a figura é criada depois que ela é mapeada
+# (ver ConvolutionApp._criar_graficos). Meça com: python benchmark.py inicio
+from cache_resultados import CacheResultados, chave_parametros, diretorio_cache_padrao
+from expressoes import compilar_expressao, criar_funcao_intervalo, constantes_numericas, substituir_constante
+from grafico import CamadaGrafico, completar_com_zeros, decimar_min_max
+from instrumentacao import Medicao, exportar_json, exportar_chrome_trace
+from nucleo import calcular_convolucao, relatorio_precisao, CalculoCancelado, METODOS_DISCRETOS, TIPOS_NUMERICOS
+from pipeline import PipelineConvolucao, ajustar_dominio_a_rede
 
-def gerar_sinal(func, xmin, xmax, N=1000):
-    t = np.linspace(xmin, xmax, N)
-    x = func(t)
-    return t, x
+# Modo interativo: N da prévia mostrada a cada movimento de slider e espera (ms) sem
+# movimento antes de refinar para o N pedido
+N_PREVIA = 512
+ATRASO_REFINO_MS = 150
+# Máximo de sliders de constantes por função
+MAX_SLIDERS_POR_FUNCAO = 8
+# Medições de desempenho guardadas na sessão (as mais antigas são descartadas)
+MAX_MEDICOES_SESSAO = 200
+# Varredura de parâmetro: número máximo de curvas desenhadas na cascata
+MAX_CURVAS_CASCATA = 40
+# Convolução em fluxo: blocos de saída aguardando o desenho (a thread espera se encher)
+MAX_BLOCOS_FILA_FLUXO = 16
+# Figura principal (polegadas e dpi): o espaço dela é reservado na janela antes de o
+# matplotlib ser carregado
+TAMANHO_FIGURA = (10, 8)
+DPI_FIGURA = 100
 
-def conv_continua(f, g, t_output):
-    # A função conv_continua agora recebe t_output, que é o domínio para a convolução
-    # Para cada ponto ti em t_output, calculamos a integral
-    y = np.array([
-        integrate.quad(lambda tau: f(tau) * g(ti - tau), -np.inf, np.inf)[0]
-        for ti in t_output
-    ])
-    return y
+def faixa_slider(valor):
+    """Faixa de um slider em torno do valor inicial: [0, 2·valor] (ou [2·valor, 0]), ou [-1, 1] para 0"""
+    if valor == 0:
+        return -1.0, 1.0
+    return min(0.0, 2 * valor), max(0.0, 2 * valor)
 
 class HelpDialog:
     def __init__(self, parent, title, content):
@@ -47,6 +70,912 @@ class HelpDialog:
         # Botão fechar
         ttk.Button(main_frame, text="Fechar", command=self.dialog.destroy).pack(pady=(10, 0))
 
+class PerformanceDialog:
+    """Relatório de desempenho dos cálculos da sessão, com exportação em JSON e Chrome trace"""
+    def __init__(self, parent, medicoes):
+        self.medicoes = medicoes
+        self.dialog = Toplevel(parent)
+        self.dialog.title("Desempenho")
+        self.dialog.geometry("640x560")
+        self.dialog.resizable(True, True)
+        
+        # Frame principal
+        main_frame = ttk.Frame(self.dialog)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Relatório com scroll
+        text_frame = ttk.Frame(main_frame)
+        text_frame.pack(fill=tk.BOTH, expand=True)
+        
+        scrollbar = ttk.Scrollbar(text_frame)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.text_widget = tk.Text(text_frame, wrap=tk.NONE, font=("Courier", 10), yscrollcommand=scrollbar.set)
+        self.text_widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.text_widget.yview)
+        
+        self.text_widget.insert(tk.END, self.conteudo())
+        self.text_widget.config(state=tk.DISABLED)
+        
+        # Botões
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        ttk.Button(button_frame, text="Exportar JSON", command=self.exportar_json).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(button_frame, text="Exportar Chrome Trace",
+                   command=self.exportar_chrome_trace).pack(side=tk.LEFT)
+        ttk.Button(button_frame, text="Fechar", command=self.dialog.destroy).pack(side=tk.RIGHT)
+    
+    def conteudo(self):
+        if not self.medicoes:
+            return "Nenhum cálculo medido ainda. Clique em 'Plotar/Convoluir'."
+        linhas = ["ÚLTIMO CÁLCULO", "", self.medicoes[-1].relatorio(), "", "", "SESSÃO (mais recentes primeiro)", ""]
+        for m in reversed(self.medicoes):
+            linhas.append(f"{m.data}  {m.duracao_total() * 1e3:10.1f} ms  {m.nome:<8s} "
+                          f"{m.info.get('method', '')} N={m.info.get('N', '')}")
+        return "\n".join(linhas)
+    
+    def exportar_json(self):
+        self._exportar(exportar_json, ".json", "JSON")
+    
+    def exportar_chrome_trace(self):
+        self._exportar(exportar_chrome_trace, ".trace.json", "Chrome trace")
+    
+    def _exportar(self, exportar, extensao, nome):
+        if not self.medicoes:
+            messagebox.showwarning("Aviso", "Nenhum cálculo medido ainda.", parent=self.dialog)
+            return
+        caminho = filedialog.asksaveasfilename(parent=self.dialog, defaultextension=extensao,
+                                               filetypes=[(nome, "*.json"), ("Todos", "*.*")])
+        if not caminho:
+            return
+        try:
+            exportar(self.medicoes, caminho)
+        except OSError as e:
+            messagebox.showerror("Erro", f"Erro ao exportar: {str(e)}", parent=self.dialog)
+
+class VarreduraDialog:
+    """Varredura de um parâmetro de g(t): família de convoluções em mapa de calor ou cascata"""
+    def __init__(self, parent, app):
+        self.app = app
+        self.resultado = None
+        self._fila = queue.Queue()
+        self._id_tarefa = 0
+        self.dialog = Toplevel(parent)
+        self.dialog.title("Varredura de Parâmetro")
+        self.dialog.geometry("760x680")
+        self.dialog.resizable(True, True)
+        
+        # Frame principal
+        main_frame = ttk.Frame(self.dialog)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        ttk.Label(main_frame, text="Use um parâmetro na expressão de g(t), ex.: np.exp(-a*t). f(t), os "
+                  "intervalos, o domínio e N vêm da janela principal.",
+                  wraplength=720, justify=tk.LEFT).pack(anchor=tk.W, pady=(0, 10))
+        
+        campos = ttk.Frame(main_frame)
+        campos.pack(fill=tk.X)
+        self.parametro_var = tk.StringVar(value="a")
+        self.inicio_var = tk.StringVar(value="0.1")
+        self.fim_var = tk.StringVar(value="10")
+        self.n_var = tk.StringVar(value="200")
+        for coluna, (rotulo, var, largura) in enumerate((("Parâmetro:", self.parametro_var, 6),
+                                                         ("Início:", self.inicio_var, 8),
+                                                         ("Fim:", self.fim_var, 8),
+                                                         ("Valores:", self.n_var, 6))):
+            ttk.Label(campos, text=rotulo).grid(row=0, column=2 * coluna, sticky=tk.W,
+                                                padx=(0 if coluna == 0 else 10, 0))
+            ttk.Entry(campos, textvariable=var, width=largura).grid(row=0, column=2 * coluna + 1, padx=(5, 0))
+        
+        ttk.Label(campos, text="Escala:").grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
+        self.escala_var = tk.StringVar(value="linear")
+        ttk.Combobox(campos, textvariable=self.escala_var, values=["linear", "log"], state="readonly",
+                     width=6).grid(row=1, column=1, pady=(5, 0))
+        self.visualizacao_var = tk.StringVar(value="calor")
+        ttk.Radiobutton(campos, text="Mapa de calor", value="calor", variable=self.visualizacao_var,
+                        command=self.desenhar).grid(row=1, column=2, columnspan=2, sticky=tk.W, padx=(10, 0),
+                                                    pady=(5, 0))
+        ttk.Radiobutton(campos, text="Cascata", value="cascata", variable=self.visualizacao_var,
+                        command=self.desenhar).grid(row=1, column=4, columnspan=2, sticky=tk.W, padx=(10, 0),
+                                                    pady=(5, 0))
+        
+        # Gráfico da família de convoluções
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        self.figura = Figure(figsize=(7, 5))
+        self.canvas = FigureCanvasTkAgg(self.figura, master=main_frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+        
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(main_frame, textvariable=self.status_var).pack(anchor=tk.W, pady=(5, 0))
+        
+        # Botões
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        ttk.Button(button_frame, text="Calcular", command=self.calcular).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(button_frame, text="Salvar .npz", command=self.salvar).pack(side=tk.LEFT)
+        ttk.Button(button_frame, text="Fechar", command=self.dialog.destroy).pack(side=tk.RIGHT)
+    
+    def calcular(self):
+        from varredura import conv_varredura, valores_parametro
+        try:
+            params = self.app._ler_parametros()
+            parametro = self.parametro_var.get().strip()
+            valores = valores_parametro(float(self.inicio_var.get()), float(self.fim_var.get()),
+                                        int(self.n_var.get()), self.escala_var.get())
+        except Exception as e:
+            messagebox.showerror("Erro", f"Erro na varredura: {str(e)}", parent=self.dialog)
+            return
+        
+        # Cálculo numa thread; um novo clique em "Calcular" descarta o anterior
+        self._id_tarefa += 1
+        id_tarefa = self._id_tarefa
+        fila = self._fila
+        medicao = Medicao("varredura", N=params["N"], f1=params["f1"], f2=params["f2"], valores=len(valores))
+        
+        def executar():
+            try:
+                resultado = conv_varredura(params, parametro, valores,
+                                           progresso=lambda fr: fila.put(("progresso", id_tarefa, fr)),
+                                           medicao=medicao)
+                fila.put(("resultado", id_tarefa, (resultado, parametro, medicao)))
+            except Exception as e:
+                fila.put(("erro", id_tarefa, e))
+        
+        threading.Thread(target=executar, daemon=True).start()
+        self.status_var.set("Calculando...")
+        self.dialog.after(50, self._verificar)
+    
+    def _verificar(self):
+        if not self.dialog.winfo_exists():
+            return
+        terminou = False
+        while True:
+            try:
+                tipo, id_tarefa, dados = self._fila.get_nowait()
+            except queue.Empty:
+                break
+            if id_tarefa != self._id_tarefa:
+                continue
+            if tipo == "progresso":
+                self.status_var.set(f"Calculando... {100 * dados:.0f}%")
+            elif tipo == "resultado":
+                self.resultado, self.parametro, medicao = dados
+                self.app._registrar_medicao(medicao)
+                self.desenhar()
+                self.status_var.set(f"{len(self.resultado['valores'])} convoluções em "
+                                    f"{medicao.duracao_total() * 1e3:.1f} ms")
+                terminou = True
+            elif tipo == "erro":
+                self.status_var.set("Erro")
+                messagebox.showerror("Erro", f"Erro na varredura: {str(dados)}", parent=self.dialog)
+                terminou = True
+        if not terminou:
+            self.dialog.after(50, self._verificar)
+    
+    def desenhar(self):
+        if self.resultado is None:
+            return
+        ty, y, valores = self.resultado["ty"], self.resultado["y"], self.resultado["valores"]
+        log = self.escala_var.get() == "log" and np.all(valores > 0)
+        self.figura.clear()
+        ax = self.figura.add_subplot(111)
+        if self.visualizacao_var.get() == "calor":
+            eixo_valores = np.log10(valores) if log else valores
+            imagem = ax.imshow(y, aspect="auto", origin="lower", interpolation="nearest", cmap="viridis",
+                               extent=(ty[0], ty[-1], eixo_valores[0], eixo_valores[-1]))
+            self.figura.colorbar(imagem, ax=ax, label="(f * g)(t)")
+            ax.set_ylabel(f"log10({self.parametro})" if log else self.parametro)
+        else:
+            # Cascata: até MAX_CURVAS_CASCATA curvas deslocadas na vertical, decimadas por pixel
+            indices = np.unique(np.linspace(0, len(valores) - 1, MAX_CURVAS_CASCATA).round().astype(int))
+            passo = 0.5 * max(float(np.max(np.abs(y[indices]), initial=0)), 1e-300)
+            largura = max(int(ax.bbox.width), 1)
+            from matplotlib import colormaps
+            cores = colormaps["viridis"]
+            for k, i in enumerate(indices):
+                t_dec, y_dec = decimar_min_max(ty, y[i], ty[0], ty[-1], largura)
+                ax.plot(t_dec, y_dec + k * passo, color=cores(k / max(len(indices) - 1, 1)), lw=1)
+            marcas = range(0, len(indices), max(len(indices) // 8, 1))
+            ax.set_yticks([k * passo for k in marcas])
+            ax.set_yticklabels([f"{valores[indices[k]]:.3g}" for k in marcas])
+            ax.set_ylabel(f"{self.parametro} (curvas deslocadas)")
+        ax.set_xlabel("t")
+        ax.set_title(f"Convolução f * g para {len(valores)} valores de {self.parametro}")
+        self.figura.tight_layout()
+        self.canvas.draw()
+    
+    def salvar(self):
+        if self.resultado is None:
+            messagebox.showwarning("Aviso", "Calcule a varredura primeiro.", parent=self.dialog)
+            return
+        caminho = filedialog.asksaveasfilename(parent=self.dialog, defaultextension=".npz",
+                                               filetypes=[("NumPy", "*.npz"), ("Todos", "*.*")])
+        if not caminho:
+            return
+        try:
+            np.savez(caminho, **self.resultado)
+        except OSError as e:
+            messagebox.showerror("Erro", f"Erro ao salvar: {str(e)}", parent=self.dialog)
+
+class CascataDialog:
+    """Convolução em cascata: f * g da janela principal seguida de mais estágios (f1 * f2 * f3 * ...)"""
+    def __init__(self, parent, app):
+        self.app = app
+        self.cascata = None
+        self._fila = queue.Queue()
+        self._id_tarefa = 0
+        self._linhas = []  # (frame, expressão, intervalo, x1, x2) de cada estágio extra
+        self.dialog = Toplevel(parent)
+        self.dialog.title("Convolução em Cascata")
+        self.dialog.geometry("760x720")
+        self.dialog.resizable(True, True)
+        
+        # Frame principal
+        main_frame = ttk.Frame(self.dialog)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        ttk.Label(main_frame, text="f1 e f2 são f(t) e g(t) da janela principal (com o domínio, N e a "
+                  "precisão de lá); os estágios abaixo continuam a cadeia. A cadeia inteira é calculada "
+                  "numa só passagem por FFT, e cada resultado intermediário só quando é escolhido.",
+                  wraplength=720, justify=tk.LEFT).pack(anchor=tk.W, pady=(0, 10))
+        
+        self.estagios_frame = ttk.Frame(main_frame)
+        self.estagios_frame.pack(fill=tk.X)
+        self.estagios_frame.grid_columnconfigure(1, weight=1)
+        self.adicionar_estagio("np.exp(-t)", "semi_inf_dir", "0", "")
+        
+        opcoes = ttk.Frame(main_frame)
+        opcoes.pack(fill=tk.X, pady=(5, 0))
+        ttk.Button(opcoes, text="+ Estágio", command=self.adicionar_estagio).pack(side=tk.LEFT)
+        ttk.Label(opcoes, text="Mostrar também:").pack(side=tk.LEFT, padx=(20, 5))
+        self.parcial_var = tk.StringVar(value="nenhum")
+        self.parcial_combo = ttk.Combobox(opcoes, textvariable=self.parcial_var, values=["nenhum"],
+                                          state="readonly", width=24)
+        self.parcial_combo.pack(side=tk.LEFT)
+        self.parcial_combo.bind("<<ComboboxSelected>>", lambda evento: self.desenhar())
+        
+        # Gráficos: amostras dos estágios e saída da cadeia
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        self.figura = Figure(figsize=(7, 5))
+        self.canvas = FigureCanvasTkAgg(self.figura, master=main_frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+        
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(main_frame, textvariable=self.status_var).pack(anchor=tk.W, pady=(5, 0))
+        
+        # Botões
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        ttk.Button(button_frame, text="Calcular", command=self.calcular).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(button_frame, text="Fechar", command=self.dialog.destroy).pack(side=tk.RIGHT)
+    
+    def adicionar_estagio(self, expressao="1", intervalo="infinito", x1="", x2=""):
+        frame = ttk.Frame(self.estagios_frame)
+        frame.grid_columnconfigure(1, weight=1)
+        variaveis = [tk.StringVar(value=valor) for valor in (expressao, intervalo, x1, x2)]
+        rotulo = ttk.Label(frame, width=4)
+        rotulo.grid(row=0, column=0, sticky=tk.W)
+        ttk.Entry(frame, textvariable=variaveis[0]).grid(row=0, column=1, sticky=tk.EW, padx=(5, 0))
+        ttk.Combobox(frame, textvariable=variaveis[1], values=["infinito", "semi_inf_esq", "semi_inf_dir", "finito"],
+                     state="readonly", width=12).grid(row=0, column=2, padx=(5, 0))
+        for coluna, (texto, var) in enumerate((("x1:", variaveis[2]), ("x2:", variaveis[3]))):
+            ttk.Label(frame, text=texto).grid(row=0, column=3 + 2 * coluna, padx=(10, 0))
+            ttk.Entry(frame, textvariable=var, width=6).grid(row=0, column=4 + 2 * coluna, padx=(5, 0))
+        linha = (frame, rotulo, *variaveis)
+        ttk.Button(frame, text="✕", width=3, command=lambda: self.remover_estagio(linha)).grid(row=0, column=7,
+                                                                                              padx=(5, 0))
+        self._linhas.append(linha)
+        self._reposicionar()
+    
+    def remover_estagio(self, linha):
+        self._linhas.remove(linha)
+        linha[0].destroy()
+        self._reposicionar()
+    
+    def _reposicionar(self):
+        for i, (frame, rotulo, *_) in enumerate(self._linhas):
+            rotulo.config(text=f"f{i + 3}:")
+            frame.grid(row=i, column=0, columnspan=2, sticky=tk.EW, pady=2)
+    
+    def calcular(self):
+        from cascata import CascataConvolucao
+        try:
+            params = self.app._ler_parametros()
+            params["estagios"] = [{"f": expressao.get(), "interval": intervalo.get(), "x1": x1.get(), "x2": x2.get()}
+                                  for _, _, expressao, intervalo, x1, x2 in self._linhas]
+        except Exception as e:
+            messagebox.showerror("Erro", f"Erro nos parâmetros: {str(e)}", parent=self.dialog)
+            return
+        
+        # Cálculo numa thread; um novo clique em "Calcular" descarta o anterior
+        self._id_tarefa += 1
+        id_tarefa = self._id_tarefa
+        fila = self._fila
+        medicao = Medicao("cascata", N=params["N"], estagios=len(params["estagios"]) + 2)
+        
+        def executar():
+            try:
+                cascata = CascataConvolucao(params, progresso=lambda fr: fila.put(("progresso", id_tarefa, fr)),
+                                            medicao=medicao)
+                fila.put(("resultado", id_tarefa, (cascata, medicao)))
+            except Exception as e:
+                fila.put(("erro", id_tarefa, e))
+        
+        threading.Thread(target=executar, daemon=True).start()
+        self.status_var.set("Calculando...")
+        self.dialog.after(50, self._verificar)
+    
+    def _verificar(self):
+        if not self.dialog.winfo_exists():
+            return
+        terminou = False
+        while True:
+            try:
+                tipo, id_tarefa, dados = self._fila.get_nowait()
+            except queue.Empty:
+                break
+            if id_tarefa != self._id_tarefa:
+                continue
+            if tipo == "progresso":
+                self.status_var.set(f"Calculando... {100 * dados:.0f}%")
+            elif tipo == "resultado":
+                from cascata import nome_cadeia
+                self.cascata, medicao = dados
+                self.app._registrar_medicao(medicao)
+                intermediarios = [nome_cadeia(k) for k in range(1, len(self.cascata) - 1)]
+                self.parcial_combo.config(values=["nenhum"] + intermediarios)
+                if self.parcial_var.get() not in intermediarios:
+                    self.parcial_var.set("nenhum")
+                self.desenhar()
+                self.status_var.set(f"{len(self.cascata)} estágios, FFT de {self.cascata.nfft} pontos, em "
+                                    f"{medicao.duracao_total() * 1e3:.1f} ms")
+                terminou = True
+            elif tipo == "erro":
+                self.status_var.set("Erro")
+                messagebox.showerror("Erro", f"Erro na cascata: {str(dados)}", parent=self.dialog)
+                terminou = True
+        if not terminou:
+            self.dialog.after(50, self._verificar)
+    
+    def desenhar(self):
+        if self.cascata is None:
+            return
+        from cascata import nome_cadeia
+        cascata = self.cascata
+        self.figura.clear()
+        ax_estagios, ax_saida = self.figura.subplots(2, 1)
+        largura = max(int(ax_estagios.bbox.width), 1)
+        for i, (t, x) in enumerate(cascata.amostras):
+            if t.size:
+                ax_estagios.plot(*decimar_min_max(t, x, t[0], t[-1], largura), label=f"f{i + 1}")
+        ax_estagios.set_title("Estágios")
+        ax_estagios.legend(loc="upper right")
+        ax_estagios.grid(True)
+        
+        escolhido = self.parcial_var.get()
+        for k in range(1, len(cascata) - 1):
+            if nome_cadeia(k) == escolhido:
+                t, y = cascata.parcial(k)  # calculado só agora, a partir dos espectros
+                ax_saida.plot(*decimar_min_max(t, y, t[0], t[-1], largura), color='gray', label=escolhido)
+        ax_saida.plot(*decimar_min_max(cascata.ty, cascata.y, cascata.ty[0], cascata.ty[-1], largura),
+                      color='green', label=nome_cadeia(len(cascata) - 1))
+        ax_saida.set_title("Convolução em cascata")
+        ax_saida.set_xlabel("t")
+        ax_saida.legend(loc="upper right")
+        ax_saida.grid(True)
+        self.figura.tight_layout()
+        self.canvas.draw()
+
+class FluxoDialog:
+    """Convolução em fluxo: f (expressão sem fim ou arquivo) em blocos, g como núcleo, gráfico rolante"""
+    def __init__(self, parent, app):
+        self.app = app
+        self._fila = queue.Queue(maxsize=MAX_BLOCOS_FILA_FLUXO)  # limita a memória entre thread e tela
+        self._parar = None
+        self.dialog = Toplevel(parent)
+        self.dialog.title("Convolução em Fluxo")
+        self.dialog.geometry("760x640")
+        self.dialog.resizable(True, True)
+        self.dialog.protocol("WM_DELETE_WINDOW", self.fechar)
+        
+        # Frame principal
+        main_frame = ttk.Frame(self.dialog)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        ttk.Label(main_frame, text="g(t) é amostrada uma vez, no intervalo recortado para [xmin, xmax], "
+                  "como núcleo; f(t) chega em blocos e a saída é calculada por overlap-save, com memória "
+                  "constante.",
+                  wraplength=720, justify=tk.LEFT).pack(anchor=tk.W, pady=(0, 10))
+        
+        campos = ttk.Frame(main_frame)
+        campos.pack(fill=tk.X)
+        campos.grid_columnconfigure(1, weight=1)
+        self.fonte_var = tk.StringVar(value="expressao")
+        ttk.Radiobutton(campos, text="f(t) da janela principal, a partir de xmin (sem fim)", value="expressao",
+                        variable=self.fonte_var).grid(row=0, column=0, columnspan=4, sticky=tk.W)
+        ttk.Radiobutton(campos, text="Arquivo (.npy, .txt/.csv ou float64 binário):", value="arquivo",
+                        variable=self.fonte_var).grid(row=1, column=0, sticky=tk.W)
+        self.arquivo_var = tk.StringVar(value="")
+        ttk.Entry(campos, textvariable=self.arquivo_var).grid(row=1, column=1, columnspan=2, sticky=tk.EW,
+                                                             padx=(5, 0))
+        ttk.Button(campos, text="Escolher...", command=self.escolher_arquivo).grid(row=1, column=3, padx=(5, 0))
+        
+        opcoes = ttk.Frame(main_frame)
+        opcoes.pack(fill=tk.X, pady=(5, 0))
+        xmin, xmax, N = float(app.xmin_var.get()), float(app.xmax_var.get()), int(app.n_var.get())
+        self.dt_var = tk.StringVar(value=f"{(xmax - xmin) / (N - 1):.6g}")
+        self.t0_var = tk.StringVar(value="0")
+        self.janela_var = tk.StringVar(value=f"{4 * (xmax - xmin):g}")
+        for coluna, (rotulo, var) in enumerate((("dt:", self.dt_var), ("t0 do arquivo:", self.t0_var),
+                                                ("Janela visível (t):", self.janela_var))):
+            ttk.Label(opcoes, text=rotulo).grid(row=0, column=2 * coluna, sticky=tk.W,
+                                                padx=(0 if coluna == 0 else 10, 0))
+            ttk.Entry(opcoes, textvariable=var, width=10).grid(row=0, column=2 * coluna + 1, padx=(5, 0))
+        self.tempo_real_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(opcoes, text="Tempo real (1 unidade de t = 1 s)",
+                        variable=self.tempo_real_var).grid(row=1, column=0, columnspan=4, sticky=tk.W, pady=(5, 0))
+        self.gravar_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(opcoes, text="Gravar a saída (float64 binário)",
+                        variable=self.gravar_var).grid(row=1, column=4, columnspan=2, sticky=tk.W, pady=(5, 0))
+        
+        # Gráfico rolante da saída
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        self.figura = Figure(figsize=(7, 4))
+        self.ax = self.figura.add_subplot(111)
+        self.ax.set_title("Saída (f * g)(t)")
+        self.ax.set_xlabel("t")
+        self.ax.grid(True, alpha=0.3)
+        (self.linha,) = self.ax.plot([], [], "g-", lw=1)
+        self.canvas = FigureCanvasTkAgg(self.figura, master=main_frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+        
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(main_frame, textvariable=self.status_var).pack(anchor=tk.W, pady=(5, 0))
+        
+        # Botões
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        self.iniciar_button = ttk.Button(button_frame, text="Iniciar", command=self.iniciar)
+        self.iniciar_button.pack(side=tk.LEFT, padx=(0, 10))
+        self.parar_button = ttk.Button(button_frame, text="Parar", command=self.parar, state="disabled")
+        self.parar_button.pack(side=tk.LEFT)
+        ttk.Button(button_frame, text="Fechar", command=self.fechar).pack(side=tk.RIGHT)
+    
+    def escolher_arquivo(self):
+        caminho = filedialog.askopenfilename(parent=self.dialog, filetypes=[
+            ("Amostras", "*.npy *.txt *.csv *.f64 *.bin *.raw"), ("Todos", "*.*")])
+        if caminho:
+            self.arquivo_var.set(caminho)
+            self.fonte_var.set("arquivo")
+    
+    def iniciar(self):
+        from fluxo import (JanelaRolante, blocos_de_arquivo, blocos_de_expressao, convoluir_fluxo,
+                           nucleo_dos_parametros, TAMANHO_BLOCO_PADRAO)
+        try:
+            params = self.app._ler_parametros()
+            dt = float(self.dt_var.get())
+            if dt <= 0:
+                raise ValueError("dt deve ser positivo")
+            t0_g, h = nucleo_dos_parametros(params, dt)
+            tempo_real = self.tempo_real_var.get()
+            # Em tempo real, blocos de ~50 ms para o gráfico andar suavemente
+            tamanho = int(min(max(0.05 / dt, 64), TAMANHO_BLOCO_PADRAO)) if tempo_real else TAMANHO_BLOCO_PADRAO
+            if self.fonte_var.get() == "arquivo":
+                t0_f = float(self.t0_var.get())
+                blocos = blocos_de_arquivo(self.arquivo_var.get(), tamanho)
+            else:
+                t0_f = params["xmin"]
+                func1, _ = criar_funcao_intervalo(params["f1"], params["f1_interval"], params["f1_x1"],
+                                                  params["f1_x2"])
+                blocos = blocos_de_expressao(func1, t0_f, dt, tamanho)
+            janela = JanelaRolante(max(int(float(self.janela_var.get()) / dt), 2))
+        except Exception as e:
+            messagebox.showerror("Erro", f"Erro ao iniciar o fluxo: {str(e)}", parent=self.dialog)
+            return
+        destino = None
+        if self.gravar_var.get():
+            destino = filedialog.asksaveasfilename(parent=self.dialog, defaultextension=".f64",
+                                                   filetypes=[("float64 binário", "*.f64"), ("Todos", "*.*")])
+            if not destino:
+                return
+        
+        self.parar()
+        self._parar = parar = threading.Event()
+        self._fila = fila = queue.Queue(maxsize=MAX_BLOCOS_FILA_FLUXO)
+        self._janela = janela
+        self._t0_saida = t0_f + t0_g
+        self._dt = dt
+        self._n_kernel = h.size
+        
+        def executar():
+            inicio = time.perf_counter()
+            try:
+                arquivo = open(destino, "wb") if destino else None
+                try:
+                    for indice, y in convoluir_fluxo(blocos, h, dt, imediato=tempo_real):
+                        if arquivo is not None:
+                            y.astype("<f8").tofile(arquivo)
+                        if tempo_real:
+                            atraso = (indice + y.size) * dt - (time.perf_counter() - inicio)
+                            if parar.wait(max(atraso, 0)):
+                                break
+                        # Fila cheia: espera a tela consumir (memória constante)
+                        while not parar.is_set():
+                            try:
+                                fila.put(("bloco", indice, y), timeout=0.1)
+                                break
+                            except queue.Full:
+                                pass
+                        if parar.is_set():
+                            break
+                finally:
+                    if arquivo is not None:
+                        arquivo.close()
+                mensagem = ("fim", None, None)
+            except Exception as e:
+                mensagem = ("erro", None, e)
+            try:
+                fila.put(mensagem, timeout=1.0)
+            except queue.Full:
+                pass  # janela fechada com a fila cheia
+        
+        threading.Thread(target=executar, daemon=True).start()
+        self.iniciar_button.config(state="disabled")
+        self.parar_button.config(state="normal")
+        self.status_var.set(f"Núcleo de {h.size} amostras; processando...")
+        self.dialog.after(50, self._atualizar)
+    
+    def _atualizar(self):
+        if not self.dialog.winfo_exists() or self._parar is None:
+            return
+        fila = self._fila
+        n_saida = None
+        terminou = False
+        while True:
+            try:
+                tipo, indice, dados = fila.get_nowait()
+            except queue.Empty:
+                break
+            if tipo == "bloco":
+                self._janela.adicionar(dados)
+                n_saida = indice + dados.size
+            elif tipo == "erro":
+                messagebox.showerror("Erro", f"Erro no fluxo: {str(dados)}", parent=self.dialog)
+                terminou = True
+            else:
+                terminou = True
+        if n_saida is not None:
+            primeira, y = self._janela.valores()
+            t = self._t0_saida + (primeira + np.arange(y.size)) * self._dt
+            self.linha.set_data(*decimar_min_max(t, y, t[0], t[-1], max(int(self.ax.bbox.width), 1)))
+            self.ax.relim()
+            self.ax.autoscale_view()
+            self.canvas.draw_idle()
+            self.status_var.set(f"{n_saida:,} amostras de saída (t = {self._t0_saida + n_saida * self._dt:.6g})"
+                                .replace(",", "."))
+        if terminou:
+            self._parar = None
+            self.iniciar_button.config(state="normal")
+            self.parar_button.config(state="disabled")
+            self.status_var.set(self.status_var.get() + " — fim")
+        else:
+            self.dialog.after(50, self._atualizar)
+    
+    def parar(self):
+        if self._parar is not None:
+            self._parar.set()
+    
+    def fechar(self):
+        self.parar()
+        self.dialog.destroy()
+
+class AnimacaoDialog:
+    """Animação da convolução nos gráficos da janela principal: g(t - τ) deslizando sobre f(τ)"""
+    def __init__(self, parent, app, quadros):
+        from animacao import DesenhoAnimacao, FPS_PADRAO
+        self.app = app
+        self._fps_padrao = FPS_PADRAO
+        self.quadros = quadros
+        self.quadro = 0
+        self._agendado = None
+        self._movendo_escala = False
+        self._cancelar_exportacao = None
+        self._fechado = False
+        self.dialog = Toplevel(parent)
+        self.dialog.title("Animação da Convolução")
+        self.dialog.geometry("560x230")
+        self.dialog.resizable(True, False)
+        self.dialog.protocol("WM_DELETE_WINDOW", self.fechar)
+        
+        # Frame principal
+        main_frame = ttk.Frame(self.dialog)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        ttk.Label(main_frame, text="No gráfico de f: g(t - τ) em vermelho e a área de f(τ)·g(t - τ) em verde, "
+                  "que é o valor de (f * g)(t) desenhado no gráfico da convolução.",
+                  wraplength=520, justify=tk.LEFT).pack(anchor=tk.W, pady=(0, 10))
+        
+        self.posicao_var = tk.DoubleVar(value=0)
+        ttk.Scale(main_frame, from_=0, to=len(quadros) - 1, variable=self.posicao_var,
+                  command=self.ao_arrastar).pack(fill=tk.X)
+        
+        campos = ttk.Frame(main_frame)
+        campos.pack(fill=tk.X, pady=(10, 0))
+        ttk.Label(campos, text="Quadros/s:").pack(side=tk.LEFT)
+        self.fps_var = tk.StringVar(value=str(FPS_PADRAO))
+        ttk.Entry(campos, textvariable=self.fps_var, width=6).pack(side=tk.LEFT, padx=(5, 15))
+        self.exportacao_var = tk.DoubleVar(value=0.0)
+        ttk.Progressbar(campos, variable=self.exportacao_var, maximum=100).pack(side=tk.LEFT, fill=tk.X,
+                                                                               expand=True)
+        
+        self.status_var = tk.StringVar()
+        ttk.Label(main_frame, textvariable=self.status_var).pack(anchor=tk.W, pady=(5, 0))
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        self.tocar_button = ttk.Button(button_frame, text="▶ Tocar", command=self.alternar)
+        self.tocar_button.pack(side=tk.LEFT, padx=(0, 10))
+        self.exportar_button = ttk.Button(button_frame, text="Exportar GIF/vídeo", command=self.exportar)
+        self.exportar_button.pack(side=tk.LEFT)
+        ttk.Button(button_frame, text="Fechar", command=self.fechar).pack(side=tk.RIGHT)
+        
+        # Gráfico de f passa a mostrar todo o percurso de g(t - τ); a convolução fica
+        # esmaecida, com a parte já percorrida por cima. Tudo é restaurado em fechar().
+        ax_tau, ax_saida = app.ax1, app.ax3
+        self._limites = (ax_tau.get_xlim(), ax_tau.get_ylim())
+        self._alfa_saida = app.l3.get_alpha()
+        ax_tau.set_xlim(*quadros.limites_tau())
+        ylim = ax_tau.get_ylim()
+        inferior, superior = quadros.limites_verticais()
+        ax_tau.set_ylim(min(ylim[0], inferior), max(ylim[1], superior))
+        app.l3.set_alpha(0.3)
+        self.desenho = DesenhoAnimacao(quadros, ax_tau, ax_saida, blit=True)
+        app.canvas.draw()  # fundo novo para o blitting dos quadros
+        self.mostrar(0)
+    
+    def _ler_fps(self):
+        try:
+            fps = float(self.fps_var.get())
+        except ValueError:
+            fps = 0
+        if not 0 < fps <= 120:
+            fps = self._fps_padrao
+            self.fps_var.set(str(fps))
+        return fps
+    
+    def mostrar(self, q):
+        self.quadro = q
+        self.desenho.mostrar(q)
+        self._movendo_escala = True
+        self.posicao_var.set(q)
+        self._movendo_escala = False
+        self.status_var.set(f"Quadro {q + 1} de {len(self.quadros)}")
+    
+    def ao_arrastar(self, valor):
+        if self._movendo_escala:
+            return
+        q = int(round(float(valor)))
+        if q != self.quadro:
+            self.mostrar(q)
+        if self._agendado is not None:
+            # Tocando: a contagem de tempo recomeça no quadro escolhido
+            self._quadro_inicial = q
+            self._inicio = time.perf_counter()
+    
+    def alternar(self):
+        if self._agendado is None:
+            self.tocar()
+        else:
+            self.pausar()
+    
+    def tocar(self):
+        self._fps = self._ler_fps()
+        if self.quadro >= len(self.quadros) - 1:
+            self.quadro = 0
+        self._quadro_inicial = self.quadro
+        self._inicio = time.perf_counter()
+        self.tocar_button.config(text="⏸ Pausar")
+        self._passo()
+    
+    def _passo(self):
+        # O quadro sai do relógio, não da contagem de chamadas: se um quadro atrasar,
+        # os seguintes são pulados e a animação mantém a velocidade
+        avancados = int((time.perf_counter() - self._inicio) * self._fps)
+        q = self._quadro_inicial + avancados
+        if q >= len(self.quadros):
+            self.mostrar(len(self.quadros) - 1)
+            self.pausar()
+            return
+        if q != self.quadro:
+            self.mostrar(q)
+        espera = (avancados + 1) / self._fps - (time.perf_counter() - self._inicio)
+        self._agendado = self.dialog.after(max(1, int(espera * 1000)), self._passo)
+    
+    def pausar(self):
+        if self._agendado is not None:
+            self.dialog.after_cancel(self._agendado)
+            self._agendado = None
+        self.tocar_button.config(text="▶ Tocar")
+    
+    def exportar(self):
+        from animacao import exportar_animacao
+        caminho = filedialog.asksaveasfilename(parent=self.dialog, defaultextension=".gif",
+                                               filetypes=[("GIF", "*.gif"), ("Vídeo MP4 (ffmpeg)", "*.mp4"),
+                                                          ("Todos", "*.*")])
+        if not caminho:
+            return
+        fps = self._ler_fps()
+        quadros = self.quadros
+        self._cancelar_exportacao = cancelar = threading.Event()
+        fila = queue.Queue()
+        
+        def progresso(fracao):
+            if cancelar.is_set():
+                raise CalculoCancelado()
+            fila.put(("progresso", fracao))
+        
+        def executar():
+            try:
+                fila.put(("pronto", exportar_animacao(quadros, caminho, fps, progresso)))
+            except CalculoCancelado:
+                fila.put(("cancelado", None))
+            except Exception as e:
+                fila.put(("erro", e))
+        
+        threading.Thread(target=executar, daemon=True).start()
+        self.exportar_button.config(state="disabled")
+        self.exportacao_var.set(0.0)
+        self.app.root.after(100, self._verificar_exportacao, fila, caminho)
+    
+    def _verificar_exportacao(self, fila, caminho):
+        if self._fechado:
+            return  # a exportação foi cancelada em fechar()
+        while True:
+            try:
+                tipo, dados = fila.get_nowait()
+            except queue.Empty:
+                self.app.root.after(100, self._verificar_exportacao, fila, caminho)
+                return
+            if tipo == "progresso":
+                self.exportacao_var.set(100 * dados)
+                continue
+            self.exportar_button.config(state="normal")
+            if tipo == "pronto":
+                self.status_var.set(f"Exportado em {dados:.1f} s: {caminho}")
+            elif tipo == "erro":
+                messagebox.showerror("Erro", f"Erro ao exportar: {str(dados)}", parent=self.dialog)
+            return
+    
+    def fechar(self):
+        if self._fechado:
+            return
+        self._fechado = True
+        self.pausar()
+        if self._cancelar_exportacao is not None:
+            self._cancelar_exportacao.set()
+        self.desenho.remover()
+        xlim, ylim = self._limites
+        self.app.ax1.set_xlim(*xlim)
+        self.app.ax1.set_ylim(*ylim)
+        self.app.l3.set_alpha(self._alfa_saida)
+        self.app.canvas.draw()
+        self.app._animacao = None
+        self.dialog.destroy()
+
+def criar_barra_ferramentas(canvas, window, camada):
+    """Barra de zoom/pan do matplotlib; ao salvar, grava as linhas com todos os pontos
+
+    A classe é definida aqui dentro porque depende do backend TkAgg, que só é
+    importado quando o primeiro gráfico é criado.
+    """
+    from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
+    
+    class BarraFerramentas(NavigationToolbar2Tk):
+        def __init__(self, canvas, window, camada):
+            self.camada = camada
+            super().__init__(canvas, window, pack_toolbar=False)
+        
+        def save_figure(self, *args):
+            return self.camada.salvar_com_linhas(lambda: super(BarraFerramentas, self).save_figure(*args))
+    
+    return BarraFerramentas(canvas, window, camada)
+
+class SlidersDialog:
+    """Sliders para as constantes de f e g, os limites x1/x2 e o domínio (modo interativo)"""
+    def __init__(self, parent, app):
+        self.app = app
+        self.dialog = Toplevel(parent)
+        self.dialog.title("Modo Interativo")
+        self.dialog.geometry("560x600")
+        self.dialog.resizable(True, True)
+        
+        # Frame principal
+        main_frame = ttk.Frame(self.dialog)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        ttk.Label(main_frame, text="Mova um slider: a prévia aparece na hora e é refinada ao parar.",
+                  wraplength=520, justify=tk.LEFT).pack(anchor=tk.W, pady=(0, 10))
+        
+        self.corpo = ttk.Frame(main_frame)
+        self.corpo.pack(fill=tk.BOTH, expand=True)
+        self.corpo.grid_columnconfigure(1, weight=1)
+        
+        # Botões
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        ttk.Button(button_frame, text="Recarregar Parâmetros", command=self.montar).pack(side=tk.LEFT)
+        ttk.Button(button_frame, text="Fechar", command=self.dialog.destroy).pack(side=tk.RIGHT)
+        
+        self.montar()
+    
+    def montar(self):
+        """(Re)cria os sliders a partir dos valores atuais dos campos da janela principal"""
+        for widget in self.corpo.winfo_children():
+            widget.destroy()
+        self._linha = 0
+        app = self.app
+        
+        # Constantes numéricas das expressões
+        for nome, func_var in (("f(t)", app.func1_var), ("g(t)", app.func2_var)):
+            texto = func_var.get()
+            try:
+                constantes = constantes_numericas(texto)[:MAX_SLIDERS_POR_FUNCAO]
+            except SyntaxError:
+                continue
+            for i, (inicio, fim, valor) in enumerate(constantes):
+                trecho = texto[max(0, inicio - 8):fim + 8]
+                self._adicionar(f"{nome}: …{trecho}…", valor,
+                                lambda v, var=func_var, i=i: var.set(substituir_constante(var.get(), i, v)))
+        
+        # Limites dos intervalos em uso
+        for nome, tipo_var, x1_var, x2_var in (("f", app.f1_interval_type, app.f1_x1_var, app.f1_x2_var),
+                                               ("g", app.f2_interval_type, app.f2_x1_var, app.f2_x2_var)):
+            tipo = tipo_var.get()
+            if tipo in ("semi_inf_dir", "finito"):
+                self._adicionar_campo(f"{nome}: x1", x1_var)
+            if tipo in ("semi_inf_esq", "finito"):
+                self._adicionar_campo(f"{nome}: x2", x2_var)
+        
+        # Domínio
+        self._adicionar_campo("xmin", app.xmin_var)
+        self._adicionar_campo("xmax", app.xmax_var)
+    
+    def _adicionar_campo(self, rotulo, var):
+        try:
+            valor = float(var.get())
+        except ValueError:
+            return
+        self._adicionar(rotulo, valor, lambda v, var=var: var.set(f"{v:.6g}"))
+    
+    def _adicionar(self, rotulo, valor, aplicar):
+        minimo, maximo = faixa_slider(valor)
+        escala_var = tk.DoubleVar(value=valor)
+        valor_label = ttk.Label(self.corpo, text=f"{valor:.4g}", width=10)
+        
+        def mover(_texto):
+            v = escala_var.get()
+            valor_label.config(text=f"{v:.4g}")
+            try:
+                aplicar(v)
+            except (IndexError, SyntaxError):
+                return  # expressão editada desde que os sliders foram criados
+            self.app.parametro_alterado()
+        
+        ttk.Label(self.corpo, text=rotulo).grid(row=self._linha, column=0, sticky=tk.W, pady=2)
+        ttk.Scale(self.corpo, from_=minimo, to=maximo, variable=escala_var,
+                  command=mover).grid(row=self._linha, column=1, sticky=tk.EW, padx=(5, 5), pady=2)
+        valor_label.grid(row=self._linha, column=2, sticky=tk.E, pady=2)
+        self._linha += 1
+
 class ExamplesDialog:
     def __init__(self, parent, callback):
         self.callback = callback
@@ -74,249 +1003,9 @@ class ExamplesDialog:
         self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.config(command=self.listbox.yview)
         
-        # Exemplos criativos
-        self.examples = [
-            {
-                "name": "🔔 Sino e Pulso - Reverberação",
-                "description": "Simula o eco de um sino tocando em um ambiente fechado",
-                "f1": "np.exp(-t**2) * np.cos(5*t)",
-                "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
-                "f2": "1",
-                "f2_interval": "finito", "f2_x1": "-0.5", "f2_x2": "0.5"
-            },
-            {
-                "name": "📡 Radar - Pulso e Eco",
-                "description": "Sistema de radar detectando um objeto distante",
-                "f1": "1",
-                "f1_interval": "finito", "f1_x1": "-1", "f1_x2": "1",
-                "f2": "np.exp(-2*t**2)",
-                "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
-            },
-            {
-                "name": "🎵 Nota Musical - Harmônicos",
-                "description": "Convolução de duas ondas senoidais com frequências diferentes",
-                "f1": "np.cos(2*np.pi*t)",
-                "f1_interval": "finito", "f1_x1": "-2", "f1_x2": "2",
-                "f2": "np.cos(4*np.pi*t)",
-                "f2_interval": "finito", "f2_x1": "-1", "f2_x2": "1"
-            },
-            {
-                "name": "⚡ Circuito RC - Resposta ao Impulso",
-                "description": "Resposta de um circuito RC a um pulso de entrada",
-                "f1": "1",
-                "f1_interval": "finito", "f1_x1": "0", "f1_x2": "1",
-                "f2": "np.exp(-t)",
-                "f2_interval": "semi_inf_dir", "f2_x1": "0", "f2_x2": ""
-            },
-            {
-                "name": "🌊 Onda Modulada - AM",
-                "description": "Modulação em amplitude de uma portadora senoidal",
-                "f1": "np.cos(10*np.pi*t)",
-                "f1_interval": "finito", "f1_x1": "-1", "f1_x2": "1",
-                "f2": "np.exp(-t**2/2)",
-                "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
-            },
-            {
-                "name": "🔊 Alto-falante - Resposta de Frequência",
-                "description": "Resposta de um alto-falante a diferentes frequências",
-                "f1": "np.sin(3*np.pi*t) * np.exp(-0.5*t**2)",
-                "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
-                "f2": "np.cos(np.pi*t)",
-                "f2_interval": "finito", "f2_x1": "-2", "f2_x2": "2"
-            },
-            {
-                "name": "📶 Filtro Passa-Baixa",
-                "description": "Filtragem de um sinal ruidoso com filtro gaussiano",
-                "f1": "np.cos(8*np.pi*t) + 0.5*np.cos(20*np.pi*t)",
-                "f1_interval": "finito", "f1_x1": "-2", "f1_x2": "2",
-                "f2": "np.exp(-4*t**2)",
-                "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
-            },
-            {
-                "name": "🎯 Detecção de Borda",
-                "description": "Operação de detecção de bordas em processamento de sinais",
-                "f1": "np.where((t>-1)&(t<0), 1, np.where((t>=0)&(t<1), -1, 0))",
-                "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
-                "f2": "np.where((t>-2)&(t<2), 1, 0)",
-                "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
-            },
-            {
-                "name": "🌡️ Sensor de Temperatura",
-                "description": "Resposta de um sensor térmico a mudanças de temperatura",
-                "f1": "np.where(t>=0, t*np.exp(-t), 0)",
-                "f1_interval": "semi_inf_dir", "f1_x1": "0", "f1_x2": "",
-                "f2": "np.exp(-2*t**2)",
-                "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
-            },
-            {
-                "name": "🎸 Corda de Violão",
-                "description": "Vibração de uma corda com amortecimento",
-                "f1": "np.cos(6*np.pi*t) * np.exp(-0.2*np.abs(t))",
-                "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
-                "f2": "np.exp(-t**2)",
-                "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
-            },
-            {
-                "name": "📸 Flash Fotográfico",
-                "description": "Resposta de um sensor de imagem a um flash de luz",
-                "f1": "np.exp(-5*t**2)",
-                "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
-                "f2": "np.where((t>=0)&(t<0.1), 10, 0)",
-                "f2_interval": "semi_inf_dir", "f2_x1": "0", "f2_x2": ""
-            },
-            {
-                "name": "🚗 Suspensão Automotiva",
-                "description": "Resposta de um amortecedor a um impacto na estrada",
-                "f1": "np.where(t>=0, np.exp(-3*t) * np.cos(8*t), 0)",
-                "f1_interval": "semi_inf_dir", "f1_x1": "0", "f1_x2": "",
-                "f2": "np.where((t>-0.2)&(t<0.2), 1, 0)",
-                "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
-            },
-            {
-                "name": "🌐 Antena de Rádio",
-                "description": "Transmissão de sinal através de uma antena dipolo",
-                "f1": "np.cos(20*np.pi*t)",
-                "f1_interval": "finito", "f1_x1": "-0.5", "f1_x2": "0.5",
-                "f2": "np.sinc(5*t)",
-                "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
-            },
-            {
-                "name": "🏥 Eletrocardiograma",
-                "description": "Processamento de sinal cardíaco através de filtro",
-                "f1": "np.exp(-t**2) * (1 + 0.5*np.cos(4*np.pi*t))",
-                "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
-                "f2": "np.where((t>-0.1)&(t<0.1), 1, 0)",
-                "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
-            },
-            {
-                "name": "🌊 Tsunami - Propagação",
-                "description": "Propagação de ondas sísmicas no oceano",
-                "f1": "np.exp(-0.1*t**2) * np.cos(np.pi*t)",
-                "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
-                "f2": "np.where(t>=0, t**2 * np.exp(-t), 0)",
-                "f2_interval": "semi_inf_dir", "f2_x1": "0", "f2_x2": ""
-            },
-            {
-                "name": "🎤 Microfone Direcional",
-                "description": "Captação de som com padrão direcional",
-                "f1": "np.cos(15*np.pi*t) * np.exp(-2*np.abs(t))",
-                "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
-                "f2": "np.exp(-t**2/4)",
-                "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
-            },
-            {
-                "name": "🛰️ Comunicação Satelital",
-                "description": "Modulação de sinal para transmissão espacial",
-                "f1": "np.cos(50*np.pi*t)",
-                "f1_interval": "finito", "f1_x1": "-1", "f1_x2": "1",
-                "f2": "np.where((t>-0.05)&(t<0.05), np.cos(100*np.pi*t), 0)",
-                "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
-            },
-            {
-                "name": "⚙️ Engrenagem Mecânica",
-                "description": "Vibração de engrenagens em transmissão",
-                "f1": "np.where(t>=0, np.exp(-0.5*t) * np.sin(12*np.pi*t), 0)",
-                "f1_interval": "semi_inf_dir", "f1_x1": "0", "f1_x2": "",
-                "f2": "np.sum([np.where((t>k*0.1)&(t<k*0.1+0.05), 1, 0) for k in range(20)], axis=0)",
-                "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
-            },
-            {
-                "name": "🔬 Microscópio Óptico",
-                "description": "Função de espalhamento pontual de lente",
-                "f1": "np.exp(-25*t**2)",
-                "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
-                "f2": "np.where((t>-0.1)&(t<0.1), np.sinc(20*t), 0)",
-                "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
-            },
-            {
-                "name": "🌡️ Termopar Industrial",
-                "description": "Resposta térmica com constante de tempo",
-                "f1": "np.where(t>=0, 1 - np.exp(-2*t), 0)",
-                "f1_interval": "semi_inf_dir", "f1_x1": "0", "f1_x2": "",
-                "f2": "np.where((t>0)&(t<5), 1, 0)",
-                "f2_interval": "semi_inf_dir", "f2_x1": "0", "f2_x2": ""
-            },
-            {
-                "name": "🎺 Instrumento de Sopro",
-                "description": "Resposta acústica de tubo ressonante",
-                "f1": "np.cos(8*np.pi*t) * np.exp(-np.abs(t)/2)",
-                "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
-                "f2": "np.where((t>-1)&(t<1), np.cos(np.pi*t/2), 0)",
-                "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
-            },
-            {
-                "name": "🌪️ Detector de Turbulência",
-                "description": "Análise de fluxo de ar turbulento",
-                "f1": "np.random.normal(0, 0.1, len(t)) + np.cos(3*np.pi*t)",
-                "f1_interval": "finito", "f1_x1": "-3", "f1_x2": "3",
-                "f2": "np.exp(-t**2/0.5)",
-                "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
-            },
-            {
-                "name": "🔋 Carregador de Bateria",
-                "description": "Curva de carga com controle de corrente",
-                "f1": "np.where(t>=0, np.exp(-0.3*t), 0)",
-                "f1_interval": "semi_inf_dir", "f1_x1": "0", "f1_x2": "",
-                "f2": "np.where((t>0)&(t<2), t/2, np.where((t>=2)&(t<4), 1, 0))",
-                "f2_interval": "semi_inf_dir", "f2_x1": "0", "f2_x2": ""
-            },
-            {
-                "name": "🎨 Scanner de Imagem",
-                "description": "Varredura óptica com função de linha",
-                "f1": "np.where((t>-0.5)&(t<0.5), 1, 0)",
-                "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
-                "f2": "np.exp(-10*t**2) * np.cos(30*np.pi*t)",
-                "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
-            },
-            {
-                "name": "🌈 Prisma Óptico",
-                "description": "Dispersão cromática da luz branca",
-                "f1": "np.sum([np.cos(2*np.pi*f*t) for f in [1,2,3,4,5]], axis=0)",
-                "f1_interval": "finito", "f1_x1": "-2", "f1_x2": "2",
-                "f2": "np.exp(-t**2) * np.cos(np.pi*t)",
-                "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
-            },
-            {
-                "name": "🚀 Propulsão de Foguete",
-                "description": "Impulso específico com queima de combustível",
-                "f1": "np.where((t>=0)&(t<10), np.exp(-t/5), 0)",
-                "f1_interval": "semi_inf_dir", "f1_x1": "0", "f1_x2": "",
-                "f2": "np.where((t>-1)&(t<1), 1-np.abs(t), 0)",
-                "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
-            },
-            {
-                "name": "🧲 Campo Magnético",
-                "description": "Resposta de bobina a campo magnético variável",
-                "f1": "np.cos(2*np.pi*t) * np.exp(-0.1*t**2)",
-                "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
-                "f2": "np.where(t>=0, t * np.exp(-4*t), 0)",
-                "f2_interval": "semi_inf_dir", "f2_x1": "0", "f2_x2": ""
-            },
-            {
-                "name": "🌊 Sonar Submarino",
-                "description": "Ecolocalização em ambiente aquático",
-                "f1": "np.cos(40*np.pi*t) * np.exp(-t**2/0.1)",
-                "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
-                "f2": "np.where((t>2)&(t<2.1), 0.5, 0)",
-                "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
-            },
-            {
-                "name": "🎯 Laser Pulsado",
-                "description": "Pulso de laser com dispersão temporal",
-                "f1": "np.exp(-50*t**2)",
-                "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
-                "f2": "np.where(t>=0, np.exp(-10*t) * np.cos(100*np.pi*t), 0)",
-                "f2_interval": "semi_inf_dir", "f2_x1": "0", "f2_x2": ""
-            },
-            {
-                "name": "🔊 Cancelamento de Ruído",
-                "description": "Filtro adaptativo para cancelar ruído ambiente",
-                "f1": "np.cos(6*np.pi*t) + 0.3*np.cos(18*np.pi*t)",
-                "f1_interval": "finito", "f1_x1": "-1", "f1_x2": "1",
-                "f2": "np.exp(-2*t**2) * np.cos(6*np.pi*t)",
-                "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
-            }
-        ]
+        # Exemplos criativos (a tabela só é carregada quando a janela é aberta)
+        from exemplos import EXEMPLOS
+        self.examples = EXEMPLOS
         
         # Adicionar exemplos à lista
         for i, example in enumerate(self.examples):
@@ -352,6 +1041,9 @@ class ExamplesDialog:
         if selection:
             index = selection[0]
             example = self.examples[index]
+            # Pré-compila as expressões do exemplo (ficam no cache para o primeiro cálculo)
+            compilar_expressao(example["f1"])
+            compilar_expressao(example["f2"])
             self.callback(example)
             self.dialog.destroy()
         else:
@@ -366,24 +1058,37 @@ class ConvolutionApp:
         self.root.grid_rowconfigure(0, weight=1)
         self.root.grid_columnconfigure(0, weight=1)
         
-        # Configuração da figura matplotlib
-        self.fig, self.axes = plt.subplots(3, 1, figsize=(10, 8))
-        self.ax1, self.ax2, self.ax3 = self.axes
+        # A figura matplotlib só é criada depois que a janela aparece (_criar_graficos);
+        # um resultado que chegue antes disso fica guardado e é desenhado em seguida
+        self.fig = None
+        self.camada = None
+        self._resultado_pendente = None
+        self._ultimo_resultado = None  # arrays do último resultado desenhado (para a animação)
+        self._animacao = None  # AnimacaoDialog aberta
         
-        # Inicialização dos plots vazios
-        self.l1, = self.ax1.plot([], [], label='f(t)', color='blue')
-        self.l2, = self.ax2.plot([], [], label='g(t)', color='red')
-        self.l3, = self.ax3.plot([], [], label='f * g', color='green')
+        # Cálculo em segundo plano: a thread de trabalho envia mensagens pela fila, que é
+        # lida pela thread do Tk via root.after. Cada clique cria uma tarefa com id novo.
+        self._fila_tarefas = queue.Queue()
+        self._id_tarefa = 0
+        self._cancelar_tarefa = None
+        self._verificando = False
+        self._dominio_tarefa = None
+        self._medicao_tarefa = None
+        self._diretorio_disco = None  # arquivos do último cálculo em disco
         
-        for ax in self.axes:
-            ax.legend()
-            ax.grid(True)
+        # Medições de desempenho da sessão (janela "Desempenho")
+        self.medicoes = []
         
-        self.ax1.set_title('Função f(t)')
-        self.ax2.set_title('Função g(t)')
-        self.ax3.set_title('Convolução f * g')
+        # Cache de resultados (memória + .npz em disco) para cliques repetidos
+        self.cache = CacheResultados(diretorio=diretorio_cache_padrao())
         
-        self.fig.tight_layout()
+        # Etapas memorizadas (amostras, espectros, convolução) para recálculo incremental
+        self.pipeline = PipelineConvolucao()
+        self._dominio_anterior = None
+        
+        # Modo interativo: callbacks agendados (prévia e refinamento)
+        self._previa_agendada = None
+        self._refino_agendado = None
         
         self.setup_gui()
     
@@ -519,20 +1224,63 @@ class ConvolutionApp:
                                     command=lambda: self.show_help("Parâmetros de Domínio", self.get_domain_help()))
         help_domain_btn.grid(row=0, column=6, sticky=tk.E, padx=(5, 0))
         
+        # Ao mudar só xmin/xmax, mantém o dt anterior (ajustando N) para reaproveitar as amostras
+        self.manter_dt_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(domain_frame, text="Manter dt ao mudar o domínio (recalcula só as amostras novas)",
+                        variable=self.manter_dt_var).grid(row=1, column=0, columnspan=6, sticky=tk.W, pady=(5, 0))
+        
+        # Cada função amostrada só no próprio suporte (mesmo dt); desmarcado, as duas em [xmin, xmax]
+        self.grades_suporte_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(domain_frame, text="Amostrar f e g só nos seus intervalos (mais amostras nos pulsos)",
+                        variable=self.grades_suporte_var).grid(row=2, column=0, columnspan=6, sticky=tk.W,
+                                                               pady=(5, 0))
+        
+        # Amostras e convolução em arquivos np.memmap (N na casa de 10⁸ não cabe na memória)
+        self.em_disco_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(domain_frame, text="Calcular em disco (np.memmap, para N muito alto)",
+                        variable=self.em_disco_var).grid(row=3, column=0, columnspan=6, sticky=tk.W, pady=(5, 0))
+        
         # Método de convolução
         method_frame = ttk.Frame(input_frame)
         method_frame.grid(row=5, column=0, sticky=tk.W+tk.E, padx=5, pady=5)
         method_frame.grid_columnconfigure(1, weight=1) # Faz o combobox expandir
         
         ttk.Label(method_frame, text="Método:").grid(row=0, column=0, sticky=tk.W)
-        self.method_var = tk.StringVar(value="numpy")
+        self.method_var = tk.StringVar(value="auto")
         method_combo = ttk.Combobox(method_frame, textvariable=self.method_var, 
-                                   values=["numpy", "scipy"], state="readonly", width=15)
+                                   values=METODOS_DISCRETOS + ["scipy", "quad", "tolerancia", "analitico"], state="readonly",
+                                   width=15)
         method_combo.grid(row=0, column=1, sticky=tk.EW, padx=(5, 0))
         
+        # Modo paralelo do método contínuo (scipy)
+        ttk.Label(method_frame, text="Processos:").grid(row=0, column=2, sticky=tk.W, padx=(10, 0))
+        self.workers_var = tk.StringVar(value="auto")
+        ttk.Entry(method_frame, textvariable=self.workers_var, width=6).grid(row=0, column=3, sticky=tk.W, padx=(5, 0))
+        
+        ttk.Label(method_frame, text="Bloco:").grid(row=0, column=4, sticky=tk.W, padx=(10, 0))
+        self.bloco_var = tk.StringVar(value="auto")
+        ttk.Entry(method_frame, textvariable=self.bloco_var, width=8).grid(row=0, column=5, sticky=tk.W, padx=(5, 0))
+        
         help_method_btn = ttk.Button(method_frame, text="?", width=3,
                                     command=lambda: self.show_help("Métodos de Convolução", self.get_method_help()))
-        help_method_btn.grid(row=0, column=2, sticky=tk.E, padx=(5, 0))
+        help_method_btn.grid(row=0, column=6, sticky=tk.E, padx=(5, 0))
+        
+        # Tolerâncias do método "tolerancia" (erro alvo = max(abs, rel × pico))
+        ttk.Label(method_frame, text="Tol. abs.:").grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
+        self.tol_abs_var = tk.StringVar(value="1e-6")
+        ttk.Entry(method_frame, textvariable=self.tol_abs_var, width=10).grid(row=1, column=1, sticky=tk.W,
+                                                                             padx=(5, 0), pady=(5, 0))
+        
+        ttk.Label(method_frame, text="Tol. rel.:").grid(row=1, column=2, sticky=tk.W, padx=(10, 0), pady=(5, 0))
+        self.tol_rel_var = tk.StringVar(value="1e-4")
+        ttk.Entry(method_frame, textvariable=self.tol_rel_var, width=6).grid(row=1, column=3, sticky=tk.W,
+                                                                            padx=(5, 0), pady=(5, 0))
+        
+        # Precisão das amostras e da convolução discreta (float32: metade da memória)
+        ttk.Label(method_frame, text="Precisão:").grid(row=1, column=4, sticky=tk.W, padx=(10, 0), pady=(5, 0))
+        self.tipo_numerico_var = tk.StringVar(value="float64")
+        ttk.Combobox(method_frame, textvariable=self.tipo_numerico_var, values=TIPOS_NUMERICOS, state="readonly",
+                     width=8).grid(row=1, column=5, sticky=tk.W, padx=(5, 0), pady=(5, 0))
         
         # Botões principais
         button_frame = ttk.Frame(input_frame)
@@ -541,6 +1289,7 @@ class ConvolutionApp:
         button_frame.grid_columnconfigure(0, weight=1)
         button_frame.grid_columnconfigure(1, weight=1)
         button_frame.grid_columnconfigure(2, weight=1)
+        button_frame.grid_columnconfigure(3, weight=1)
         
         self.plot_button = ttk.Button(button_frame, text="Plotar/Convoluir", 
                                      command=self.plotar_convolucao)
@@ -552,11 +1301,57 @@ class ConvolutionApp:
         
         help_general_btn = ttk.Button(button_frame, text="❓ Ajuda Geral", 
                                      command=lambda: self.show_help("Ajuda Geral", self.get_general_help()))
-        help_general_btn.grid(row=0, column=2, sticky=tk.EW)
+        help_general_btn.grid(row=0, column=2, sticky=tk.EW, padx=(0, 10))
         
-        # Canvas matplotlib
-        self.canvas = FigureCanvasTkAgg(self.fig, master=main_frame)
-        self.canvas.get_tk_widget().grid(row=1, column=0, sticky=tk.NSEW)
+        sliders_button = ttk.Button(button_frame, text="🎚 Modo Interativo",
+                                   command=self.show_sliders)
+        sliders_button.grid(row=0, column=3, sticky=tk.EW)
+        
+        # Progresso e cancelamento do cálculo em segundo plano
+        self.progress_var = tk.DoubleVar(value=0.0)
+        self.progress_bar = ttk.Progressbar(button_frame, variable=self.progress_var, maximum=100)
+        self.progress_bar.grid(row=1, column=0, sticky=tk.EW, padx=(0, 10), pady=(5, 0))
+        
+        self.status_var = tk.StringVar(value="Pronto")
+        ttk.Label(button_frame, textvariable=self.status_var).grid(row=1, column=1, sticky=tk.W, pady=(5, 0))
+        
+        self.cancel_button = ttk.Button(button_frame, text="Cancelar", command=self.cancelar_calculo,
+                                       state="disabled")
+        self.cancel_button.grid(row=1, column=2, sticky=tk.EW, pady=(5, 0))
+        
+        sweep_button = ttk.Button(button_frame, text="📈 Varredura", command=self.show_sweep)
+        sweep_button.grid(row=1, column=3, sticky=tk.EW, pady=(5, 0))
+        
+        stream_button = ttk.Button(button_frame, text="🌊 Fluxo", command=self.show_stream)
+        stream_button.grid(row=2, column=3, sticky=tk.EW, pady=(5, 0))
+        
+        animation_button = ttk.Button(button_frame, text="🎬 Animação", command=self.show_animation)
+        animation_button.grid(row=2, column=2, sticky=tk.EW, pady=(5, 0))
+        
+        cascade_button = ttk.Button(button_frame, text="⛓ Cascata", command=self.show_cascade)
+        cascade_button.grid(row=2, column=1, sticky=tk.EW, padx=(0, 10), pady=(5, 0))
+        
+        # Lugar do canvas matplotlib, com o tamanho da figura, até _criar_graficos
+        self._frame_principal = main_frame
+        largura, altura = TAMANHO_FIGURA
+        self._aviso_graficos = ttk.Frame(main_frame, width=int(largura * DPI_FIGURA),
+                                         height=int(altura * DPI_FIGURA))
+        ttk.Label(self._aviso_graficos, text="Carregando gráficos...").place(relx=0.5, rely=0.5, anchor=tk.CENTER)
+        self._aviso_graficos.grid(row=1, column=0, sticky=tk.NSEW)
+        self.root.bind("<Map>", self._ao_mapear, add="+")
+        
+        # Barra de status com o resumo de desempenho do último cálculo
+        status_frame = ttk.Frame(main_frame)
+        status_frame.grid(row=3, column=0, sticky=tk.EW, pady=(5, 0))
+        status_frame.grid_columnconfigure(0, weight=1)
+        
+        self.perf_var = tk.StringVar(value="")
+        ttk.Label(status_frame, textvariable=self.perf_var, relief=tk.SUNKEN,
+                  anchor=tk.W).grid(row=0, column=0, sticky=tk.EW)
+        ttk.Button(status_frame, text="⏱ Desempenho",
+                   command=self.show_performance).grid(row=0, column=1, sticky=tk.E, padx=(5, 0))
+        ttk.Button(status_frame, text="Erro vs float64",
+                   command=self.comparar_precisao).grid(row=0, column=2, sticky=tk.E, padx=(5, 0))
     
     def update_f1_interval_fields(self, event=None):
         interval_type = self.f1_interval_type.get()
@@ -612,6 +1407,94 @@ class ConvolutionApp:
     def show_examples(self):
         ExamplesDialog(self.root, self.load_example)
     
+    def show_sliders(self):
+        SlidersDialog(self.root, self)
+    
+    def show_sweep(self):
+        VarreduraDialog(self.root, self)
+    
+    def show_stream(self):
+        FluxoDialog(self.root, self)
+    
+    def show_cascade(self):
+        CascataDialog(self.root, self)
+    
+    def show_animation(self):
+        if self._animacao is not None:
+            self._animacao.dialog.lift()
+            return
+        resultado = self._ultimo_resultado
+        if self.camada is None or resultado is None:
+            messagebox.showinfo("Animação", "Calcule uma convolução antes de animá-la.")
+            return
+        if "eixo_ty" in resultado:
+            messagebox.showinfo("Animação", "A animação não está disponível para o cálculo em disco.")
+            return
+        from animacao import QuadrosAnimacao
+        try:
+            quadros = QuadrosAnimacao(resultado["t1"], resultado["x1"], resultado["t2"], resultado["x2"])
+        except Exception as e:
+            messagebox.showerror("Erro", f"Erro ao preparar a animação: {str(e)}")
+            return
+        self._animacao = AnimacaoDialog(self.root, self, quadros)
+    
+    def show_performance(self):
+        PerformanceDialog(self.root, self.medicoes)
+    
+    def comparar_precisao(self):
+        """Calcula os parâmetros atuais em float32 e em float64 (numa thread) e mostra o erro"""
+        try:
+            params = dict(self._ler_parametros(), em_disco=False)
+        except Exception as e:
+            messagebox.showerror("Erro", f"Erro nos parâmetros: {str(e)}")
+            return
+        fila = queue.Queue()
+        
+        def executar():
+            try:
+                fila.put(("resultado", relatorio_precisao(params)))
+            except Exception as e:
+                fila.put(("erro", e))
+        
+        def verificar():
+            try:
+                tipo, dados = fila.get_nowait()
+            except queue.Empty:
+                self.root.after(100, verificar)
+                return
+            self.status_var.set("Pronto")
+            if tipo == "erro":
+                messagebox.showerror("Erro", f"Erro ao comparar precisões: {str(dados)}")
+            else:
+                self.show_help("Precisão float32 × float64", self._descrever_precisao(params, dados))
+        
+        self.status_var.set("Comparando float32 com float64...")
+        threading.Thread(target=executar, daemon=True).start()
+        self.root.after(100, verificar)
+    
+    def _descrever_precisao(self, params, relatorio):
+        """Texto do relatório de nucleo.relatorio_precisao"""
+        linhas = [f"ERRO DE float32 EM RELAÇÃO A float64\n\nMétodo: {params['method']}, N = {params['N']}\n",
+                  f"{'':12s}{'erro máx.':>12s}{'erro relativo':>16s}"]
+        for nome, rotulo in (("x1", "f(t)"), ("x2", "g(t)"), ("y", "f * g")):
+            erro_rel = relatorio[nome]["erro_rel"]
+            linhas.append(f"{rotulo:12s}{relatorio[nome]['erro_abs']:12.2e}"
+                          f"{'-' if erro_rel is None else f'{erro_rel:.2e}':>16s}")
+        memoria, tempos = relatorio["bytes"], relatorio["tempos_s"]
+        linhas += ["", f"Memória (f, g e f * g): {memoria['float64'] / 1e6:.2f} MB em float64, "
+                       f"{memoria['float32'] / 1e6:.2f} MB em float32",
+                   f"Tempo: {tempos['float64']:.3f} s em float64, {tempos['float32']:.3f} s em float32"]
+        if params["method"] not in METODOS_DISCRETOS:
+            linhas += ["", "Nos métodos contínuos, f * g é sempre calculada em float64;",
+                       "só as amostras de f e g ficam em float32."]
+        return "\n".join(linhas)
+    
+    def _registrar_medicao(self, medicao):
+        """Guarda a medição na sessão e mostra o resumo na barra de status"""
+        self.medicoes.append(medicao)
+        del self.medicoes[:-MAX_MEDICOES_SESSAO]
+        self.perf_var.set(medicao.resumo())
+    
     def load_example(self, example):
         # Carregar função 1
         self.func1_var.set(example["f1"])
@@ -630,108 +1513,353 @@ class ConvolutionApp:
         messagebox.showinfo("Exemplo Carregado", f"Exemplo '{example['name']}' carregado com sucesso!")
     
     def get_function_help(self):
-        return """AJUDA - FUNÇÕES MATEMÁTICAS\n\nComo escrever funções:\n• Use 't' como variável independente\n• Utilize funções NumPy com prefixo 'np.'\n\nFunções disponíveis:\n• np.sin(t), np.cos(t), np.tan(t) - Funções trigonométricas\n• np.exp(t) - Função exponencial\n• np.log(t), np.log10(t) - Logaritmos natural e base 10\n• np.sqrt(t), np.abs(t) - Raiz quadrada e valor absoluto\n• np.where(condição, valor_se_verdadeiro, valor_se_falso) - Função condicional\n\nOperadores matemáticos:\n• + - * / ** (potência)\n• > < >= <= == != (comparação)\n• & | (and, or lógicos)\n\nExemplos de funções:\n• np.exp(-t**2) - Gaussiana\n• np.cos(2*np.pi*t) - Cosseno\n• np.sin(5*t) * np.exp(-0.1*t) - Senoide amortecida\n• np.where(t>=0, np.exp(-t), 0) - Exponencial causal\n• np.where((t>-1)&(t<1), 1, 0) - Pulso retangular\n• t * np.exp(-t**2) - Pulso derivativo\n• np.cos(t) + 0.5*np.cos(3*t) - Soma de harmônicos\n\nDicas importantes:\n• Use parênteses para agrupar operações\n• Para pulsos, use np.where() com condições\n• Para funções causais, use np.where(t>=0, função, 0)\n• Teste sempre com valores simples primeiro"""
+        return """AJUDA - FUNÇÕES MATEMÁTICAS\n\nComo escrever funções:\n• Use 't' como variável independente\n• Utilize funções NumPy com prefixo 'np.'\n\nFunções disponíveis:\n• np.sin(t), np.cos(t), np.tan(t) - Funções trigonométricas\n• np.exp(t) - Função exponencial\n• np.log(t), np.log10(t) - Logaritmos natural e base 10\n• np.sqrt(t), np.abs(t) - Raiz quadrada e valor absoluto\n• np.where(condição, valor_se_verdadeiro, valor_se_falso) - Função condicional\n\nOperadores matemáticos:\n• + - * / ** (potência)\n• > < >= <= == != (comparação)\n• & | (and, or lógicos)\n\nExemplos de funções:\n• np.exp(-t**2) - Gaussiana\n• np.cos(2*np.pi*t) - Cosseno\n• np.sin(5*t) * np.exp(-0.1*t) - Senoide amortecida\n• np.where(t>=0, np.exp(-t), 0) - Exponencial causal\n• np.where((t>-1)&(t<1), 1, 0) - Pulso retangular\n• t * np.exp(-t**2) - Pulso derivativo\n• np.cos(t) + 0.5*np.cos(3*t) - Soma de harmônicos\n\nDicas importantes:\n• Use parênteses para agrupar operações\n• Para pulsos, use np.where() com condições\n• Para funções causais, use np.where(t>=0, função, 0)\n• Teste sempre com valores simples primeiro\n• Por segurança, apenas 't', funções np.* da lista acima (e similares) e range/len/abs/min/max/sum são aceitos"""
     
     def get_interval_help(self):
         return """AJUDA - INTERVALOS DE FUNÇÃO\n\nOs intervalos definem onde a função é diferente de zero:\n\nTIPOS DE INTERVALO:\n\n1. infinito: (-∞, +∞)\n   • A função é definida em todo o domínio\n   • Não requer valores x1 ou x2\n   • Exemplo: Gaussiana np.exp(-t**2)\n\n2. semi_inf_esq: (-∞, x2]\n   • A função existe de -∞ até x2\n   • Requer apenas o valor x2\n   • Exemplo: Degrau negativo até x2\n\n3. semi_inf_dir: [x1, +∞)\n   • A função existe de x1 até +∞\n   • Requer apenas o valor x1\n   • Exemplo: Degrau positivo a partir de x1\n\n4. finito: [x1, x2]\n   • A função existe apenas entre x1 e x2\n   • Requer ambos os valores x1 e x2\n   • Exemplo: Pulso retangular\n\nCOMO USAR:\n1. Selecione o tipo de intervalo no menu dropdown\n2. Os campos x1 e x2 serão habilitados automaticamente\n3. Digite os valores dos limites quando necessário\n4. A função será automaticamente zerada fora do intervalo\n\nEXEMPLOS PRÁTICOS:\n• Pulso: função=1, intervalo=finito, x1=-1, x2=1\n• Degrau: função=1, intervalo=semi_inf_dir, x1=0\n• Exponencial causal: função=np.exp(-t), intervalo=semi_inf_dir, x1=0\n• Janela gaussiana: função=np.exp(-t**2), intervalo=finito, x1=-2, x2=2"""
     
     def get_domain_help(self):
-        return """AJUDA - PARÂMETROS DE DOMÍNIO\n\nEstes parâmetros controlam a visualização e cálculo:\n\nxmin: Limite inferior do eixo temporal\n• Valor mínimo de t para plotagem\n• Recomendado: -5 a -10 para funções simétricas\n• Para funções causais: pode ser 0 ou negativo\n\nxmax: Limite superior do eixo temporal  \n• Valor máximo de t para plotagem\n• Recomendado: 5 a 10 para funções simétricas\n• Deve ser maior que xmin\n\nN pontos: Número de pontos de amostragem\n• Controla a resolução da discretização\n• Valores típicos: 500-2000\n• Mais pontos = maior precisão, mais lento\n• Menos pontos = menor precisão, mais rápido\n\nDICAS DE CONFIGURAÇÃO:\n• Para funções rápidas: xmin=-2, xmax=2, N=500\n• Para funções lentas: xmin=-10, xmax=10, N=1000\n• Para alta precisão: N=2000 ou mais\n• Para testes rápidos: N=200-500\n\nEFEITOS NA CONVOLUÇÃO:\n• O domínio da convolução será aproximadamente [2*xmin, 2*xmax]\n• Certifique-se de que o domínio capture toda a função\n• Para funções com suporte limitado, ajuste xmin/xmax adequadamente"""
+        return """AJUDA - PARÂMETROS DE DOMÍNIO\n\nEstes parâmetros controlam a visualização e cálculo:\n\nxmin: Limite inferior do eixo temporal\n• Valor mínimo de t para plotagem\n• Recomendado: -5 a -10 para funções simétricas\n• Para funções causais: pode ser 0 ou negativo\n\nxmax: Limite superior do eixo temporal  \n• Valor máximo de t para plotagem\n• Recomendado: 5 a 10 para funções simétricas\n• Deve ser maior que xmin\n\nN pontos: Número de pontos de amostragem\n• Controla a resolução da discretização\n• Valores típicos: 500-2000\n• Mais pontos = maior precisão, mais lento\n• Menos pontos = menor precisão, mais rápido\n\nDICAS DE CONFIGURAÇÃO:\n• Para funções rápidas: xmin=-2, xmax=2, N=500\n• Para funções lentas: xmin=-10, xmax=10, N=1000\n• Para alta precisão: N=2000 ou mais\n• Para testes rápidos: N=200-500\n\nEFEITOS NA CONVOLUÇÃO:\n• O domínio da convolução será aproximadamente [2*xmin, 2*xmax]\n• Certifique-se de que o domínio capture toda a função\n• Para funções com suporte limitado, ajuste xmin/xmax adequadamente\n\nMANTER dt AO MUDAR O DOMÍNIO:\n• Com a opção marcada, alterar só xmin/xmax mantém o espaçamento entre amostras\n• N é ajustado automaticamente e os limites são arredondados para múltiplos de dt\n• Apenas as amostras da parte nova do domínio são calculadas\n\nAMOSTRAR f E g SÓ NOS SEUS INTERVALOS (padrão):\n• Cada função é amostrada apenas no próprio intervalo (recortado para [xmin, xmax])\n• As duas usam o mesmo dt, escolhido para que a função de intervalo mais estreito\n  receba N amostras (a outra recebe no máximo 4N)\n• Pulsos estreitos deixam de ter só algumas amostras; o resto do domínio é zero\n• A convolução só é calculada em supp(f) + supp(g); fora disso ela é nula\n• Desmarcado: as duas funções usam N pontos em [xmin, xmax]\n\nCALCULAR EM DISCO:\n• Para N muito alto (ex.: 10⁸), em que os arrays não cabem na memória\n• f, g e a convolução são gravadas em arquivos temporários (np.memmap), em blocos\n• A convolução é feita por FFT em blocos (overlap-add), sempre pelo caminho discreto\n• Os gráficos leem do arquivo só o necessário para a vista atual\n• O resultado não entra no cache; os arquivos são apagados no cálculo seguinte"""
     
     def get_method_help(self):
-        return """AJUDA - MÉTODOS DE CONVOLUÇÃO\n\nDois métodos estão disponíveis para calcular a convolução:\n\nNUMPY (Discreto):\n• Usa np.convolve() para convolução discreta\n• Mais rápido para a maioria dos casos\n• Adequado para funções bem amostradas\n• Resultado: convolução dos sinais discretizados\n• Recomendado para: testes rápidos, funções suaves\n\nSCIPY (Contínuo):\n• Usa integração numérica (quad) para cada ponto\n• Mais preciso matematicamente\n• Mais lento, especialmente para muitos pontos\n• Resultado: aproximação da convolução contínua\n• Recomendado para: máxima precisão, funções complexas\n\nQUANDO USAR CADA UM:\n\nUse NUMPY quando:\n• Quiser resultados rápidos\n• As funções forem suaves e bem comportadas\n• N pontos for alto (>1000)\n• Estiver fazendo testes iniciais\n\nUse SCIPY quando:\n• Precisar de máxima precisão\n• As funções tiverem descontinuidades\n• Quiser o resultado matematicamente exato\n• Tiver tempo para esperar o cálculo\n\nDICAS:\n• Comece sempre com NUMPY para testes\n• Use SCIPY para resultados finais importantes\n• Para N>1000, SCIPY pode ser muito lento\n• Ambos os métodos devem dar resultados similares para funções suaves"""
+        return """AJUDA - MÉTODOS DE CONVOLUÇÃO\n\nNove métodos estão disponíveis para calcular a convolução:\n\nAUTO (Discreto, recomendado):\n• Escolhe automaticamente entre NUMPY, FFT, OVERLAP-ADD e ESPARSO\n• Usa o tamanho do suporte de cada sinal (trechos não nulos) e detecta pulsos\n• Mesmo resultado dos métodos discretos, sempre pelo caminho mais barato\n\nNUMPY (Discreto, direto):\n• Usa np.convolve() para convolução discreta\n• Custo proporcional a N² (lento para N muito alto)\n• Adequado para funções bem amostradas\n• Resultado: convolução dos sinais discretizados\n• Recomendado para: sinais curtos, testes rápidos\n\nFFT (Discreto):\n• Usa scipy.signal.fftconvolve (custo N·log N)\n• Ideal para N alto (centenas de milhares de pontos)\n\nOVERLAP-ADD (Discreto):\n• Usa scipy.signal.oaconvolve, processando o sinal longo em blocos\n• Ideal quando um dos sinais é bem mais curto que o outro (pulsos)\n\nESPARSO (Discreto, pulsos):\n• Para sinais feitos de poucos trechos constantes: pulsos retangulares, trens\n  de pulsos (np.sum de np.where) ou impulsos isolados\n• A convolução vira a soma de cópias deslocadas e escaladas do outro sinal\n  (somas móveis), com custo proporcional ao número de pulsos, não aos zeros\n• Mesmo resultado dos outros métodos discretos\n• Se nenhum dos sinais for desse tipo, usa o método que AUTO escolheria\n\nSCIPY (Contínuo):\n• Integração numérica de Gauss-Kronrod vetorizada (todos os pontos de uma vez)\n• Integra apenas onde os suportes de f e g se sobrepõem\n• Mais preciso matematicamente\n• Mais lento que os métodos discretos\n• Mostra o erro estimado máximo no título do gráfico da convolução\n• Pode usar vários processos (campo Processos; 'auto' = todos os núcleos para cálculos grandes)\n• O campo Bloco define quantos pontos cada processo calcula por vez\n• Resultado: aproximação da convolução contínua\n• Recomendado para: máxima precisão, funções complexas\n\nQUAD (Contínuo, ponto a ponto):\n• Integra cada ponto da saída com scipy.integrate.quad (adaptativo, QUADPACK)\n• Calcula o mesmo que SCIPY, com a subdivisão adaptativa do quad em cada ponto\n• Com o Numba instalado (pip install numba), f(τ)·g(t−τ) é compilado para código\n  nativo e o quad não passa pelo Python a cada avaliação\n• Sem o Numba, ou com expressões que ele não compila, usa o integrando Python (lento)\n• Também usa os campos Processos e Bloco\n\nTOLERANCIA (Escolhe pelo erro):\n• Em vez do método, informe a tolerância absoluta e relativa (Tol. abs. e Tol. rel.)\n• O erro alvo é o maior entre Tol. abs. e Tol. rel. × pico da convolução\n• Tenta primeiro os métodos discretos com N, 2N, 4N... amostras, estimando o erro\n  pela diferença entre dois níveis (extrapolação de Richardson)\n• Se isso ficar caro demais, ou se houver descontinuidades no domínio, passa à\n  integração com os suportes e quebras; só então refina os pontos que faltam\n• O erro alcançado e a etapa usada aparecem no título do gráfico da convolução\n• Calcula o mesmo que os métodos discretos: f e g restritas a [xmin, xmax]\n\nANALITICO (Contínuo, forma fechada):\n• Reconhece retângulos, exponenciais, gaussianas, triângulos, cossenos\n  amortecidos e somas/produtos deles (np.where, np.abs, comparações, np.sum)\n• Nesses casos calcula a convolução exata, sem erro de amostragem e quase na hora\n• Calcula o mesmo que SCIPY; se f ou g não for reconhecida, usa SCIPY\n• O título do gráfico indica quando a forma fechada foi usada\n\nQUANDO USAR CADA UM:\n\nUse AUTO (ou NUMPY/FFT) quando:\n• Quiser resultados rápidos\n• As funções forem suaves e bem comportadas\n• N pontos for alto (>1000)\n• Estiver fazendo testes iniciais\n\nUse SCIPY quando:\n• Precisar de máxima precisão\n• As funções tiverem descontinuidades\n• Quiser o resultado matematicamente exato\n• Tiver tempo para esperar o cálculo\n\nDICAS:\n• Comece sempre com AUTO (ou NUMPY) para testes\n• Para resultados finais importantes, use TOLERANCIA com o erro aceitável: o\n  caminho caro só é usado quando necessário\n• Para N muito alto (>10000), SCIPY pode ser lento\n• Ambos os métodos devem dar resultados similares para funções suaves\n\nPRECISÃO (float64 ou float32):\n• float32 guarda as amostras de f e g (e, nos métodos discretos, a convolução)\n  em precisão simples: metade da memória e FFTs mais rápidas\n• As somas da convolução direta (NUMPY) continuam acumuladas em float64\n• Erro típico de 1e-7 a 1e-6 relativo ao pico: suficiente para visualizar\n• O botão 'Erro vs float64' (abaixo dos gráficos) calcula os dois e compara\n• Os métodos contínuos (SCIPY, QUAD, TOLERANCIA, ANALITICO) integram sempre em float64"""
     
     def get_general_help(self):
-        return """AJUDA GERAL - CONVOLUÇÃO DE SINAIS\n\nCOMO USAR A APLICAÇÃO:\n\n1. DEFINIR FUNÇÕES:\n   • Digite as funções f(t) e g(t) usando sintaxe Python/NumPy\n   • Use 't' como variável independente\n   • Clique no botão '?' ao lado para ajuda específica\n\n2. CONFIGURAR INTERVALOS:\n   • Escolha o tipo de intervalo para cada função\n   • Configure os limites x1 e x2 quando necessário\n   • Use '?' para entender cada tipo de intervalo\n\n3. AJUSTAR PARÂMETROS:\n   • Configure xmin, xmax para o domínio de visualização\n   • Ajuste N pontos para controlar a resolução\n   • Escolha o método de convolução (NumPy ou SciPy)\n\n4. PLOTAR E ANALISAR:\n   • Clique em 'Plotar/Convoluir' para gerar os gráficos\n   • Observe os três gráficos: f(t), g(t) e f*g\n   • Analise o resultado da convolução\n\n5. USAR EXEMPLOS:\n   • Clique em '📚 Exemplos' para ver casos pré-configurados\n   • Selecione um exemplo e clique 'Carregar Exemplo'\n   • Modifique os parâmetros conforme necessário\n\nCONCEITOS IMPORTANTES:\n\nConvolução: Operação matemática que combina duas funções\n• Resultado: (f * g)(t) = ∫ f(τ)g(t-τ) dτ\n• Aplicações: filtros, sistemas lineares, processamento de sinais\n\nInterpretação física:\n• f(t): sinal de entrada\n• g(t): resposta ao impulso do sistema\n• f*g: resposta do sistema ao sinal de entrada\n\nSOLUÇÃO DE PROBLEMAS:\n• Erro de sintaxe: verifique a função digitada\n• Gráfico vazio: ajuste o domínio xmin/xmax\n• Cálculo lento: reduza N pontos ou use método NumPy\n• Resultado inesperado: verifique os intervalos das funções\n\nATALHOS:\n• F1: Esta ajuda\n• Ctrl+E: Abrir exemplos\n• Enter: Plotar (quando em um campo de entrada)"""
+        return """AJUDA GERAL - CONVOLUÇÃO DE SINAIS\n\nCOMO USAR A APLICAÇÃO:\n\n1. DEFINIR FUNÇÕES:\n   • Digite as funções f(t) e g(t) usando sintaxe Python/NumPy\n   • Use 't' como variável independente\n   • Clique no botão '?' ao lado para ajuda específica\n\n2. CONFIGURAR INTERVALOS:\n   • Escolha o tipo de intervalo para cada função\n   • Configure os limites x1 e x2 quando necessário\n   • Use '?' para entender cada tipo de intervalo\n\n3. AJUSTAR PARÂMETROS:\n   • Configure xmin, xmax para o domínio de visualização\n   • Ajuste N pontos para controlar a resolução\n   • Escolha o método de convolução (NumPy ou SciPy)\n\n4. PLOTAR E ANALISAR:\n   • Clique em 'Plotar/Convoluir' para gerar os gráficos\n   • Observe os três gráficos: f(t), g(t) e f*g\n   • Analise o resultado da convolução\n   • Use a barra abaixo dos gráficos para zoom, pan e salvar a figura\n   • Com N alto, cada gráfico desenha só o mínimo e o máximo de cada pixel; o detalhe\n     é refeito a cada zoom, então picos e pulsos estreitos nunca somem\n\n5. USAR EXEMPLOS:\n   • Clique em '📚 Exemplos' para ver casos pré-configurados\n   • Selecione um exemplo e clique 'Carregar Exemplo'\n   • Modifique os parâmetros conforme necessário\n\n6. MODO INTERATIVO:\n   • Clique em '🎚 Modo Interativo' para variar as constantes de f e g, os limites\n     x1/x2 e o domínio com sliders\n   • Cada movimento mostra uma prévia rápida (N pequeno, FFT); ao parar, o resultado\n     é refinado para o N e o método escolhidos\n   • Após editar as expressões, use 'Recarregar Parâmetros' na janela dos sliders\n\n7. VARREDURA DE PARÂMETRO:\n   • Escreva g(t) com um parâmetro, ex.: np.exp(-a*t), e clique em '📈 Varredura'\n   • Informe o nome do parâmetro, o início, o fim e o número de valores\n   • Todas as variantes são calculadas de uma vez (uma FFT em lote contra f)\n   • Veja a família como mapa de calor ou cascata e salve tudo em .npz\n\n8. CONVOLUÇÃO EM FLUXO (sinais longos ou sem fim):\n   • Clique em '🌊 Fluxo': g(t) vira um núcleo fixo (intervalo recortado para [xmin, xmax])\n   • f(t) vem da janela principal (a partir de xmin, sem fim) ou de um arquivo de amostras\n     (.npy, .txt/.csv ou float64 binário), com o dt informado\n   • A saída é calculada bloco a bloco (overlap-save) com memória constante e aparece\n     num gráfico rolante; opcionalmente é gravada em arquivo\n\n9. ANIMAÇÃO:\n   • Após calcular, clique em '🎬 Animação' para ver g(t - τ) deslizando sobre f(τ)\n   • A área verde de f(τ)·g(t - τ) é o valor de (f * g)(t), desenhado em seguida\n     no gráfico da convolução\n   • Toque, pause ou arraste a barra para escolher o instante; ajuste os quadros/s\n   • 'Exportar GIF/vídeo' grava a animação em .gif (ou .mp4, com ffmpeg) em segundo\n     plano\n\n10. CONVOLUÇÃO EM CASCATA (f * g * h * ...):\n   • Clique em '⛓ Cascata': f(t) e g(t) da janela principal são os estágios f1 e f2\n   • Adicione estágios (expressão e intervalo) com '+ Estágio' e clique 'Calcular'\n   • A cadeia é calculada numa só passagem: uma FFT por estágio e uma inversa\n   • Em 'Mostrar também', escolha um resultado intermediário (ex.: f1 * f2)\n\nCONCEITOS IMPORTANTES:\n\nConvolução: Operação matemática que combina duas funções\n• Resultado: (f * g)(t) = ∫ f(τ)g(t-τ) dτ\n• Aplicações: filtros, sistemas lineares, processamento de sinais\n\nInterpretação física:\n• f(t): sinal de entrada\n• g(t): resposta ao impulso do sistema\n• f*g: resposta do sistema ao sinal de entrada\n\nSOLUÇÃO DE PROBLEMAS:\n• Erro de sintaxe: verifique a função digitada\n• Gráfico vazio: ajuste o domínio xmin/xmax\n• Cálculo lento: reduza N pontos ou use método NumPy\n• Para ver onde o tempo foi gasto, use '⏱ Desempenho' (tempo por etapa, avaliações\n  do integrando, avisos da integração, memória; exporta JSON e Chrome trace)\n• Resultado inesperado: verifique os intervalos das funções\n\nATALHOS:\n• F1: Esta ajuda\n• Ctrl+E: Abrir exemplos\n• Enter: Plotar (quando em um campo de entrada)"""
 
     def create_interval_function(self, func_str, interval_type, x1_str, x2_str):
-        """Cria uma função que considera o intervalo especificado"""
-        # Define uma função auxiliar para avaliar a string da função
-        # Isso é necessário para que eval() possa acessar 't' e 'np' dentro do escopo da função lambda
-        def evaluate_func(t_val):
-            # Garante que 't' e 'np' estejam disponíveis no ambiente de eval
-            _t = t_val
-            _np = np
-            return eval(func_str, {'np': _np, 't': _t})
-
-        if interval_type == "infinito":
-            return evaluate_func
-        elif interval_type == "semi_inf_esq":
-            x2 = float(x2_str)
-            return lambda t: np.where(t <= x2, evaluate_func(t), 0)
-        elif interval_type == "semi_inf_dir":
-            x1 = float(x1_str)
-            return lambda t: np.where(t >= x1, evaluate_func(t), 0)
-        elif interval_type == "finito":
-            x1 = float(x1_str)
-            x2 = float(x2_str)
-            return lambda t: np.where((t >= x1) & (t <= x2), evaluate_func(t), 0)
-        else:
-            # Retorna a função base se o tipo de intervalo for desconhecido ou inválido
-            return evaluate_func
+        """Cria uma função que considera o intervalo especificado (ver expressoes.criar_funcao_intervalo)"""
+        return criar_funcao_intervalo(func_str, interval_type, x1_str, x2_str)
     
-    def plotar_convolucao(self):
+    def plotar_convolucao(self, interativo=False):
         try:
-            # Ler e parsear entradas
-            func1_str = self.func1_var.get()
-            func2_str = self.func2_var.get()
-            
-            f1_interval_type = self.f1_interval_type.get()
-            f1_x1_str = self.f1_x1_var.get()
-            f1_x2_str = self.f1_x2_var.get()
-            
-            f2_interval_type = self.f2_interval_type.get()
-            f2_x1_str = self.f2_x1_var.get()
-            f2_x2_str = self.f2_x2_var.get()
-            
-            xmin = float(self.xmin_var.get())
-            xmax = float(self.xmax_var.get())
-            N = int(self.n_var.get())
-            method = self.method_var.get()
-            
-            # Criar funções lambda com intervalos
-            func1_with_interval = self.create_interval_function(func1_str, f1_interval_type, f1_x1_str, f1_x2_str)
-            func2_with_interval = self.create_interval_function(func2_str, f2_interval_type, f2_x1_str, f2_x2_str)
-            
-            # Gerar sinais
-            t1, x1 = gerar_sinal(func1_with_interval, xmin, xmax, N)
-            t2, x2 = gerar_sinal(func2_with_interval, xmin, xmax, N)
-            
-            # Calcular convolução
-            if method == "numpy":
-                dt = t1[1] - t1[0]
-                y = np.convolve(x1, x2, mode='full') * dt
-                ty = np.linspace(t1[0] + t2[0], t1[-1] + t2[-1], len(y))
-            else:  # scipy
-                # Para convolução contínua, precisamos de uma função que aceite t como argumento
-                # e que já incorpore os intervalos. A função conv_continua já espera isso.
-                # O domínio da convolução contínua é a soma dos domínios das funções originais.
-                # Ajuste o domínio de ty para ser mais abrangente para a convolução contínua.
-                ty_start = xmin + xmin # ou t1[0] + t2[0]
-                ty_end = xmax + xmax # ou t1[-1] + t2[-1]
-                ty = np.linspace(ty_start, ty_end, N * 2) # Dobrar o número de pontos para melhor resolução
-                y = conv_continua(func1_with_interval, func2_with_interval, ty)
-            
-            # Atualizar plots
-            self.l1.set_data(t1, x1)
-            self.l2.set_data(t2, x2)
-            self.l3.set_data(ty, y)
-            
-            # Ajustar limites dos eixos
-            for ax in self.axes:
-                ax.relim()
-                ax.autoscale_view()
-            
-            # Redesenhar canvas
-            self.canvas.draw()
-            
+            if self.manter_dt_var.get():
+                self._ajustar_dominio_mantendo_dt()
+            params = self._ler_parametros()
+            chave = chave_parametros(params)
         except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao calcular convolução: {str(e)}")
+            if interativo:
+                self.status_var.set(f"Erro: {e}")  # sem janelas de erro durante o arraste
+            else:
+                messagebox.showerror("Erro", f"Erro ao calcular convolução: {str(e)}")
+            return
+        
+        self._dominio_anterior = (params["xmin"], params["xmax"], params["N"])
+        resultado = self.cache.obter(chave)
+        if resultado is not None:
+            # Resultado já conhecido: descarta o cálculo em andamento e mostra na hora
+            self._descartar_tarefa()
+            medicao = Medicao("cache", method=params["method"], N=params["N"])
+            with medicao.etapa("desenho"):
+                self.aplicar_resultado(resultado, dominio=(params["xmin"], params["xmax"]))
+            self._registrar_medicao(medicao)
+            self.status_var.set("Pronto (cache)")
+            return
+        
+        # Resultados em disco não vão para o cache (seriam copiados para a memória)
+        self.iniciar_calculo(params, None if params["em_disco"] else chave)
+    
+    def _ler_parametros(self):
+        """Lê e converte os campos da janela (na thread do Tk; o cálculo vai para a thread de trabalho)"""
+        return {
+                "f1": self.func1_var.get(),
+                "f1_interval": self.f1_interval_type.get(),
+                "f1_x1": self.f1_x1_var.get(),
+                "f1_x2": self.f1_x2_var.get(),
+                "f2": self.func2_var.get(),
+                "f2_interval": self.f2_interval_type.get(),
+                "f2_x1": self.f2_x1_var.get(),
+                "f2_x2": self.f2_x2_var.get(),
+                "xmin": float(self.xmin_var.get()),
+                "xmax": float(self.xmax_var.get()),
+                "N": int(self.n_var.get()),
+                "method": self.method_var.get(),
+                "workers": self._ler_inteiro_ou_auto(self.workers_var.get(), "Processos"),
+                "bloco": self._ler_inteiro_ou_auto(self.bloco_var.get(), "Bloco"),
+                "tol_abs": float(self.tol_abs_var.get()),
+                "tol_rel": float(self.tol_rel_var.get()),
+                "grades": "suporte" if self.grades_suporte_var.get() else "dominio",
+                "em_disco": self.em_disco_var.get(),
+                "tipo_numerico": self.tipo_numerico_var.get(),
+            }
+    
+    def parametro_alterado(self):
+        """Chamado a cada movimento de slider: prévia com N pequeno já, refinamento ao parar"""
+        self._descartar_tarefa()  # o refinamento em andamento ficou obsoleto
+        if self._previa_agendada is None:
+            # Vários movimentos até o Tk ficar ocioso geram uma única prévia
+            self._previa_agendada = self.root.after_idle(self._mostrar_previa)
+        if self._refino_agendado is not None:
+            self.root.after_cancel(self._refino_agendado)
+        self._refino_agendado = self.root.after(ATRASO_REFINO_MS, self._refinar)
+    
+    def _mostrar_previa(self):
+        self._previa_agendada = None
+        try:
+            params = self._ler_parametros()
+            previa = dict(params, N=min(params["N"], N_PREVIA), method="fft", workers=1)
+            resultado = calcular_convolucao(previa)
+        except Exception as e:
+            self.status_var.set(f"Erro: {e}")
+            return
+        self.aplicar_resultado(resultado, manter_escala=True, dominio=(previa["xmin"], previa["xmax"]))
+        self.status_var.set(f"Prévia (N={previa['N']}), refinando...")
+    
+    def _refinar(self):
+        self._refino_agendado = None
+        self.plotar_convolucao(interativo=True)
+    
+    def _ajustar_dominio_mantendo_dt(self):
+        """Se só xmin/xmax mudaram desde o último cálculo, ajusta domínio e N ao dt anterior"""
+        if self._dominio_anterior is None:
+            return
+        xmin_ant, xmax_ant, N_ant = self._dominio_anterior
+        xmin = float(self.xmin_var.get())
+        xmax = float(self.xmax_var.get())
+        if int(self.n_var.get()) != N_ant or (xmin, xmax) == (xmin_ant, xmax_ant) or xmax <= xmin:
+            return
+        xmin, xmax, N = ajustar_dominio_a_rede(xmin_ant, xmax_ant, N_ant, xmin, xmax)
+        self.xmin_var.set(f"{xmin:.10g}")
+        self.xmax_var.set(f"{xmax:.10g}")
+        self.n_var.set(str(N))
+    
+    def _ler_inteiro_ou_auto(self, texto, campo):
+        """Converte o texto de um campo em inteiro positivo, ou None se for 'auto' (ou vazio)"""
+        texto = texto.strip().lower()
+        if texto in ("", "auto"):
+            return None
+        valor = int(texto)
+        if valor < 1:
+            raise ValueError(f"{campo} deve ser um inteiro positivo ou 'auto'")
+        return valor
+    
+    def _descartar_tarefa(self):
+        """Cancela a tarefa em andamento (se houver) e passa a ignorar as suas mensagens"""
+        if self._cancelar_tarefa is not None:
+            self._cancelar_tarefa.set()
+            self._cancelar_tarefa = None
+        self._id_tarefa += 1
+        self.cancel_button.config(state="disabled")
+        self.progress_var.set(0)
+    
+    def iniciar_calculo(self, params, chave=None):
+        """Dispara o cálculo numa thread de trabalho, substituindo qualquer cálculo em andamento
+
+        Se chave for dada, o resultado é guardado no cache com ela ao terminar (na própria
+        thread de trabalho, depois de enviado à interface).
+        """
+        self._descartar_tarefa()
+        id_tarefa = self._id_tarefa
+        self._dominio_tarefa = (params["xmin"], params["xmax"])
+        medicao = Medicao("calculo", method=params["method"], N=params["N"], f1=params["f1"], f2=params["f2"])
+        self._medicao_tarefa = medicao
+        if params.get("em_disco"):
+            from memoria_externa import calcular_em_disco
+            diretorio = self._novo_diretorio_disco()
+        cancelar = threading.Event()
+        self._cancelar_tarefa = cancelar
+        fila = self._fila_tarefas
+        
+        def progresso(fracao):
+            if cancelar.is_set():
+                raise CalculoCancelado()
+            fila.put(("progresso", id_tarefa, fracao))
+        
+        def executar():
+            try:
+                if params.get("em_disco"):
+                    resultado = calcular_em_disco(params, diretorio, progresso, medicao)
+                else:
+                    resultado = self.pipeline.calcular(params, progresso, medicao=medicao)
+                fila.put(("resultado", id_tarefa, resultado))
+                # Guardado aqui, e não na thread do Tk: com N alto, gravar o .npz e podar
+                # o diretório do cache leva tempo suficiente para travar a janela
+                self.cache.guardar(chave, resultado)
+            except CalculoCancelado:
+                fila.put(("cancelado", id_tarefa, None))
+            except Exception as e:
+                fila.put(("erro", id_tarefa, e))
+        
+        threading.Thread(target=executar, daemon=True).start()
+        
+        self.progress_var.set(0)
+        self.status_var.set("Calculando...")
+        self.cancel_button.config(state="normal")
+        if not self._verificando:
+            self._verificando = True
+            self.root.after(50, self._verificar_tarefa)
+    
+    def _novo_diretorio_disco(self):
+        """Diretório temporário para um cálculo em disco; o do cálculo anterior é apagado
+
+        Os gráficos podem continuar mostrando o resultado anterior: no Linux e no macOS
+        os memmaps abertos seguem válidos após a remoção dos arquivos (no Windows a
+        remoção falha em silêncio e os arquivos ficam no diretório temporário).
+        """
+        if self._diretorio_disco is not None:
+            shutil.rmtree(self._diretorio_disco, ignore_errors=True)
+        self._diretorio_disco = tempfile.mkdtemp(prefix="convolucao_")
+        return self._diretorio_disco
+    
+    def cancelar_calculo(self):
+        if self._cancelar_tarefa is not None:
+            self._cancelar_tarefa.set()
+            self.status_var.set("Cancelando...")
+    
+    def _verificar_tarefa(self):
+        """Lê as mensagens da thread de trabalho (executado periodicamente via root.after)"""
+        terminou = False
+        while True:
+            try:
+                tipo, id_tarefa, dados = self._fila_tarefas.get_nowait()
+            except queue.Empty:
+                break
+            if id_tarefa != self._id_tarefa:
+                continue  # mensagem de uma tarefa substituída por um clique mais recente
+            if tipo == "progresso":
+                self.progress_var.set(100 * dados)
+            elif tipo == "resultado":
+                with self._medicao_tarefa.etapa("desenho"):
+                    self.aplicar_resultado(dados, dominio=self._dominio_tarefa)
+                self._registrar_medicao(self._medicao_tarefa)
+                self.status_var.set(self._descrever_etapas(dados.get("etapas", {})))
+                terminou = True
+            elif tipo == "cancelado":
+                self.status_var.set("Cancelado")
+                terminou = True
+            elif tipo == "erro":
+                self.status_var.set("Erro")
+                terminou = True
+                messagebox.showerror("Erro", f"Erro ao calcular convolução: {str(dados)}")
+        
+        if terminou:
+            self._cancelar_tarefa = None
+            self.cancel_button.config(state="disabled")
+            self.progress_var.set(0)
+        
+        # Continua verificando enquanto houver tarefa ativa
+        if self._cancelar_tarefa is None:
+            self._verificando = False
+        else:
+            self.root.after(50, self._verificar_tarefa)
+    
+    def _descrever_etapas(self, etapas):
+        """Texto de status indicando quais etapas foram reaproveitadas pela pipeline"""
+        nomes = {"f": "f", "g": "g", "espectro_f": "espectro de f", "espectro_g": "espectro de g",
+                 "convolucao": "convolução"}
+        reusadas = [nomes[e] for e, estado in etapas.items() if estado == "reusada"]
+        parciais = [nomes[e] for e, estado in etapas.items() if estado == "parcial"]
+        partes = []
+        if reusadas:
+            partes.append("reaproveitado: " + ", ".join(reusadas))
+        if parciais:
+            partes.append("só amostras novas: " + ", ".join(parciais))
+        return "Pronto" + (f" ({'; '.join(partes)})" if partes else "")
+    
+    def _ao_mapear(self, evento):
+        """Agenda a criação dos gráficos para depois que a janela for desenhada"""
+        if evento.widget is self.root and self.fig is None:
+            self.root.after_idle(self._criar_graficos)
+    
+    def _criar_graficos(self):
+        """Cria a figura, o canvas e a barra de ferramentas no lugar reservado em setup_gui
+
+        Importar o matplotlib com o backend TkAgg e montar os três eixos leva quase um
+        segundo; feito aqui, depois que a janela é mapeada, não atrasa a abertura.
+        """
+        if self.fig is not None:
+            return
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        
+        # Configuração da figura matplotlib
+        self.fig = Figure(figsize=TAMANHO_FIGURA, dpi=DPI_FIGURA)
+        self.axes = self.fig.subplots(3, 1)
+        self.ax1, self.ax2, self.ax3 = self.axes
+        
+        # Inicialização dos plots vazios
+        self.l1, = self.ax1.plot([], [], label='f(t)', color='blue')
+        self.l2, = self.ax2.plot([], [], label='g(t)', color='red')
+        self.l3, = self.ax3.plot([], [], label='f * g', color='green')
+        
+        for ax in self.axes:
+            ax.legend()
+            ax.grid(True)
+        
+        self.ax1.set_title('Função f(t)')
+        self.ax2.set_title('Função g(t)')
+        self.ax3.set_title('Convolução f * g')
+        
+        self.fig.tight_layout()
+        
+        # Canvas matplotlib
+        self._aviso_graficos.destroy()
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self._frame_principal)
+        self.canvas.get_tk_widget().grid(row=1, column=0, sticky=tk.NSEW)
+        
+        # Linhas decimadas por pixel (refeitas a cada zoom/pan) e redesenho com blitting
+        self.camada = CamadaGrafico(self.canvas, [self.l1, self.l2, self.l3])
+        self.toolbar = criar_barra_ferramentas(self.canvas, self._frame_principal, self.camada)
+        self.toolbar.grid(row=2, column=0, sticky=tk.EW)
+        
+        if self._resultado_pendente is not None:
+            resultado, manter_escala, dominio = self._resultado_pendente
+            self._resultado_pendente = None
+            self.aplicar_resultado(resultado, manter_escala, dominio)
+    
+    def aplicar_resultado(self, resultado, manter_escala=False, dominio=None):
+        """Atualiza os gráficos com os arrays de um cálculo concluído
+
+        Com manter_escala, os eixos só são ampliados se o resultado não couber neles.
+        dominio = (xmin, xmax) completa com zeros as funções amostradas só no seu
+        suporte, para que os gráficos cubram o domínio inteiro. Antes de os gráficos
+        existirem (ver _criar_graficos), o resultado fica guardado até lá.
+        """
+        if self.camada is None:
+            self._resultado_pendente = (resultado, manter_escala, dominio)
+            return
+        if self._animacao is not None:
+            self._animacao.fechar()  # os quadros eram do resultado anterior
+        self._ultimo_resultado = resultado
+        erro = resultado["erro"]
+        precisao = resultado.get("precisao")
+        if precisao is not None:
+            situacao = "" if precisao["atingida"] else ", alvo NÃO atingido"
+            titulo = (f'Convolução f * g (erro ≈ {precisao["erro_estimado"]:.1e}, alvo {precisao["alvo"]:.1e}: '
+                      f'{precisao["estrategia"]}{situacao})')
+        elif resultado.get("forma_fechada"):
+            titulo = 'Convolução f * g (forma fechada, exata)'
+        elif erro is None:
+            titulo = 'Convolução f * g'
+        else:
+            titulo = f'Convolução f * g (erro estimado máx.: {np.max(erro, initial=0):.1e})'
+        if np.asarray(resultado["y"]).dtype == np.float32:
+            titulo += ' [float32]'
+        titulo_mudou = titulo != self.ax3.get_title()
+        self.ax3.set_title(titulo)
+        
+        if "eixo_ty" in resultado:
+            # Cálculo em disco: eixos implícitos e y em np.memmap, decimados direto do arquivo
+            series = [(resultado["eixo_t1"], resultado["x1"]), (resultado["eixo_t2"], resultado["x2"]),
+                      (resultado["eixo_ty"], resultado["y"])]
+            dominio = None
+        else:
+            series = [(resultado["t1"], resultado["x1"]), (resultado["t2"], resultado["x2"]),
+                      (resultado["ty"], resultado["y"])]
+        if dominio is not None:
+            xmin, xmax = dominio
+            series = [completar_com_zeros(t, y, inicio, fim) for (t, y), (inicio, fim)
+                      in zip(series, [(xmin, xmax), (xmin, xmax), (xmin + xmin, xmax + xmax)])]
+        
+        # Ajusta os limites dos eixos e redesenha (só as linhas, se os limites não mudaram)
+        self.camada.atualizar(series, redesenhar_tudo=titulo_mudou, so_expandir=manter_escala)
 
 def main():
     root = tk.Tk()
     app = ConvolutionApp(root)
     root.mainloop()
+    if app._diretorio_disco is not None:
+        shutil.rmtree(app._diretorio_disco, ignore_errors=True)
 
 if __name__ == "__main__":
     main()
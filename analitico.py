@@ -0,0 +1,511 @@
+"""Forma fechada da convolução para famílias de sinais reconhecidas
+
+Muitos exemplos são combinações de retângulos, exponenciais causais, gaussianas,
+triângulos e cossenos amortecidos. Todos cabem numa soma de termos
+
+    c · t^k · exp(a2·t² + a1·t + a0),  para u <= t <= v
+
+com a2 <= 0 real e c, a1, a0 complexos (cos e sin viram pares de exponenciais
+complexas; np.where, np.abs e comparações viram janelas [u, v]). A análise percorre
+a AST da expressão e escreve a função como soma desses termos; a convolução de dois
+termos é a integral de um polinômio vezes a exponencial de uma quadrática, que tem
+forma fechada (com erf quando há gaussiana). O custo é O(N) por par de termos, sem
+erro de amostragem.
+
+Expressões fora dessas famílias (ou cuja convolução não converge) dão None, e o
+chamador recorre aos métodos numéricos. Os termos reconhecidos são conferidos contra
+a própria expressão em vários pontos antes de serem usados.
+
+Nada aqui importa tkinter ou matplotlib.
+"""
+import ast
+import cmath
+import copy
+import functools
+import math
+
+import numpy as np
+
+from expressoes import compilar_expressao, criar_funcao_intervalo, limites_intervalo
+
+# Limites da análise: termos por função e grau do polinômio em t de cada termo
+MAX_TERMOS = 64
+MAX_GRAU = 4
+# Conferência dos termos contra a expressão compilada
+N_PONTOS_CONFERENCIA = 101
+TOLERANCIA_CONFERENCIA = 1e-9
+# Termos da série de g_j(z) usada para |z| < 1
+N_SERIE = 20
+
+class _NaoReconhecida(Exception):
+    """A expressão sai das famílias com forma fechada"""
+
+def _termo(c=1.0, k=0, a2=0.0, a1=0j, a0=0j, u=-np.inf, v=np.inf):
+    return (complex(c), k, float(a2), complex(a1), complex(a0), u, v)
+
+def _constante(c):
+    return [_termo(c)] if c != 0 else []
+
+def _negar(termos):
+    return [(-termo[0],) + termo[1:] for termo in termos]
+
+def _escalar(termos, fator):
+    return [(termo[0] * fator,) + termo[1:] for termo in termos if termo[0] * fator != 0]
+
+def _multiplicar(termos1, termos2):
+    produto = []
+    for c1, k1, p2, p1, p0, u1, v1 in termos1:
+        for c2, k2, q2, q1, q0, u2, v2 in termos2:
+            u, v = max(u1, u2), min(v1, v2)
+            if u >= v:
+                continue
+            if k1 + k2 > MAX_GRAU:
+                raise _NaoReconhecida("grau do polinômio muito alto")
+            produto.append((c1 * c2, k1 + k2, p2 + q2, p1 + q1, p0 + q0, u, v))
+    if len(produto) > MAX_TERMOS:
+        raise _NaoReconhecida("termos demais")
+    return produto
+
+def _indicadora(janelas):
+    return [_termo(u=u, v=v) for u, v in janelas]
+
+def _restringir(termos, janelas):
+    return _multiplicar(termos, _indicadora(janelas))
+
+# --- Janelas: listas ordenadas de intervalos (u, v) disjuntos ---
+
+def _complemento(janelas):
+    resultado, inicio = [], -np.inf
+    for u, v in janelas:
+        if u > inicio:
+            resultado.append((inicio, u))
+        inicio = v
+    if inicio < np.inf:
+        resultado.append((inicio, np.inf))
+    return resultado
+
+def _uniao(janelas):
+    resultado = []
+    for u, v in sorted(janelas):
+        if resultado and u <= resultado[-1][1]:
+            resultado[-1] = (resultado[-1][0], max(resultado[-1][1], v))
+        else:
+            resultado.append((u, v))
+    return resultado
+
+def _intersecao(janelas1, janelas2):
+    return _uniao([(max(u1, u2), min(v1, v2)) for u1, v1 in janelas1 for u2, v2 in janelas2
+                   if max(u1, u2) < min(v1, v2)])
+
+def _por_partes(termos, grau_max):
+    """Divide a reta nos trechos em que os termos (polinômios com janela) são um só polinômio
+
+    Retorna [(u, v, [p0, p1, ...])]; os trechos cobrem a reta inteira. Termos com
+    exponencial, ou de grau acima de grau_max, levantam _NaoReconhecida.
+    """
+    cortes = sorted({limite for *_, u, v in termos for limite in (u, v) if np.isfinite(limite)})
+    limites = [-np.inf] + cortes + [np.inf]
+    partes = []
+    for u, v in zip(limites[:-1], limites[1:]):
+        coeficientes = [0j] * (grau_max + 1)
+        for c, k, a2, a1, a0, tu, tv in termos:
+            if tu <= u and v <= tv:
+                if a2 != 0 or a1 != 0 or k > grau_max:
+                    raise _NaoReconhecida("esperado um polinômio")
+                coeficientes[k] += c * cmath.exp(a0)
+        partes.append((u, v, coeficientes))
+    return partes
+
+def _reais(coeficientes):
+    if any(abs(c.imag) > 1e-12 * (1 + abs(c.real)) for c in coeficientes):
+        raise _NaoReconhecida("esperado um valor real")
+    return [c.real for c in coeficientes]
+
+def _valor_constante(termos):
+    if any(termo[1:4] != (0, 0.0, 0j) or termo[5:] != (-np.inf, np.inf) for termo in termos):
+        raise _NaoReconhecida("esperada uma constante")
+    return sum((termo[0] * cmath.exp(termo[4]) for termo in termos), 0j)
+
+def _janela_linear(p0, p1, maior):
+    """Onde p0 + p1·t >= 0 (maior) ou <= 0, dentro da reta"""
+    if p1 == 0:
+        return [(-np.inf, np.inf)] if (p0 >= 0 if maior else p0 <= 0) else []
+    raiz = -p0 / p1
+    return [(raiz, np.inf)] if (p1 > 0) == maior else [(-np.inf, raiz)]
+
+def _janelas_nao_negativas(termos):
+    """Janelas em que a função (linear por partes e real) é >= 0"""
+    janelas = []
+    for u, v, coeficientes in _por_partes(termos, 1):
+        p0, p1 = _reais(coeficientes)
+        janelas += _intersecao([(u, v)], _janela_linear(p0, p1, True))
+    return _uniao(janelas)
+
+# --- Tradução da AST ---
+
+def _janelas(no):
+    """Janelas em que uma condição (comparações com & | ~) é verdadeira"""
+    if isinstance(no, ast.Compare):
+        janelas = [(-np.inf, np.inf)]
+        esquerda = no.left
+        for operador, direita in zip(no.ops, no.comparators):
+            diferenca = _termos(esquerda) + _negar(_termos(direita))
+            if isinstance(operador, (ast.Gt, ast.GtE)):
+                parte = _janelas_nao_negativas(diferenca)
+            elif isinstance(operador, (ast.Lt, ast.LtE)):
+                parte = _janelas_nao_negativas(_negar(diferenca))
+            elif isinstance(operador, ast.NotEq):
+                parte = [(-np.inf, np.inf)]  # a igualdade só vale em pontos isolados
+            else:
+                raise _NaoReconhecida("comparação não suportada")
+            janelas = _intersecao(janelas, parte)
+            esquerda = direita
+        return janelas
+    if isinstance(no, ast.BinOp) and isinstance(no.op, ast.BitAnd):
+        return _intersecao(_janelas(no.left), _janelas(no.right))
+    if isinstance(no, ast.BinOp) and isinstance(no.op, ast.BitOr):
+        return _uniao(_janelas(no.left) + _janelas(no.right))
+    if isinstance(no, ast.UnaryOp) and isinstance(no.op, ast.Invert):
+        return _complemento(_janelas(no.operand))
+    raise _NaoReconhecida("condição não suportada")
+
+def _exponencial(termos_argumento, fator=1.0):
+    """exp(fator·x) para x polinomial por partes, de grau até 2"""
+    resultado = []
+    for u, v, (p0, p1, p2) in _por_partes(termos_argumento, 2):
+        p0, p1, p2 = fator * p0, fator * p1, fator * p2
+        if abs(p2.imag) > 1e-12 * (1 + abs(p2.real)) or p2.real > 0:
+            raise _NaoReconhecida("exponencial de quadrática sem decaimento")
+        resultado.append(_termo(1.0, 0, p2.real, p1, p0, u, v))
+    return resultado
+
+class _Substituir(ast.NodeTransformer):
+    """Troca a variável de uma list comprehension por um valor constante"""
+
+    def __init__(self, nome, valor):
+        self.nome = nome
+        self.valor = valor
+
+    def visit_Name(self, no):
+        return ast.Constant(self.valor) if no.id == self.nome else no
+
+def _elementos(no):
+    """Nós somados por np.sum/sum: uma lista literal ou uma list comprehension desenrolada"""
+    if isinstance(no, (ast.List, ast.Tuple)):
+        return no.elts
+    if (isinstance(no, (ast.ListComp, ast.GeneratorExp)) and len(no.generators) == 1
+            and not no.generators[0].ifs and isinstance(no.generators[0].target, ast.Name)):
+        gerador = no.generators[0]
+        try:
+            valores = list(ast.literal_eval(gerador.iter))
+        except ValueError:
+            if not (isinstance(gerador.iter, ast.Call) and ast.unparse(gerador.iter.func) == "range"):
+                raise _NaoReconhecida("iteração não suportada")
+            valores = list(range(*[int(_valor_constante(_termos(a)).real) for a in gerador.iter.args]))
+        if len(valores) > MAX_TERMOS:
+            raise _NaoReconhecida("termos demais")
+        return [_Substituir(gerador.target.id, valor).visit(copy.deepcopy(no.elt)) for valor in valores]
+    raise _NaoReconhecida("soma não suportada")
+
+def _chamada(no):
+    nome = ast.unparse(no.func)
+    argumentos = no.args
+    if nome in ("np.sum", "sum") and len(argumentos) == 1 and all(
+            palavra.arg == "axis" and ast.unparse(palavra.value) == "0" for palavra in no.keywords):
+        termos = []
+        for elemento in _elementos(argumentos[0]):
+            termos += _termos(elemento)
+            if len(termos) > MAX_TERMOS:
+                raise _NaoReconhecida("termos demais")
+        return termos
+    if no.keywords:
+        raise _NaoReconhecida("argumentos nomeados")
+    if nome == "np.exp" and len(argumentos) == 1:
+        return _exponencial(_termos(argumentos[0]))
+    if nome in ("np.cos", "np.sin", "np.cosh", "np.sinh") and len(argumentos) == 1:
+        x = _termos(argumentos[0])
+        for *_, coeficientes in _por_partes(x, 1):
+            _reais(coeficientes)
+        unidade = 1j if nome in ("np.cos", "np.sin") else 1.0
+        positiva, negativa = _exponencial(x, unidade), _exponencial(x, -unidade)
+        if nome == "np.cos" or nome == "np.cosh":
+            return _escalar(positiva, 0.5) + _escalar(negativa, 0.5)
+        if nome == "np.sin":
+            return _escalar(positiva, -0.5j) + _escalar(negativa, 0.5j)
+        return _escalar(positiva, 0.5) + _escalar(negativa, -0.5)
+    if nome in ("np.abs", "abs") and len(argumentos) == 1:
+        x = _termos(argumentos[0])
+        positivas = _janelas_nao_negativas(x)
+        return _restringir(x, positivas) + _negar(_restringir(x, _complemento(positivas)))
+    if nome == "np.sign" and len(argumentos) == 1:
+        x = _termos(argumentos[0])
+        positivas = _janelas_nao_negativas(x)
+        return _indicadora(positivas) + _negar(_indicadora(_complemento(positivas)))
+    if nome == "np.heaviside" and len(argumentos) == 2:
+        return _indicadora(_janelas_nao_negativas(_termos(argumentos[0])))
+    if nome in ("np.maximum", "np.minimum", "max", "min") and len(argumentos) == 2:
+        a, b = _termos(argumentos[0]), _termos(argumentos[1])
+        a_maior = _janelas_nao_negativas(a + _negar(b))
+        if nome in ("np.maximum", "max"):
+            return _restringir(a, a_maior) + _restringir(b, _complemento(a_maior))
+        return _restringir(b, a_maior) + _restringir(a, _complemento(a_maior))
+    if nome == "np.where" and len(argumentos) == 3:
+        janelas = _janelas(argumentos[0])
+        return (_restringir(_termos(argumentos[1]), janelas)
+                + _restringir(_termos(argumentos[2]), _complemento(janelas)))
+    if nome == "np.ones_like" and len(argumentos) == 1:
+        return _constante(1.0)
+    if nome == "np.zeros_like" and len(argumentos) == 1:
+        return []
+    raise _NaoReconhecida(f"função não suportada: {nome}")
+
+def _potencia(no):
+    expoente = _termos(no.right)
+    base = _termos(no.left)
+    try:
+        n = _valor_constante(expoente)
+    except _NaoReconhecida:
+        # b**x com base constante positiva: exp(ln(b)·x)
+        b = _valor_constante(base)
+        if b.imag != 0 or b.real <= 0:
+            raise
+        return _exponencial(expoente, math.log(b.real))
+    if n.imag != 0 or n.real != int(n.real) or not 0 <= n.real <= MAX_GRAU:
+        return _constante(_valor_constante(base) ** n)  # só com base constante
+    resultado = _constante(1.0)
+    for _ in range(int(n.real)):
+        resultado = _multiplicar(resultado, base)
+    return resultado
+
+def _termos(no):
+    """Lista de termos (c, k, a2, a1, a0, u, v) equivalente ao nó da AST"""
+    if isinstance(no, ast.Expression):
+        return _termos(no.body)
+    if isinstance(no, ast.Constant) and isinstance(no.value, (int, float)) and not isinstance(no.value, bool):
+        # (bool fica de fora: é o resultado de comparações, tratadas como janelas)
+        return _constante(no.value)
+    if isinstance(no, ast.Name) and no.id == "t":
+        return [_termo(k=1)]
+    if isinstance(no, ast.Attribute) and ast.unparse(no) in ("np.pi", "np.e"):
+        return _constante(np.pi if no.attr == "pi" else np.e)
+    if isinstance(no, ast.UnaryOp) and isinstance(no.op, ast.USub):
+        return _negar(_termos(no.operand))
+    if isinstance(no, ast.UnaryOp) and isinstance(no.op, ast.UAdd):
+        return _termos(no.operand)
+    if isinstance(no, ast.BinOp):
+        if isinstance(no.op, ast.Add):
+            return _termos(no.left) + _termos(no.right)
+        if isinstance(no.op, ast.Sub):
+            return _termos(no.left) + _negar(_termos(no.right))
+        if isinstance(no.op, ast.Mult):
+            return _multiplicar(_termos(no.left), _termos(no.right))
+        if isinstance(no.op, ast.Div):
+            divisor = _valor_constante(_termos(no.right))
+            if divisor == 0:
+                raise _NaoReconhecida("divisão por zero")
+            return _escalar(_termos(no.left), 1 / divisor)
+        if isinstance(no.op, ast.Pow):
+            return _potencia(no)
+        if isinstance(no.op, (ast.BitAnd, ast.BitOr)):
+            return _indicadora(_janelas(no))
+    if isinstance(no, ast.Compare) or (isinstance(no, ast.UnaryOp) and isinstance(no.op, ast.Invert)):
+        return _indicadora(_janelas(no))
+    if isinstance(no, ast.Call):
+        return _chamada(no)
+    raise _NaoReconhecida(f"construção não suportada: {type(no).__name__}")
+
+def avaliar_termos(termos, t):
+    """Valor (real) da soma de termos nos pontos t"""
+    t = np.asarray(t, dtype=float)
+    y = np.zeros(t.shape, dtype=complex)
+    with np.errstate(over="ignore", invalid="ignore"):
+        for c, k, a2, a1, a0, u, v in termos:
+            dentro = (t >= u) & (t <= v)
+            td = t[dentro]
+            y[dentro] += c * td ** k * np.exp(a2 * td * td + a1 * td + a0)
+    return y.real
+
+def _pontos_conferencia(termos, inicio, fim):
+    """Pontos espalhados (sem cair em bordas redondas) cobrindo as janelas dos termos"""
+    limites = [x for *_, u, v in termos for x in (u, v) if np.isfinite(x)] + [-5.0, 5.0]
+    lo, hi = min(limites) - 1, max(limites) + 1
+    lo, hi = max(lo, inicio), min(hi, fim)
+    fracoes = (np.arange(1, N_PONTOS_CONFERENCIA + 1) * (math.sqrt(5) - 1) / 2) % 1
+    return lo + (hi - lo) * fracoes
+
+@functools.lru_cache(maxsize=256)
+def reconhecer(func_str, interval_type="infinito", x1_str="", x2_str=""):
+    """Termos (c, k, a2, a1, a0, u, v) da função restrita ao intervalo, ou None
+
+    Cada termo vale c·t^k·exp(a2·t² + a1·t + a0) em [u, v] e zero fora. None se a
+    expressão sair das famílias suportadas (ou usar np.random), ou se os termos não
+    reproduzirem a expressão compilada nos pontos de conferência.
+    """
+    expressao = compilar_expressao(func_str)
+    if expressao.usa_aleatorio:
+        return None
+    inicio, fim = limites_intervalo(interval_type, x1_str, x2_str)
+    try:
+        termos = _restringir(_termos(expressao.arvore), [(inicio, fim)])
+    except (_NaoReconhecida, OverflowError, ZeroDivisionError):
+        return None
+    func, _ = criar_funcao_intervalo(func_str, interval_type, x1_str, x2_str)
+    t = _pontos_conferencia(termos, inicio, fim)
+    with np.errstate(all="ignore"):
+        esperado = np.broadcast_to(np.asarray(func(t), dtype=float), t.shape)
+    obtido = avaliar_termos(termos, t)
+    if not np.all(np.abs(obtido - esperado) <= TOLERANCIA_CONFERENCIA * (1 + np.abs(esperado))):
+        return None
+    return tuple(termos)
+
+# --- Integrais ---
+
+def _exp_q(tau, A, B, C):
+    """exp(A·tau² + B·tau + C), com zero nos extremos infinitos (onde o integrando decai)"""
+    finito = np.isfinite(tau)
+    tf = np.where(finito, tau, 0.0)
+    return np.where(finito, np.exp(A * tf * tf + B * tf + C), 0), tf
+
+def _g(z, grau):
+    """[g_0(z), ..., g_grau(z)], g_j(z) = ∫_0^1 u^j e^{zu} du (série para |z| < 1)"""
+    pequeno = np.abs(z) < 1
+    zs, zr = z[pequeno], z[~pequeno]
+    ez = np.exp(zr)
+    potencias = [np.ones_like(zs)]
+    for n in range(1, N_SERIE):
+        potencias.append(potencias[-1] * zs / n)  # z^n / n!
+    valores, anterior = [], None
+    for j in range(grau + 1):
+        valor = np.empty(z.shape, dtype=complex)
+        valor[pequeno] = sum(p / (n + j + 1) for n, p in enumerate(potencias))
+        anterior = (ez - 1) / zr if j == 0 else (ez - j * anterior) / zr
+        valor[~pequeno] = anterior
+        valores.append(valor)
+    return valores
+
+def _momentos_exponencial(lo, hi, B, C, grau):
+    """∫ tau^m e^{B·tau + C} em [lo, hi] para m = 0..grau (sem termo quadrático)
+
+    A integral parte da extremidade em que a exponencial é maior (tau = e + s·x), de
+    modo que e^{s·B·x} decai ao longo do intervalo e nada transborda.
+    """
+    de_baixo = np.isfinite(lo) & ((B.real <= 0) | ~np.isfinite(hi))
+    base = np.where(de_baixo, lo, hi)
+    s = np.where(de_baixo, 1.0, -1.0)
+    beta = s * B
+    L = hi - lo
+    infinito = ~np.isfinite(L)
+    Lf = np.where(infinito, 1.0, L)
+    g = _g(beta * Lf, grau)
+    beta_inf = np.where(infinito, beta, -1.0)
+    # H_j = ∫_0^L x^j e^{beta·x} dx
+    H = [np.where(infinito, math.factorial(j) / (-beta_inf) ** (j + 1), Lf ** (j + 1) * g[j]) for j in range(grau + 1)]
+    e_base = np.exp(B * base + C)
+    return [e_base * sum(math.comb(m, j) * base ** (m - j) * s ** j * H[j] for j in range(m + 1))
+            for m in range(grau + 1)]
+
+def _momentos_gaussiana(lo, hi, A, B, C, grau):
+    """∫ tau^m e^{A·tau² + B·tau + C} em [lo, hi] para m = 0..grau, com A < 0
+
+    Com a = √-A e centro c = -B/(2A), a integral de ordem 0 é
+    e^K·√π/(2a)·[erf(a(hi-c)) - erf(a(lo-c))], K = C - B²/(4A). Para não multiplicar
+    e^K enorme por uma diferença ínfima, os extremos do mesmo lado do centro usam
+    erfcx: e^K·e^{-z²} = e^{Q(tau)} é o próprio integrando no extremo.
+    """
+    from scipy import special  # só as gaussianas precisam do scipy
+    a = math.sqrt(-A)
+    centro = -B / (2 * A)
+    e_lo, lo_f = _exp_q(lo, A, B, C)
+    e_hi, hi_f = _exp_q(hi, A, B, C)
+    z1 = a * (lo_f - centro)
+    z2 = a * (hi_f - centro)
+    fin_lo, fin_hi = np.isfinite(lo), np.isfinite(hi)
+    direita = fin_lo & (z1.real >= 0)
+    esquerda = fin_hi & (z2.real <= 0)
+    esquerda &= ~direita
+    meio = ~(direita | esquerda)
+
+    D = np.empty(B.shape, dtype=complex)
+    d, e, m = direita, esquerda, meio
+    D[d] = e_lo[d] * special.erfcx(z1[d]) - e_hi[d] * special.erfcx(z2[d])
+    D[e] = e_hi[e] * special.erfcx(-z2[e]) - e_lo[e] * special.erfcx(-z1[e])
+    if m.any():
+        # Centro dentro do intervalo: e^K é da ordem do pico do integrando
+        eK = np.exp(C[m] - B[m] ** 2 / (4 * A))
+
+        def e_erf(z, e_q, finito, lado):
+            # e^K·erf(z) no extremo; lado = +1/-1 para os extremos infinitos
+            sinal = np.where(z.real >= 0, 1.0, -1.0)
+            return np.where(finito, sinal * (eK - e_q * special.erfcx(sinal * z)), lado * eK)
+
+        D[m] = e_erf(z2[m], e_hi[m], fin_hi[m], 1.0) - e_erf(z1[m], e_lo[m], fin_lo[m], -1.0)
+    momentos = [math.sqrt(math.pi) / (2 * a) * D]
+    # d/dtau (tau^n e^Q) = n·tau^(n-1) e^Q + (2A·tau + B)·tau^n e^Q
+    for n in range(grau):
+        borda = e_hi * hi_f ** n - e_lo * lo_f ** n
+        anterior = n * momentos[n - 1] if n else 0
+        momentos.append((borda - anterior - B * momentos[n]) / (2 * A))
+    return momentos
+
+def _convergente(termo_f, termo_g):
+    """A integral do par converge nos extremos infinitos?"""
+    _, _, a2, a1, _, u1, v1 = termo_f
+    _, _, b2, b1, _, u2, v2 = termo_g
+    if a2 + b2 < 0:
+        return True
+    inclinacao = (a1 - b1).real
+    if v1 == np.inf and u2 == -np.inf and not inclinacao < 0:
+        return False
+    if u1 == -np.inf and v2 == np.inf and not inclinacao > 0:
+        return False
+    return True
+
+def _conv_par(termo_f, termo_g, t):
+    """(termo_f * termo_g)(t), complexo"""
+    c1, k1, a2, a1, a0, u1, v1 = termo_f
+    c2, k2, b2, b1, b0, u2, v2 = termo_g
+    y = np.zeros(t.shape, dtype=complex)
+    lo = np.maximum(u1, t - v2)
+    hi = np.minimum(v1, t - u2)
+    validos = lo < hi
+    if not validos.any():
+        return y
+    tv, lo, hi = t[validos], lo[validos], hi[validos]
+    # f(tau)·g(t - tau) = c1·c2·tau^k1·(t - tau)^k2·e^{A·tau² + B·tau + C}
+    A = a2 + b2
+    B = a1 - 2 * b2 * tv - b1 + 0j
+    C = a0 + b0 + b2 * tv * tv + b1 * tv + 0j
+    if A < 0:
+        momentos = _momentos_gaussiana(lo, hi, A, B, C, k1 + k2)
+    else:
+        momentos = _momentos_exponencial(lo, hi, B, C, k1 + k2)
+    # (t - tau)^k2 = Σ_j C(k2, j)·t^(k2-j)·(-tau)^j
+    soma = sum(math.comb(k2, j) * tv ** (k2 - j) * (-1) ** j * momentos[k1 + j] for j in range(k2 + 1))
+    y[validos] = c1 * c2 * soma
+    return y
+
+def conv_termos(termos_f, termos_g, t):
+    """Convolução exata das somas de termos nos pontos t, ou None se não convergir"""
+    t = np.asarray(t, dtype=float)
+    if not all(_convergente(tf, tg) for tf in termos_f for tg in termos_g):
+        return None
+    y = np.zeros(t.shape, dtype=complex)
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore", under="ignore"):
+        for termo_f in termos_f:
+            for termo_g in termos_g:
+                y += _conv_par(termo_f, termo_g, t)
+    if not np.all(np.isfinite(y)):
+        return None
+    return y.real
+
+def conv_analitica(spec_f, spec_g, t):
+    """Convolução contínua exata de f e g nos pontos t, ou None se não houver forma fechada
+
+    spec_f e spec_g são (expressão, tipo de intervalo, x1, x2). Calcula o mesmo que o
+    método "scipy" (f e g nos seus intervalos, sem recorte ao domínio).
+    """
+    termos_f = reconhecer(*spec_f)
+    termos_g = reconhecer(*spec_g)
+    if termos_f is None or termos_g is None:
+        return None
+    return conv_termos(termos_f, termos_g, t)
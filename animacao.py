@@ -0,0 +1,225 @@
+"""Animação da convolução: g(t - τ) deslizando sobre f(τ), com a área do produto
+
+QuadrosAnimacao pré-calcula, uma vez, o que cada quadro precisa a partir das amostras
+já calculadas (t1, x1, t2, x2, com o mesmo dt), sem copiar os sinais:
+
+- g(t_k - τ) é sempre a mesma curva g invertida, só deslocada de t_k no eixo τ: ela é
+  reduzida uma vez (mínimo/máximo por coluna) e o deslocamento de cada quadro é uma
+  translação aplicada ao artista;
+- o produto f(τ)·g(t_k - τ) do quadro k usa as fatias x1[i0:i1] e x2[k-i0:k-i1:-1],
+  que são vistas dos arrays amostrados (com passo, para limitar os pontos desenhados);
+- a saída (f * g)(t) até t_k são vistas de y (a convolução discreta, calculada uma vez).
+
+DesenhoAnimacao desenha um quadro numa figura: na tela, com blitting (só os artistas
+que se movem são redesenhados sobre um fundo guardado); fora da tela, com desenho
+completo, em exportar_animacao (figura própria com canvas Agg, para uma thread de
+trabalho).
+
+Nada aqui importa tkinter ou pyplot.
+"""
+import time
+
+import numpy as np
+
+from grafico import decimar_min_max
+from nucleo import conv_discreta
+
+# Quadros e quadros por segundo padrão
+N_QUADROS_PADRAO = 200
+FPS_PADRAO = 25
+# Pontos por quadro: produto sombreado, saída acumulada e g invertida (colunas)
+MAX_PONTOS_QUADRO = 2000
+
+class QuadrosAnimacao:
+    """Quadros pré-calculados da animação para as amostras de um resultado
+
+    t1/x1 e t2/x2 são as amostras de f e g (grades uniformes com o mesmo dt, como as
+    de nucleo.calcular_convolucao). Os quadros ficam em n_quadros instantes t_k
+    igualmente espaçados na saída.
+    """
+
+    def __init__(self, t1, x1, t2, x2, n_quadros=N_QUADROS_PADRAO):
+        if len(t1) < 2 or len(t2) < 2:
+            raise ValueError("f e g precisam de pelo menos duas amostras no domínio")
+        dt = float(t1[1] - t1[0])
+        if not np.isclose(dt, t2[1] - t2[0], rtol=1e-9):
+            raise ValueError("f e g precisam estar amostradas com o mesmo dt")
+        self.t1, self.x1 = np.asarray(t1), np.asarray(x1)
+        self.t2, self.x2 = np.asarray(t2), np.asarray(x2)
+        self.dt = dt
+        n1, n2 = self.x1.size, self.x2.size
+
+        # Saída: a mesma soma que a área sombreada de cada quadro
+        self.y = conv_discreta(self.x1, self.x2, dt)
+        self.ty = self.t1[0] + self.t2[0] + dt * np.arange(self.y.size)
+        self.indices = np.unique(np.linspace(0, self.y.size - 1, max(int(n_quadros), 2)).round().astype(int))
+        self.passo_saida = max(1, -(-self.y.size // MAX_PONTOS_QUADRO))
+
+        # g(t_k - τ) = g invertida em τ = t_k - t2: a curva é a mesma em todos os quadros
+        self.tau_nucleo, self.x_nucleo = decimar_min_max(-self.t2[::-1], self.x2[::-1], -self.t2[-1], -self.t2[0],
+                                                         MAX_PONTOS_QUADRO // 2)
+
+        # Trecho de f sob g(t_k - τ) em cada quadro: índices i em [i0, i1)
+        self.i0 = np.maximum(0, self.indices - (n2 - 1))
+        self.i1 = np.minimum(n1, self.indices + 1)
+        self.passo_produto = max(1, -(-min(n1, n2) // MAX_PONTOS_QUADRO))
+        self._produtos = [self._produto(q) for q in range(len(self))]
+        extremos = [(p.min(), p.max()) for _, p in self._produtos if p.size]
+        self.limites_produto = (min((e[0] for e in extremos), default=0.0),
+                                max((e[1] for e in extremos), default=0.0))
+
+    def __len__(self):
+        return self.indices.size
+
+    def _produto(self, q):
+        k, i0, i1, p = self.indices[q], self.i0[q], self.i1[q], self.passo_produto
+        if i0 >= i1:
+            return self.t1[:0], self.x1[:0]
+        # x2[k - i] para i = i0, i0 + p, ... (< i1): vista com passo negativo
+        fim = k - i1 if k - i1 >= 0 else None
+        return self.t1[i0:i1:p], self.x1[i0:i1:p] * self.x2[k - i0:fim:-p]
+
+    def t(self, q):
+        """Instante t_k do quadro q"""
+        return self.ty[self.indices[q]]
+
+    def valor(self, q):
+        """(f * g)(t_k) no quadro q"""
+        return self.y[self.indices[q]]
+
+    def produto(self, q):
+        """(τ, f(τ)·g(t_k - τ)) no trecho de sobreposição do quadro q"""
+        return self._produtos[q]
+
+    def saida_ate(self, q):
+        """Vistas (ty, y) da saída até t_k, com passo limitado a MAX_PONTOS_QUADRO pontos"""
+        k = self.indices[q]
+        return self.ty[:k + 1:self.passo_saida], self.y[:k + 1:self.passo_saida]
+
+    def limites_tau(self):
+        """Faixa de τ percorrida por g(t - τ) do primeiro ao último quadro"""
+        return self.t(0) - self.t2[-1], self.t(len(self) - 1) - self.t2[0]
+
+    def limites_verticais(self):
+        """Faixa vertical que contém f, g e o produto"""
+        inferior = min(0.0, float(self.x1.min()), float(self.x2.min()), self.limites_produto[0])
+        superior = max(0.0, float(self.x1.max()), float(self.x2.max()), self.limites_produto[1])
+        margem = 0.05 * (superior - inferior) or 1.0
+        return inferior - margem, superior + margem
+
+class DesenhoAnimacao:
+    """Artistas da animação (g deslocada, área do produto, saída acumulada) sobre dois eixos
+
+    ax_tau recebe g(t_k - τ) e a área de f(τ)·g(t_k - τ); ax_saida, a saída até t_k e
+    o ponto atual. Com blit, os artistas são "animated" e cada quadro restaura o fundo
+    guardado no último desenho completo, desenha só eles e faz o blit; sem blit (figura
+    fora da tela), mostrar() só atualiza os artistas, e quem chama desenha a figura.
+    """
+
+    def __init__(self, quadros, ax_tau, ax_saida, blit=True):
+        from matplotlib.patches import Polygon
+        from matplotlib.transforms import Affine2D
+        self.quadros = quadros
+        self.canvas = ax_tau.figure.canvas
+        self.figura = ax_tau.figure
+        self.blit = blit
+        self._translacao = Affine2D()
+        (self.nucleo,) = ax_tau.plot(quadros.tau_nucleo, quadros.x_nucleo, color='red', lw=1.5,
+                                     transform=self._translacao + ax_tau.transData, animated=blit)
+        self.area = Polygon(np.zeros((1, 2)), closed=True, facecolor='green', edgecolor='darkgreen',
+                            alpha=0.35, animated=blit)
+        ax_tau.add_patch(self.area)
+        self.texto = ax_tau.text(0.01, 0.97, "", transform=ax_tau.transAxes, va='top', animated=blit)
+        (self.saida,) = ax_saida.plot([], [], color='green', lw=2, animated=blit)
+        (self.ponto,) = ax_saida.plot([], [], 'o', color='black', animated=blit)
+        self.artistas = [self.area, self.nucleo, self.texto, self.saida, self.ponto]
+        self._fundo = None
+        self._quadro = 0
+        self._conexao = self.canvas.mpl_connect("draw_event", self._ao_desenhar) if blit else None
+
+    def _ao_desenhar(self, evento):
+        """Após cada desenho completo: guarda o fundo e desenha os artistas por cima"""
+        self._fundo = self.canvas.copy_from_bbox(self.figura.bbox)
+        self._desenhar_artistas()
+
+    def _desenhar_artistas(self):
+        for artista in self.artistas:
+            self.figura.draw_artist(artista)
+
+    def mostrar(self, q):
+        """Atualiza os artistas para o quadro q (com blit, também os desenha na tela)"""
+        self._quadro = q
+        quadros = self.quadros
+        t_q = quadros.t(q)
+        self._translacao.clear().translate(t_q, 0)
+        tau, produto = quadros.produto(q)
+        if tau.size:
+            self.area.set_xy(np.column_stack([np.concatenate([[tau[0]], tau, [tau[-1]]]),
+                                              np.concatenate([[0.0], produto, [0.0]])]))
+        self.area.set_visible(bool(tau.size))
+        self.saida.set_data(*quadros.saida_ate(q))
+        self.ponto.set_data([t_q], [quadros.valor(q)])
+        self.texto.set_text(f"t = {t_q:.4g}    (f * g)(t) = {quadros.valor(q):.4g}")
+        if not self.blit:
+            return
+        if self._fundo is None:
+            self.canvas.draw()  # o primeiro desenho completo guarda o fundo (ver _ao_desenhar)
+            return
+        self.canvas.restore_region(self._fundo)
+        self._desenhar_artistas()
+        self.canvas.blit(self.figura.bbox)
+
+    def remover(self):
+        """Tira os artistas da figura (quem chama redesenha)"""
+        if self._conexao is not None:
+            self.canvas.mpl_disconnect(self._conexao)
+            self._conexao = None
+        for artista in self.artistas:
+            artista.remove()
+
+def exportar_animacao(quadros, caminho, fps=FPS_PADRAO, progresso=None, tamanho=(8, 6), dpi=100):
+    """Grava a animação em .gif (Pillow) ou vídeo (.mp4 etc., ffmpeg), desenhada fora da tela
+
+    Usa uma figura própria com canvas Agg (sem tkinter nem pyplot), de modo que pode
+    rodar numa thread de trabalho. progresso(fração), se dado, é chamado a cada quadro
+    e pode levantar uma exceção (ex.: nucleo.CalculoCancelado) para interromper; o
+    arquivo incompleto fica a cargo de quem chama. Retorna o tempo gasto, em segundos.
+    """
+    from matplotlib import animation
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    inicio = time.perf_counter()
+    if caminho.lower().endswith(".gif"):
+        gravador = animation.PillowWriter(fps=fps)
+    elif animation.FFMpegWriter.isAvailable():
+        gravador = animation.FFMpegWriter(fps=fps)
+    else:
+        raise RuntimeError("ffmpeg não encontrado: exporte a animação em .gif")
+
+    figura = Figure(figsize=tamanho, dpi=dpi)
+    FigureCanvasAgg(figura)
+    ax_tau, ax_saida = figura.subplots(2, 1)
+    ax_tau.plot(*decimar_min_max(quadros.t1, quadros.x1, quadros.t1[0], quadros.t1[-1], MAX_PONTOS_QUADRO // 2),
+                color='blue', label='f(τ)')
+    ax_tau.plot([], [], color='red', label='g(t - τ)')
+    ax_tau.set_xlim(*quadros.limites_tau())
+    ax_tau.set_ylim(*quadros.limites_verticais())
+    ax_tau.set_xlabel('τ')
+    ax_tau.legend(loc='upper right')
+    ax_tau.grid(True, alpha=0.3)
+    ax_saida.plot(*decimar_min_max(quadros.ty, quadros.y, quadros.ty[0], quadros.ty[-1], MAX_PONTOS_QUADRO // 2),
+                  color='green', alpha=0.25)
+    ax_saida.set_xlim(quadros.ty[0], quadros.ty[-1])
+    ax_saida.set_xlabel('t')
+    ax_saida.set_title('Convolução f * g')
+    ax_saida.grid(True, alpha=0.3)
+    figura.tight_layout()
+
+    desenho = DesenhoAnimacao(quadros, ax_tau, ax_saida, blit=False)
+    with gravador.saving(figura, caminho, dpi):
+        for q in range(len(quadros)):
+            desenho.mostrar(q)
+            gravador.grab_frame()
+            if progresso is not None:
+                progresso((q + 1) / len(quadros))
+    return time.perf_counter() - inicio
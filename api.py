@@ -0,0 +1,131 @@
+"""API de cálculo sem interface gráfica
+
+Permite calcular convoluções a partir de scripts ou servidores sem tela. Nada aqui
+importa tkinter ou matplotlib.
+
+Exemplo:
+    from api import convoluir
+    r = convoluir("1", "np.exp(-t)", ("finito", 0, 1), ("semi_inf_dir", 0, None), N=2000)
+    r["ty"], r["y"]
+"""
+from cascata import CascataConvolucao
+from memoria_externa import calcular_em_disco
+from nucleo import calcular_convolucao, relatorio_precisao, METODOS_DISCRETOS, TIPOS_NUMERICOS
+from varredura import conv_varredura
+
+# Valores padrão dos campos de um job (os mesmos da interface gráfica)
+PADROES_JOB = {
+    "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
+    "f2_interval": "infinito", "f2_x1": "", "f2_x2": "",
+    "xmin": -5.0, "xmax": 5.0, "N": 1000, "method": "auto",
+    "workers": 1, "bloco": None, "tol_abs": 1e-6, "tol_rel": 1e-4, "grades": "suporte",
+    "tipo_numerico": "float64",
+}
+
+METODOS = METODOS_DISCRETOS + ["scipy", "quad", "tolerancia", "analitico"]
+
+# Amostragem de f e g: cada uma no próprio suporte, ou as duas em [xmin, xmax]
+GRADES = ["suporte", "dominio"]
+
+def _texto_limite(valor):
+    """Limites podem vir como número, texto ou None (JSON); internamente são texto"""
+    return "" if valor is None else str(valor)
+
+def normalizar_job(job):
+    """Completa um job no formato dos exemplos (f1, f1_interval, ...) com os valores padrão
+
+    Levanta ValueError se faltar uma expressão ou se o método, as grades ou o tipo
+    numérico forem desconhecidos.
+    """
+    for campo in ("f1", "f2"):
+        if not job.get(campo):
+            raise ValueError(f"Job sem a expressão '{campo}'")
+    params = dict(PADROES_JOB)
+    params.update(job)
+    for campo in ("f1_x1", "f1_x2", "f2_x1", "f2_x2"):
+        params[campo] = _texto_limite(params[campo])
+    params["xmin"] = float(params["xmin"])
+    params["xmax"] = float(params["xmax"])
+    params["N"] = int(params["N"])
+    params["tol_abs"] = float(params["tol_abs"])
+    params["tol_rel"] = float(params["tol_rel"])
+    if params["method"] not in METODOS:
+        raise ValueError(f"Método desconhecido: {params['method']} (use um de {', '.join(METODOS)})")
+    if params["grades"] not in GRADES:
+        raise ValueError(f"Grades desconhecidas: {params['grades']} (use um de {', '.join(GRADES)})")
+    if params["tipo_numerico"] not in TIPOS_NUMERICOS:
+        raise ValueError(f"Tipo numérico desconhecido: {params['tipo_numerico']} "
+                         f"(use um de {', '.join(TIPOS_NUMERICOS)})")
+    return params
+
+def convoluir(f1, f2, intervalo_f1=("infinito", None, None), intervalo_f2=("infinito", None, None),
+              xmin=-5.0, xmax=5.0, N=1000, method="auto", workers=1, bloco=None, tol_abs=1e-6, tol_rel=1e-4,
+              grades="suporte", tipo_numerico="float64", progresso=None):
+    """Calcula f1 * f2 a partir das expressões em texto
+
+    Cada intervalo é uma tupla (tipo, x1, x2), com tipo em "infinito", "semi_inf_esq",
+    "semi_inf_dir" ou "finito". Retorna um dict com os arrays t1, x1, t2, x2, ty, y e
+    erro (estimativa por ponto nos métodos "scipy" e "tolerancia"; None nos discretos
+    e no "quad", que integra ponto a ponto com integrate.quad).
+    Com method="tolerancia", o caminho mais barato que atinge max(tol_abs, tol_rel·pico)
+    é escolhido automaticamente, e o dict traz também "precisao" (etapa usada e erro).
+    Com method="analitico", retângulos, exponenciais, gaussianas, triângulos e
+    cossenos amortecidos são convoluídos pela forma fechada ("forma_fechada" no dict
+    diz se ela foi usada; senão o cálculo é o do método "scipy").
+    Com grades="suporte", t1/x1 e t2/x2 cobrem só o intervalo de cada função (com o
+    mesmo dt) e ty só supp(f1) + supp(f2); fora disso os valores são zero.
+    Com tipo_numerico="float32", x1, x2 e (nos métodos discretos) y vêm em precisão
+    simples; o erro em relação a float64 é medido por comparar_precisao.
+    """
+    job = {
+        "f1": f1, "f1_interval": intervalo_f1[0], "f1_x1": intervalo_f1[1], "f1_x2": intervalo_f1[2],
+        "f2": f2, "f2_interval": intervalo_f2[0], "f2_x1": intervalo_f2[1], "f2_x2": intervalo_f2[2],
+        "xmin": xmin, "xmax": xmax, "N": N, "method": method, "workers": workers, "bloco": bloco,
+        "tol_abs": tol_abs, "tol_rel": tol_rel, "grades": grades, "tipo_numerico": tipo_numerico,
+    }
+    return calcular_job(job, progresso)
+
+def calcular_job(job, progresso=None):
+    """Calcula um job no formato dos exemplos (ver normalizar_job)"""
+    return calcular_convolucao(normalizar_job(job), progresso)
+
+def comparar_precisao(job):
+    """Erro do job calculado em float32 em relação ao float64 (ver nucleo.relatorio_precisao)"""
+    return relatorio_precisao(normalizar_job(job))
+
+def varrer_parametro(job, parametro, valores, progresso=None):
+    """Convolução de f1 com f2 para cada valor de um parâmetro da expressão f2
+
+    Ex.: varrer_parametro({"f1": "1", "f1_interval": "finito", "f1_x1": 0, "f1_x2": 1,
+    "f2": "np.exp(-a*t)", "f2_interval": "semi_inf_dir", "f2_x1": 0}, "a",
+    np.linspace(0.1, 10, 200)). Sempre usa FFT; retorna os arrays 2D x2 e y, uma
+    linha por valor (ver varredura.conv_varredura).
+    """
+    return conv_varredura(normalizar_job(job), parametro, valores, progresso)
+
+def calcular_job_em_disco(job, diretorio, progresso=None):
+    """Como calcular_job, com x1, x2 e y em arquivos np.memmap dentro de diretorio
+
+    Para N grande demais para a memória (ex.: 10⁸). Sempre pelo caminho discreto;
+    os eixos vêm como EixoTempo em "eixo_t1", "eixo_t2" e "eixo_ty" (ver
+    memoria_externa.calcular_em_disco).
+    """
+    return calcular_em_disco(normalizar_job(job), diretorio, progresso)
+
+def calcular_cascata(job, progresso=None):
+    """Cadeia f1 * f2 * f3 * ... de um job, num único passe espectral
+
+    Os estágios além de f1 e f2 vêm em job["estagios"], uma lista de dicts {"f": ...,
+    "interval": ..., "x1": ..., "x2": ...}, ex.: {"f": "np.exp(-t)", "interval":
+    "semi_inf_dir", "x1": 0}. Sempre pelo caminho FFT; retorna a CascataConvolucao
+    (saída em .ty e .y, intermediários por .parcial(k)).
+    """
+    params = normalizar_job(job)
+    estagios = []
+    for i, estagio in enumerate(job.get("estagios", []), start=3):
+        if not estagio.get("f"):
+            raise ValueError(f"Estágio f{i} sem a expressão 'f'")
+        estagios.append({"f": estagio["f"], "interval": estagio.get("interval", "infinito"),
+                         "x1": _texto_limite(estagio.get("x1")), "x2": _texto_limite(estagio.get("x2"))})
+    params["estagios"] = estagios
+    return CascataConvolucao(params, progresso)
@@ -0,0 +1,311 @@
+"""Benchmark dos métodos de convolução sobre a biblioteca de exemplos
+
+Executa cada exemplo de exemplos.EXEMPLOS com cada método e uma varredura de N,
+registrando o tempo de cada etapa (compilação, amostragem, convolução), o pico de
+memória (tracemalloc) e o erro em relação a uma referência de alta precisão (a
+forma fechada, quando f e g são reconhecidas por analitico; senão a convolução
+contínua com malha fina e tolerância apertada, nos pontos da própria saída). Nos
+métodos discretos e no "tolerancia", que calculam com f e g restritas a [XMIN, XMAX],
+a referência usa os intervalos recortados ao domínio. O relatório é um JSON, e dois
+relatórios podem ser comparados para detectar regressões entre versões.
+
+O comando "inicio" mede a abertura da interface num processo novo (importação de
+Convolução.py, janela principal na tela e gráficos prontos) e falha se a janela
+demorar mais que ALVO_INICIO_S.
+
+Uso:
+    python benchmark.py executar --saida base.json
+    python benchmark.py executar --n 500 5000 --metodos auto scipy --exemplos Radar
+    python benchmark.py comparar base.json novo.json --limite 1.2
+    python benchmark.py inicio --repeticoes 5
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import scipy
+
+from analitico import conv_analitica
+from api import normalizar_job
+from exemplos import EXEMPLOS
+from expressoes import compilar_expressao, criar_funcao_intervalo
+from nucleo import calcular_convolucao, conv_continua_lote, METODOS_DISCRETOS
+
+N_PADRAO = [500, 2000, 10000, 100000, 1000000]
+METODOS_PADRAO = METODOS_DISCRETOS + ["scipy", "quad", "tolerancia", "analitico"]
+
+# Limites de N por método: acima deles uma execução levaria minutos (numpy é O(N²);
+# scipy e quad integram 2N pontos; tolerancia pode chegar à quadratura com 2N-1 pontos;
+# analitico recorre à integração do scipy nos exemplos sem forma fechada)
+N_MAX_PADRAO = {"numpy": 20000, "scipy": 5000, "quad": 5000, "tolerancia": 5000, "analitico": 100000}
+
+# Domínio usado para todos os exemplos (o mesmo padrão da interface)
+XMIN, XMAX = -5.0, 5.0
+# Pontos da saída comparados com a referência em cada caso
+N_PONTOS_REFERENCIA = 401
+
+# Abertura da interface: tempo máximo (s), desde o lançamento do processo, até a janela
+# principal aparecer (sem tela, vale o tempo de importação de Convolução.py)
+ALVO_INICIO_S = 1.0
+
+# Executado num processo novo por medir_inicio: imprime, em JSON, o instante (time.time)
+# de cada marco da abertura; sem tela, só o da importação
+_SCRIPT_INICIO = """
+import importlib, json, time
+marcos = {}
+modulo = importlib.import_module("Convolução")
+marcos["importacao"] = time.time()
+import tkinter as tk
+try:
+    root = tk.Tk()
+except tk.TclError:
+    root = None
+if root is not None:
+    app = modulo.ConvolutionApp(root)
+    def mapeada(evento):
+        if evento.widget is root:
+            marcos.setdefault("janela", time.time())
+    def esperar_graficos():
+        if app.camada is None:
+            root.after(5, esperar_graficos)
+            return
+        root.update()
+        marcos["graficos"] = time.time()
+        root.destroy()
+    root.bind("<Map>", mapeada, add="+")
+    root.after(5, esperar_graficos)
+    root.mainloop()
+print(json.dumps(marcos))
+"""
+
+# Referências já calculadas, por (exemplo, recorte, forma fechada, pontos): métodos
+# discretos com o mesmo N compartilham a mesma grade de saída
+_referencias = {}
+
+# Métodos que calculam com f e g restritas a [XMIN, XMAX] (os contínuos integram f e g
+# nos seus intervalos, sem recorte)
+METODOS_RECORTADOS = METODOS_DISCRETOS + ["tolerancia"]
+
+def _e_aleatorio(exemplo):
+    return compilar_expressao(exemplo["f1"]).usa_aleatorio or compilar_expressao(exemplo["f2"]).usa_aleatorio
+
+def _specs(exemplo, recortar):
+    """(expressão, tipo, x1, x2) de f e g; com recortar, intervalos recortados a [XMIN, XMAX]
+
+    Retorna None se, recortado, o intervalo de f ou de g ficar vazio.
+    """
+    specs = []
+    for prefixo in ("f1", "f2"):
+        spec = (exemplo[prefixo], exemplo[prefixo + "_interval"], exemplo[prefixo + "_x1"], exemplo[prefixo + "_x2"])
+        if recortar:
+            _, suporte = criar_funcao_intervalo(*spec)
+            inicio, fim = max(suporte["inicio"], XMIN), min(suporte["fim"], XMAX)
+            if inicio >= fim:
+                return None
+            spec = (spec[0], "finito", repr(float(inicio)), repr(float(fim)))
+        specs.append(spec)
+    return specs
+
+def referencia(exemplo, t_ref, recortar=False, forma_fechada=True):
+    """Convolução contínua nos pontos t_ref com alta precisão
+
+    Com recortar, f e g são restritas a [XMIN, XMAX], como nos métodos discretos. Usa a
+    forma fechada quando existe e forma_fechada é True (False ao medir o próprio método
+    "analitico"). Senão, começa com 32 painéis por segmento (o método "scipy" começa
+    com 4), para que a referência não coincida por construção com o resultado do
+    próprio método.
+    """
+    chave = (exemplo["name"], recortar, forma_fechada, t_ref.tobytes())
+    if chave in _referencias:
+        return _referencias[chave]
+    specs = _specs(exemplo, recortar)
+    if specs is None:
+        y_ref = np.zeros(t_ref.size)  # f ou g é nula no domínio
+    else:
+        y_ref = conv_analitica(*specs, t_ref) if forma_fechada else None
+    if y_ref is None:
+        (f, suporte_f), (g, suporte_g) = [criar_funcao_intervalo(*spec) for spec in specs]
+        y_ref, _ = conv_continua_lote(f, g, t_ref, suporte_f, suporte_g, tol_abs=1e-12, tol_rel=1e-10,
+                                      paineis_iniciais=32, paineis_max=1024, escala=max(1.0, (XMAX - XMIN) / 2))
+    _referencias[chave] = y_ref
+    return y_ref
+
+def _erro(exemplo, metodo, resultado):
+    """Erro máximo (absoluto e relativo ao pico) em N_PONTOS_REFERENCIA pontos da própria saída
+
+    A comparação é feita nos pontos da grade do resultado, para não misturar o erro do
+    método com o erro de interpolação, e contra a mesma grandeza que o método calcula
+    (ver referencia). Exemplos com np.random não têm referência.
+    """
+    if _e_aleatorio(exemplo):
+        return None, None
+    ty = np.asarray(resultado["ty"])
+    indices = np.unique(np.linspace(0, ty.size - 1, N_PONTOS_REFERENCIA).round().astype(int))
+    y_ref = referencia(exemplo, ty[indices], recortar=metodo in METODOS_RECORTADOS,
+                       forma_fechada=metodo != "analitico")
+    erro_abs = float(np.max(np.abs(np.asarray(resultado["y"])[indices] - y_ref)))
+    escala = float(np.max(np.abs(y_ref)))
+    return erro_abs, (erro_abs / escala if escala > 0 else None)
+
+def medir(exemplo, metodo, N, repeticoes=3, memoria=True):
+    """Executa um caso e retorna o registro do relatório"""
+    params = normalizar_job(dict(exemplo, xmin=XMIN, xmax=XMAX, N=N, method=metodo))
+    melhores = None
+    for _ in range(repeticoes):
+        np.random.seed(0)  # exemplos com np.random ficam reprodutíveis
+        tempos = {}
+        inicio = time.perf_counter()
+        resultado = calcular_convolucao(params, tempos=tempos)
+        tempos["total"] = time.perf_counter() - inicio
+        if melhores is None or tempos["total"] < melhores["total"]:
+            melhores = tempos
+
+    pico = None
+    if memoria:
+        tracemalloc.start()
+        np.random.seed(0)
+        calcular_convolucao(params)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    erro_abs, erro_rel = _erro(exemplo, metodo, resultado)
+    return {
+        "exemplo": exemplo["name"], "metodo": metodo, "N": N,
+        "tempos_s": melhores, "memoria_pico_bytes": pico,
+        "erro_abs": erro_abs, "erro_rel": erro_rel,
+    }
+
+def medir_inicio(repeticoes=5):
+    """Abre a interface repeticoes vezes em processos novos; retorna o menor tempo de cada marco
+
+    Os tempos (s) contam do lançamento do interpretador, de modo que incluem a sua
+    própria inicialização, como para quem abre o programa.
+    """
+    melhores = {}
+    for _ in range(repeticoes):
+        lancamento = time.time()
+        saida = subprocess.run([sys.executable, "-c", _SCRIPT_INICIO], capture_output=True, text=True,
+                               check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        for marco, instante in json.loads(saida.strip().splitlines()[-1]).items():
+            melhores[marco] = min(melhores.get(marco, float("inf")), instante - lancamento)
+    return melhores
+
+def _versao_codigo():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def executar(valores_n, metodos, filtro=None, repeticoes=3, memoria=True, n_max=None):
+    """Roda a varredura completa e retorna o relatório (dict serializável em JSON)"""
+    n_max = dict(N_MAX_PADRAO, **(n_max or {}))
+    exemplos = [e for e in EXEMPLOS if not filtro or any(f.lower() in e["name"].lower() for f in filtro)]
+    registros = []
+    for exemplo in exemplos:
+        for metodo in metodos:
+            for N in valores_n:
+                if N > n_max.get(metodo, float("inf")):
+                    continue
+                registro = medir(exemplo, metodo, N, repeticoes, memoria)
+                registros.append(registro)
+                erro = registro["erro_rel"]
+                print(f"{exemplo['name'][:30]:32s} {metodo:12s} N={N:<8d} "
+                      f"{registro['tempos_s']['total']:9.4f} s  erro_rel="
+                      f"{'-' if erro is None else f'{erro:.2e}'}", flush=True)
+    return {
+        "versao": _versao_codigo(),
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "plataforma": {"python": platform.python_version(), "sistema": platform.platform(),
+                       "numpy": np.__version__, "scipy": scipy.__version__},
+        "dominio": [XMIN, XMAX],
+        "resultados": registros,
+    }
+
+def comparar(base, novo, limite=1.2, limite_erro=2.0, tempo_minimo=1e-3):
+    """Compara dois relatórios; retorna a lista de regressões (tempo ou erro) encontradas"""
+    indice_base = {(r["exemplo"], r["metodo"], r["N"]): r for r in base["resultados"]}
+    regressoes = []
+    for r in novo["resultados"]:
+        chave = (r["exemplo"], r["metodo"], r["N"])
+        b = indice_base.get(chave)
+        if b is None:
+            continue
+        t_base, t_novo = b["tempos_s"]["total"], r["tempos_s"]["total"]
+        if t_novo > t_base * limite and t_novo - t_base > tempo_minimo:
+            regressoes.append({"caso": chave, "tipo": "tempo", "base": t_base, "novo": t_novo})
+        e_base, e_novo = b["erro_rel"], r["erro_rel"]
+        if e_base is not None and e_novo is not None and e_novo > e_base * limite_erro + 1e-12:
+            regressoes.append({"caso": chave, "tipo": "erro", "base": e_base, "novo": e_novo})
+    return regressoes
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos métodos de convolução.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_exec = sub.add_parser("executar", help="roda o benchmark e grava o relatório")
+    p_exec.add_argument("--saida", default="benchmark.json", help="arquivo JSON do relatório")
+    p_exec.add_argument("--n", type=int, nargs="+", default=N_PADRAO, help="valores de N")
+    p_exec.add_argument("--metodos", nargs="+", default=METODOS_PADRAO, choices=METODOS_PADRAO)
+    p_exec.add_argument("--exemplos", nargs="+", help="filtra exemplos por trecho do nome")
+    p_exec.add_argument("--repeticoes", type=int, default=3, help="repetições por caso (vale a menor)")
+    p_exec.add_argument("--sem-memoria", action="store_true", help="não mede o pico de memória")
+    p_exec.add_argument("--n-max-numpy", type=int, default=N_MAX_PADRAO["numpy"])
+    p_exec.add_argument("--n-max-scipy", type=int, default=N_MAX_PADRAO["scipy"])
+    p_exec.add_argument("--n-max-quad", type=int, default=N_MAX_PADRAO["quad"])
+    p_exec.add_argument("--n-max-tolerancia", type=int, default=N_MAX_PADRAO["tolerancia"])
+    p_exec.add_argument("--n-max-analitico", type=int, default=N_MAX_PADRAO["analitico"])
+
+    p_comp = sub.add_parser("comparar", help="compara dois relatórios")
+    p_comp.add_argument("base")
+    p_comp.add_argument("novo")
+    p_comp.add_argument("--limite", type=float, default=1.2,
+                        help="razão de tempo a partir da qual há regressão (padrão 1.2)")
+    p_comp.add_argument("--limite-erro", type=float, default=2.0,
+                        help="razão de erro a partir da qual há regressão (padrão 2.0)")
+
+    p_inicio = sub.add_parser("inicio", help="mede a abertura da interface")
+    p_inicio.add_argument("--repeticoes", type=int, default=5, help="aberturas medidas (vale a menor)")
+    p_inicio.add_argument("--alvo", type=float, default=ALVO_INICIO_S,
+                          help=f"tempo máximo (s) até a janela aparecer (padrão {ALVO_INICIO_S})")
+
+    args = parser.parse_args(argv)
+    if args.comando == "inicio":
+        tempos = medir_inicio(args.repeticoes)
+        for marco in ("importacao", "janela", "graficos"):
+            if marco in tempos:
+                print(f"{marco:12s} {tempos[marco]:7.3f} s")
+        medido = tempos.get("janela", tempos["importacao"])
+        if "janela" not in tempos:
+            print("Sem tela: o alvo é aplicado ao tempo de importação")
+        print(f"{'OK' if medido <= args.alvo else 'ACIMA DO ALVO'}: {medido:.3f} s (alvo {args.alvo} s)")
+        return 0 if medido <= args.alvo else 1
+
+    if args.comando == "executar":
+        relatorio = executar(args.n, args.metodos, args.exemplos, args.repeticoes, not args.sem_memoria,
+                             {"numpy": args.n_max_numpy, "scipy": args.n_max_scipy, "quad": args.n_max_quad,
+                              "tolerancia": args.n_max_tolerancia, "analitico": args.n_max_analitico})
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+        print(f"Relatório gravado em {args.saida}")
+        return 0
+
+    with open(args.base, encoding="utf-8") as arquivo:
+        base = json.load(arquivo)
+    with open(args.novo, encoding="utf-8") as arquivo:
+        novo = json.load(arquivo)
+    regressoes = comparar(base, novo, args.limite, args.limite_erro)
+    for r in regressoes:
+        exemplo, metodo, N = r["caso"]
+        print(f"REGRESSÃO de {r['tipo']}: {exemplo} / {metodo} / N={N}: {r['base']:.3g} -> {r['novo']:.3g}")
+    print(f"{len(regressoes)} regressão(ões) entre {base.get('versao')} e {novo.get('versao')}")
+    return 1 if regressoes else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""Cache de resultados da convolução, endereçado pelo conteúdo dos parâmetros
+
+A chave é um hash dos parâmetros normalizados (expressões reescritas a partir da
+AST, limites convertidos para float, limites irrelevantes ao tipo de intervalo
+descartados), de modo que entradas equivalentes reaproveitam o mesmo resultado.
+Os resultados ficam num LRU em memória limitado por bytes e, opcionalmente, em
+arquivos .npz num diretório, para sobreviver entre sessões. O diretório também tem
+limite de bytes: os arquivos usados há mais tempo (pela data de modificação, renovada
+a cada uso) são apagados.
+
+Expressões que usam np.random não são cacheadas: cada cálculo deve sortear de novo.
+"""
+import ast
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from expressoes import compilar_expressao
+
+# Chaves do dict de resultado guardadas no cache (ver nucleo.calcular_convolucao)
+CAMPOS_RESULTADO = ("t1", "x1", "t2", "x2", "ty", "y", "erro", "forma_fechada", "precisao")
+# Campos que são dicts (o relatório do método "tolerancia"): no .npz, texto JSON
+CAMPOS_JSON = ("precisao",)
+
+# Limite padrão do LRU em memória
+MAX_BYTES_PADRAO = 256 * 1024 ** 2
+# Limite padrão dos arquivos .npz no diretório do cache
+MAX_BYTES_DISCO_PADRAO = 1024 ** 3
+# Sufixo dos .npz em gravação (renomeados para <chave>.npz ao terminar)
+SUFIXO_TEMPORARIO = ".tmp.npz"
+
+def _normalizar_intervalo(tipo, x1_str, x2_str):
+    """Mantém apenas os limites que o tipo de intervalo usa, já convertidos para float"""
+    if tipo == "semi_inf_esq":
+        return [tipo, None, float(x2_str)]
+    if tipo == "semi_inf_dir":
+        return [tipo, float(x1_str), None]
+    if tipo == "finito":
+        return [tipo, float(x1_str), float(x2_str)]
+    return ["infinito", None, None]
+
+def normalizar_funcao(func_str, interval_type, x1_str, x2_str):
+    """Forma canônica (hashable) de uma função com intervalo, ou None se usar np.random"""
+    expressao = compilar_expressao(func_str)
+    if expressao.usa_aleatorio:
+        return None
+    return (ast.unparse(expressao.arvore),) + tuple(_normalizar_intervalo(interval_type, x1_str, x2_str))
+
+def chave_parametros(params):
+    """Hash dos parâmetros de cálculo, ou None se o resultado não puder ser cacheado"""
+    normalizado = {}
+    for prefixo in ("f1", "f2"):
+        funcao = normalizar_funcao(params[prefixo], params[prefixo + "_interval"],
+                                   params[prefixo + "_x1"], params[prefixo + "_x2"])
+        if funcao is None:
+            return None
+        normalizado[prefixo] = funcao[0]
+        normalizado[prefixo + "_intervalo"] = list(funcao[1:])
+    normalizado["xmin"] = float(params["xmin"])
+    normalizado["xmax"] = float(params["xmax"])
+    normalizado["N"] = int(params["N"])
+    normalizado["method"] = params["method"]
+    if params["method"] == "tolerancia":
+        normalizado["tolerancias"] = [float(params["tol_abs"]), float(params["tol_rel"])]
+    else:
+        normalizado["grades"] = params.get("grades", "suporte")
+    if params.get("tipo_numerico", "float64") != "float64":
+        normalizado["tipo_numerico"] = params["tipo_numerico"]
+    texto = json.dumps(normalizado, sort_keys=True)
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+def _tamanho(resultado):
+    return sum(np.asarray(v).nbytes for campo, v in resultado.items() if v is not None and campo not in CAMPOS_JSON)
+
+def _ler_campo(dados, campo):
+    if campo not in dados:
+        return None
+    if campo in CAMPOS_JSON:
+        return json.loads(str(dados[campo]))
+    return dados[campo]
+
+class CacheResultados:
+    """LRU de resultados limitado por bytes, com persistência opcional em .npz (também limitada)"""
+
+    def __init__(self, max_bytes=MAX_BYTES_PADRAO, diretorio=None, max_bytes_disco=MAX_BYTES_DISCO_PADRAO):
+        self.max_bytes = max_bytes
+        self.max_bytes_disco = max_bytes_disco
+        self.diretorio = diretorio
+        self._itens = OrderedDict()
+        self._bytes = 0
+        self._trava = threading.Lock()
+        if diretorio is not None:
+            try:
+                os.makedirs(diretorio, exist_ok=True)
+            except OSError:
+                self.diretorio = None  # sem permissão de escrita: só memória
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, chave + ".npz")
+
+    def obter(self, chave):
+        """Retorna o resultado guardado para a chave, ou None"""
+        if chave is None:
+            return None
+        with self._trava:
+            resultado = self._itens.get(chave)
+            if resultado is not None:
+                self._itens.move_to_end(chave)
+        if resultado is not None:
+            self._marcar_uso(chave)
+            return resultado
+        if self.diretorio is None or not os.path.exists(self._caminho(chave)):
+            return None
+        self._marcar_uso(chave)
+        try:
+            with np.load(self._caminho(chave)) as dados:
+                resultado = {campo: _ler_campo(dados, campo) for campo in CAMPOS_RESULTADO}
+        except (OSError, ValueError):
+            return None  # arquivo corrompido ou incompleto: recalcula
+        self._guardar_memoria(chave, resultado)
+        return resultado
+
+    def guardar(self, chave, resultado):
+        """Guarda o resultado na memória e, se houver diretório, em disco
+
+        A gravação do .npz e a poda do diretório podem demorar com N alto: a interface
+        chama este método na thread de trabalho, não na do Tk.
+        """
+        if chave is None:
+            return
+        resultado = {campo: resultado.get(campo) for campo in CAMPOS_RESULTADO}
+        self._guardar_memoria(chave, resultado)
+        if self.diretorio is not None:
+            arrays = {campo: np.array(json.dumps(v)) if campo in CAMPOS_JSON else v
+                      for campo, v in resultado.items() if v is not None}
+            # Nome único por processo e thread: outra sessão (ou outra thread de trabalho)
+            # pode estar gravando a mesma chave
+            temporario = f"{self._caminho(chave)}.{os.getpid()}.{threading.get_ident()}{SUFIXO_TEMPORARIO}"
+            try:
+                np.savez(temporario, **arrays)
+                os.replace(temporario, self._caminho(chave))
+            except OSError:
+                try:
+                    os.remove(temporario)
+                except OSError:
+                    pass
+                return  # falha de escrita não deve impedir o uso do resultado
+            self._podar_disco()
+
+    def _marcar_uso(self, chave):
+        """Renova a data do arquivo da chave, que decide a ordem de remoção em _podar_disco"""
+        if self.diretorio is None:
+            return
+        try:
+            os.utime(self._caminho(chave))
+        except OSError:
+            pass  # só em memória (ou já removido por outra sessão)
+
+    def _podar_disco(self):
+        """Apaga os .npz usados há mais tempo até o diretório caber em max_bytes_disco"""
+        arquivos = []
+        try:
+            with os.scandir(self.diretorio) as entradas:
+                for entrada in entradas:
+                    # Os temporários são gravações em andamento (desta ou de outra sessão)
+                    if (entrada.name.endswith(".npz") and not entrada.name.endswith(SUFIXO_TEMPORARIO)
+                            and entrada.is_file()):
+                        info = entrada.stat()
+                        arquivos.append((info.st_mtime, info.st_size, entrada.path))
+        except OSError:
+            return
+        total = sum(tamanho for _, tamanho, _ in arquivos)
+        for _, tamanho, caminho in sorted(arquivos):
+            if total <= self.max_bytes_disco:
+                break
+            try:
+                os.remove(caminho)
+                total -= tamanho
+            except OSError:
+                pass
+
+    def _guardar_memoria(self, chave, resultado):
+        tamanho = _tamanho(resultado)
+        if tamanho > self.max_bytes:
+            return
+        with self._trava:
+            if chave in self._itens:
+                self._bytes -= _tamanho(self._itens.pop(chave))
+            self._itens[chave] = resultado
+            self._bytes += tamanho
+            while self._bytes > self.max_bytes:
+                _, antigo = self._itens.popitem(last=False)
+                self._bytes -= _tamanho(antigo)
+
+    def limpar(self):
+        """Esvazia o cache em memória (os arquivos em disco são mantidos)"""
+        with self._trava:
+            self._itens.clear()
+            self._bytes = 0
+
+def diretorio_cache_padrao():
+    """Diretório do cache em disco: $CONVOLUCAO_CACHE_DIR ou ~/.cache/convolucao
+
+    CONVOLUCAO_CACHE_DIR vazio desativa o cache em disco.
+    """
+    diretorio = os.environ.get("CONVOLUCAO_CACHE_DIR")
+    if diretorio is None:
+        return os.path.join(os.path.expanduser("~"), ".cache", "convolucao")
+    return diretorio or None
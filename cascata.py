@@ -0,0 +1,121 @@
+"""Convolução em cascata: f1 * f2 * ... * fK (ex.: fonte → sensor → filtro → conversor)
+
+Todos os estágios são amostrados com o mesmo dt, cada um no próprio suporte (ver
+nucleo.grades_por_suportes), e a cadeia inteira é calculada num único passe
+espectral: uma FFT real por estágio, numa grade comum com comprimento suficiente
+para a saída completa, o produto dos espectros e uma FFT inversa. Os resultados
+intermediários não são reamostrados nem reconvoluídos.
+
+Os resultados intermediários (f1 * f2, f1 * f2 * f3, ...) só são calculados quando
+pedidos (CascataConvolucao.parcial), a partir dos espectros já guardados: um produto
+e uma FFT inversa cada.
+
+Nada aqui importa tkinter ou matplotlib.
+"""
+import time
+
+import numpy as np
+
+from expressoes import criar_funcao_intervalo
+from nucleo import amostrar_grade, aparar_zeros, grades_por_suportes, registrar_arrays
+
+def estagios_dos_parametros(params):
+    """Estágios da cadeia: f1 e f2 de params seguidos dos de params["estagios"]
+
+    Cada estágio extra é um dict {"f": expressão, "interval": tipo, "x1": ..., "x2": ...},
+    como os campos f1, f1_interval, f1_x1 e f1_x2. Retorna uma lista de tuplas
+    (expressão, tipo, x1, x2).
+    """
+    estagios = [(params[f"f{i}"], params[f"f{i}_interval"], params[f"f{i}_x1"], params[f"f{i}_x2"])
+                for i in (1, 2)]
+    for estagio in params.get("estagios", []):
+        estagios.append((estagio["f"], estagio.get("interval", "infinito"), estagio.get("x1", ""),
+                         estagio.get("x2", "")))
+    return estagios
+
+def nome_cadeia(k):
+    """Rótulo da saída dos k + 1 primeiros estágios, ex.: nome_cadeia(2) = "f1 * f2 * f3\""""
+    return " * ".join(f"f{i + 1}" for i in range(k + 1))
+
+class CascataConvolucao:
+    """Cadeia f1 * f2 * ... * fK de params (ver estagios_dos_parametros) num passe espectral
+
+    params usa as chaves "xmin", "xmax", "N" e, opcionalmente, "tipo_numerico", como
+    nucleo.calcular_convolucao. Atributos: amostras (lista de (t, x) de cada estágio),
+    dt, ty e y (a saída da cadeia inteira). parcial(k) dá a saída dos k + 1 primeiros
+    estágios, calculada no primeiro pedido. progresso e medicao como em
+    calcular_convolucao.
+    """
+
+    def __init__(self, params, progresso=None, medicao=None):
+        from scipy import fft as sp_fft
+        self._fft = sp_fft
+        xmin, xmax, N = params["xmin"], params["xmax"], params["N"]
+        self.tipo = np.dtype(params.get("tipo_numerico", "float64"))
+        self.dominio = (xmin, xmax)
+        estagios = estagios_dos_parametros(params)
+        marco = time.perf_counter()
+
+        def fim_etapa(nome):
+            nonlocal marco
+            agora = time.perf_counter()
+            if medicao is not None:
+                medicao.registrar_etapa(nome, marco, agora - marco)
+            marco = agora
+
+        funcoes, suportes = zip(*[criar_funcao_intervalo(*estagio) for estagio in estagios])
+        fim_etapa("compilacao")
+
+        grades, self.dt = grades_por_suportes(suportes, xmin, xmax, N)
+        self.amostras = []
+        for i, (func, (t0, n)) in enumerate(zip(funcoes, grades)):
+            self.amostras.append(amostrar_grade(func, t0, n, self.dt, self.tipo))
+            if progresso is not None:
+                progresso(0.5 * (i + 1) / len(estagios))
+        fim_etapa("amostragem")
+
+        # Só o trecho não nulo de cada estágio entra na FFT (como em nucleo.conv_discreta)
+        self._trechos = [aparar_zeros(x) for _, x in self.amostras]
+        n_saida = sum(trecho.size for _, trecho in self._trechos) - (len(estagios) - 1)
+        self.nfft = sp_fft.next_fast_len(max(n_saida, 1), real=True)
+        self._espectros = [sp_fft.rfft(trecho, self.nfft) if trecho.size else None for _, trecho in self._trechos]
+        self._parciais = {}
+        self.ty, self.y = self.parcial(len(estagios) - 1)
+        fim_etapa("convolucao")
+        if progresso is not None:
+            progresso(1.0)
+        if medicao is not None:
+            medicao.contar("estagios_cascata", len(estagios))
+            registrar_arrays(medicao, {"ty": self.ty, "y": self.y})
+
+    def __len__(self):
+        return len(self.amostras)
+
+    def parcial(self, k):
+        """(t, y) da saída dos estágios 0 a k (k = len(self) - 1 é a cadeia inteira)"""
+        if not 0 <= k < len(self):
+            raise IndexError(f"A cadeia tem {len(self)} estágios")
+        if k == 0:
+            return self.amostras[0]
+        if k not in self._parciais:
+            self._parciais[k] = self._saida(k)
+        return self._parciais[k]
+
+    def _saida(self, k):
+        estagios = range(k + 1)
+        tamanhos = [self.amostras[j][1].size for j in estagios]
+        if min(tamanhos) == 0:
+            # Um estágio é nulo no domínio (como em nucleo.calcular_convolucao)
+            xmin, xmax = self.dominio
+            return np.array([(k + 1) * xmin, (k + 1) * xmax]), np.zeros(2, dtype=self.tipo)
+        n = sum(tamanhos) - k
+        t = sum(self.amostras[j][0][0] for j in estagios) + self.dt * np.arange(n)
+        y = np.zeros(n, dtype=self.tipo)
+        if all(self._espectros[j] is not None for j in estagios):
+            produto = self._espectros[0]
+            for j in range(1, k + 1):
+                produto = produto * self._espectros[j]
+            deslocamento = sum(self._trechos[j][0] for j in estagios)
+            m = sum(self._trechos[j][1].size for j in estagios) - k
+            y[deslocamento:deslocamento + m] = self._fft.irfft(produto, self.nfft)[:m] * self.dt ** k
+        return t, y
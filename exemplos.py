@@ -0,0 +1,249 @@
+"""Biblioteca de exemplos de convolução exibida na janela "📚 Exemplos"
+
+Cada exemplo usa as chaves name, description, f1, f1_interval, f1_x1, f1_x2, f2,
+f2_interval, f2_x1 e f2_x2 (o mesmo formato aceito por api.calcular_job).
+"""
+
+# Exemplos criativos
+EXEMPLOS = [
+    {
+        "name": "🔔 Sino e Pulso - Reverberação",
+        "description": "Simula o eco de um sino tocando em um ambiente fechado",
+        "f1": "np.exp(-t**2) * np.cos(5*t)",
+        "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
+        "f2": "1",
+        "f2_interval": "finito", "f2_x1": "-0.5", "f2_x2": "0.5"
+    },
+    {
+        "name": "📡 Radar - Pulso e Eco",
+        "description": "Sistema de radar detectando um objeto distante",
+        "f1": "1",
+        "f1_interval": "finito", "f1_x1": "-1", "f1_x2": "1",
+        "f2": "np.exp(-2*t**2)",
+        "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
+    },
+    {
+        "name": "🎵 Nota Musical - Harmônicos",
+        "description": "Convolução de duas ondas senoidais com frequências diferentes",
+        "f1": "np.cos(2*np.pi*t)",
+        "f1_interval": "finito", "f1_x1": "-2", "f1_x2": "2",
+        "f2": "np.cos(4*np.pi*t)",
+        "f2_interval": "finito", "f2_x1": "-1", "f2_x2": "1"
+    },
+    {
+        "name": "⚡ Circuito RC - Resposta ao Impulso",
+        "description": "Resposta de um circuito RC a um pulso de entrada",
+        "f1": "1",
+        "f1_interval": "finito", "f1_x1": "0", "f1_x2": "1",
+        "f2": "np.exp(-t)",
+        "f2_interval": "semi_inf_dir", "f2_x1": "0", "f2_x2": ""
+    },
+    {
+        "name": "🌊 Onda Modulada - AM",
+        "description": "Modulação em amplitude de uma portadora senoidal",
+        "f1": "np.cos(10*np.pi*t)",
+        "f1_interval": "finito", "f1_x1": "-1", "f1_x2": "1",
+        "f2": "np.exp(-t**2/2)",
+        "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
+    },
+    {
+        "name": "🔊 Alto-falante - Resposta de Frequência",
+        "description": "Resposta de um alto-falante a diferentes frequências",
+        "f1": "np.sin(3*np.pi*t) * np.exp(-0.5*t**2)",
+        "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
+        "f2": "np.cos(np.pi*t)",
+        "f2_interval": "finito", "f2_x1": "-2", "f2_x2": "2"
+    },
+    {
+        "name": "📶 Filtro Passa-Baixa",
+        "description": "Filtragem de um sinal ruidoso com filtro gaussiano",
+        "f1": "np.cos(8*np.pi*t) + 0.5*np.cos(20*np.pi*t)",
+        "f1_interval": "finito", "f1_x1": "-2", "f1_x2": "2",
+        "f2": "np.exp(-4*t**2)",
+        "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
+    },
+    {
+        "name": "🎯 Detecção de Borda",
+        "description": "Operação de detecção de bordas em processamento de sinais",
+        "f1": "np.where((t>-1)&(t<0), 1, np.where((t>=0)&(t<1), -1, 0))",
+        "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
+        "f2": "np.where((t>-2)&(t<2), 1, 0)",
+        "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
+    },
+    {
+        "name": "🌡️ Sensor de Temperatura",
+        "description": "Resposta de um sensor térmico a mudanças de temperatura",
+        "f1": "np.where(t>=0, t*np.exp(-t), 0)",
+        "f1_interval": "semi_inf_dir", "f1_x1": "0", "f1_x2": "",
+        "f2": "np.exp(-2*t**2)",
+        "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
+    },
+    {
+        "name": "🎸 Corda de Violão",
+        "description": "Vibração de uma corda com amortecimento",
+        "f1": "np.cos(6*np.pi*t) * np.exp(-0.2*np.abs(t))",
+        "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
+        "f2": "np.exp(-t**2)",
+        "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
+    },
+    {
+        "name": "📸 Flash Fotográfico",
+        "description": "Resposta de um sensor de imagem a um flash de luz",
+        "f1": "np.exp(-5*t**2)",
+        "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
+        "f2": "np.where((t>=0)&(t<0.1), 10, 0)",
+        "f2_interval": "semi_inf_dir", "f2_x1": "0", "f2_x2": ""
+    },
+    {
+        "name": "🚗 Suspensão Automotiva",
+        "description": "Resposta de um amortecedor a um impacto na estrada",
+        "f1": "np.where(t>=0, np.exp(-3*t) * np.cos(8*t), 0)",
+        "f1_interval": "semi_inf_dir", "f1_x1": "0", "f1_x2": "",
+        "f2": "np.where((t>-0.2)&(t<0.2), 1, 0)",
+        "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
+    },
+    {
+        "name": "🌐 Antena de Rádio",
+        "description": "Transmissão de sinal através de uma antena dipolo",
+        "f1": "np.cos(20*np.pi*t)",
+        "f1_interval": "finito", "f1_x1": "-0.5", "f1_x2": "0.5",
+        "f2": "np.sinc(5*t)",
+        "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
+    },
+    {
+        "name": "🏥 Eletrocardiograma",
+        "description": "Processamento de sinal cardíaco através de filtro",
+        "f1": "np.exp(-t**2) * (1 + 0.5*np.cos(4*np.pi*t))",
+        "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
+        "f2": "np.where((t>-0.1)&(t<0.1), 1, 0)",
+        "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
+    },
+    {
+        "name": "🌊 Tsunami - Propagação",
+        "description": "Propagação de ondas sísmicas no oceano",
+        "f1": "np.exp(-0.1*t**2) * np.cos(np.pi*t)",
+        "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
+        "f2": "np.where(t>=0, t**2 * np.exp(-t), 0)",
+        "f2_interval": "semi_inf_dir", "f2_x1": "0", "f2_x2": ""
+    },
+    {
+        "name": "🎤 Microfone Direcional",
+        "description": "Captação de som com padrão direcional",
+        "f1": "np.cos(15*np.pi*t) * np.exp(-2*np.abs(t))",
+        "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
+        "f2": "np.exp(-t**2/4)",
+        "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
+    },
+    {
+        "name": "🛰️ Comunicação Satelital",
+        "description": "Modulação de sinal para transmissão espacial",
+        "f1": "np.cos(50*np.pi*t)",
+        "f1_interval": "finito", "f1_x1": "-1", "f1_x2": "1",
+        "f2": "np.where((t>-0.05)&(t<0.05), np.cos(100*np.pi*t), 0)",
+        "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
+    },
+    {
+        "name": "⚙️ Engrenagem Mecânica",
+        "description": "Vibração de engrenagens em transmissão",
+        "f1": "np.where(t>=0, np.exp(-0.5*t) * np.sin(12*np.pi*t), 0)",
+        "f1_interval": "semi_inf_dir", "f1_x1": "0", "f1_x2": "",
+        "f2": "np.sum([np.where((t>k*0.1)&(t<k*0.1+0.05), 1, 0) for k in range(20)], axis=0)",
+        "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
+    },
+    {
+        "name": "🔬 Microscópio Óptico",
+        "description": "Função de espalhamento pontual de lente",
+        "f1": "np.exp(-25*t**2)",
+        "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
+        "f2": "np.where((t>-0.1)&(t<0.1), np.sinc(20*t), 0)",
+        "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
+    },
+    {
+        "name": "🌡️ Termopar Industrial",
+        "description": "Resposta térmica com constante de tempo",
+        "f1": "np.where(t>=0, 1 - np.exp(-2*t), 0)",
+        "f1_interval": "semi_inf_dir", "f1_x1": "0", "f1_x2": "",
+        "f2": "np.where((t>0)&(t<5), 1, 0)",
+        "f2_interval": "semi_inf_dir", "f2_x1": "0", "f2_x2": ""
+    },
+    {
+        "name": "🎺 Instrumento de Sopro",
+        "description": "Resposta acústica de tubo ressonante",
+        "f1": "np.cos(8*np.pi*t) * np.exp(-np.abs(t)/2)",
+        "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
+        "f2": "np.where((t>-1)&(t<1), np.cos(np.pi*t/2), 0)",
+        "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
+    },
+    {
+        "name": "🌪️ Detector de Turbulência",
+        "description": "Análise de fluxo de ar turbulento",
+        "f1": "np.random.normal(0, 0.1, len(t)) + np.cos(3*np.pi*t)",
+        "f1_interval": "finito", "f1_x1": "-3", "f1_x2": "3",
+        "f2": "np.exp(-t**2/0.5)",
+        "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
+    },
+    {
+        "name": "🔋 Carregador de Bateria",
+        "description": "Curva de carga com controle de corrente",
+        "f1": "np.where(t>=0, np.exp(-0.3*t), 0)",
+        "f1_interval": "semi_inf_dir", "f1_x1": "0", "f1_x2": "",
+        "f2": "np.where((t>0)&(t<2), t/2, np.where((t>=2)&(t<4), 1, 0))",
+        "f2_interval": "semi_inf_dir", "f2_x1": "0", "f2_x2": ""
+    },
+    {
+        "name": "🎨 Scanner de Imagem",
+        "description": "Varredura óptica com função de linha",
+        "f1": "np.where((t>-0.5)&(t<0.5), 1, 0)",
+        "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
+        "f2": "np.exp(-10*t**2) * np.cos(30*np.pi*t)",
+        "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
+    },
+    {
+        "name": "🌈 Prisma Óptico",
+        "description": "Dispersão cromática da luz branca",
+        "f1": "np.sum([np.cos(2*np.pi*f*t) for f in [1,2,3,4,5]], axis=0)",
+        "f1_interval": "finito", "f1_x1": "-2", "f1_x2": "2",
+        "f2": "np.exp(-t**2) * np.cos(np.pi*t)",
+        "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
+    },
+    {
+        "name": "🚀 Propulsão de Foguete",
+        "description": "Impulso específico com queima de combustível",
+        "f1": "np.where((t>=0)&(t<10), np.exp(-t/5), 0)",
+        "f1_interval": "semi_inf_dir", "f1_x1": "0", "f1_x2": "",
+        "f2": "np.where((t>-1)&(t<1), 1-np.abs(t), 0)",
+        "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
+    },
+    {
+        "name": "🧲 Campo Magnético",
+        "description": "Resposta de bobina a campo magnético variável",
+        "f1": "np.cos(2*np.pi*t) * np.exp(-0.1*t**2)",
+        "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
+        "f2": "np.where(t>=0, t * np.exp(-4*t), 0)",
+        "f2_interval": "semi_inf_dir", "f2_x1": "0", "f2_x2": ""
+    },
+    {
+        "name": "🌊 Sonar Submarino",
+        "description": "Ecolocalização em ambiente aquático",
+        "f1": "np.cos(40*np.pi*t) * np.exp(-t**2/0.1)",
+        "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
+        "f2": "np.where((t>2)&(t<2.1), 0.5, 0)",
+        "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
+    },
+    {
+        "name": "🎯 Laser Pulsado",
+        "description": "Pulso de laser com dispersão temporal",
+        "f1": "np.exp(-50*t**2)",
+        "f1_interval": "infinito", "f1_x1": "", "f1_x2": "",
+        "f2": "np.where(t>=0, np.exp(-10*t) * np.cos(100*np.pi*t), 0)",
+        "f2_interval": "semi_inf_dir", "f2_x1": "0", "f2_x2": ""
+    },
+    {
+        "name": "🔊 Cancelamento de Ruído",
+        "description": "Filtro adaptativo para cancelar ruído ambiente",
+        "f1": "np.cos(6*np.pi*t) + 0.3*np.cos(18*np.pi*t)",
+        "f1_interval": "finito", "f1_x1": "-1", "f1_x2": "1",
+        "f2": "np.exp(-2*t**2) * np.cos(6*np.pi*t)",
+        "f2_interval": "infinito", "f2_x1": "", "f2_x2": ""
+    }
+]
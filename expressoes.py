@@ -0,0 +1,369 @@
+"""Compilação das expressões digitadas pelo usuário para f(t) e g(t)
+
+Cada expressão é analisada uma única vez: a árvore sintática (AST) é validada
+contra uma lista de nomes permitidos, compilada para uma função Python gerada e
+guardada em cache. A partir dela são geradas três formas de avaliação:
+
+- avaliar(t): caminho vetorizado com NumPy (ou numexpr, se instalado, para vetores grandes)
+- escalar(t): caminho rápido para t escalar, usado pelo integrando do quad
+- quebras: constantes comparadas com t (bordas de np.where), úteis na integração
+
+Uma expressão pode declarar parâmetros além de t (ex.: "a" em "np.exp(-a*t)", usado
+pela varredura de parâmetro); os valores são passados depois de t nas avaliações.
+"""
+import ast
+import math
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    import numexpr
+except ImportError:  # numexpr é opcional
+    numexpr = None
+
+# Funções e constantes do NumPy que podem aparecer nas expressões
+NOMES_NUMPY_PERMITIDOS = {
+    "np.sin", "np.cos", "np.tan", "np.arcsin", "np.arccos", "np.arctan", "np.arctan2",
+    "np.sinh", "np.cosh", "np.tanh", "np.exp", "np.log", "np.log10", "np.log2",
+    "np.sqrt", "np.abs", "np.sign", "np.heaviside", "np.where", "np.sinc",
+    "np.sum", "np.maximum", "np.minimum", "np.clip", "np.floor", "np.ceil",
+    "np.mod", "np.pi", "np.e", "np.ones_like", "np.zeros_like",
+    "np.random.normal", "np.random.uniform", "np.random.rand", "np.random.randn",
+}
+
+# Funções embutidas do Python disponíveis nas expressões
+BUILTINS_PERMITIDOS = {
+    "range": range, "len": len, "abs": abs, "min": min, "max": max,
+    "sum": sum, "float": float, "int": int, "round": round,
+}
+
+_NOS_PERMITIDOS = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.Call,
+    ast.Name, ast.Attribute, ast.Constant, ast.List, ast.Tuple, ast.ListComp,
+    ast.GeneratorExp, ast.comprehension, ast.IfExp, ast.Subscript, ast.Slice,
+    ast.keyword, ast.Load, ast.Store, ast.operator, ast.unaryop, ast.boolop, ast.cmpop,
+)
+
+# Vetores com pelo menos este número de pontos são avaliados pelo numexpr (multithread)
+LIMIAR_NUMEXPR = 100_000
+
+def _nome_pontuado(no):
+    """Converte np.random.normal (Attribute/Name) em 'np.random.normal'; None se não for nome"""
+    partes = []
+    while isinstance(no, ast.Attribute):
+        partes.append(no.attr)
+        no = no.value
+    if isinstance(no, ast.Name):
+        partes.append(no.id)
+        return ".".join(reversed(partes))
+    return None
+
+def validar_arvore(arvore, parametros=()):
+    """Verifica se a expressão usa apenas nós e nomes permitidos; levanta ValueError caso contrário"""
+    # Variáveis criadas por compreensões (ex.: "for k in range(20)") também são válidas
+    locais = {"t", *parametros}
+    for no in ast.walk(arvore):
+        if isinstance(no, ast.comprehension):
+            for alvo in ast.walk(no.target):
+                if isinstance(alvo, ast.Name):
+                    locais.add(alvo.id)
+
+    for no in ast.walk(arvore):
+        if not isinstance(no, _NOS_PERMITIDOS):
+            raise ValueError(f"Construção não permitida na expressão: {type(no).__name__}")
+        if isinstance(no, ast.Attribute):
+            if no.attr.startswith("_"):
+                raise ValueError(f"Atributo não permitido na expressão: {no.attr}")
+            nome = _nome_pontuado(no)
+            # Atributos de resultados (np.abs(t).tofile, (t)[0].real, ...) nunca são permitidos
+            if nome is None:
+                raise ValueError(f"Atributo não permitido na expressão: {no.attr}")
+            # Atributos intermediários (np.random) são validados pelo nome completo
+            if nome not in NOMES_NUMPY_PERMITIDOS and \
+                    not any(p.startswith(nome + ".") for p in NOMES_NUMPY_PERMITIDOS):
+                raise ValueError(f"Nome não permitido na expressão: {nome}")
+        elif isinstance(no, ast.Name):
+            if no.id not in locais and no.id not in BUILTINS_PERMITIDOS and no.id != "np":
+                raise ValueError(f"Nome não permitido na expressão: {no.id}")
+
+def _extrair_quebras(arvore):
+    """Extrai os valores constantes comparados com t (ex.: t>-1 -> -1)
+
+    Esses valores são candidatos a descontinuidades (bordas de np.where) e servem de
+    pontos de quebra para a integração numérica.
+    """
+    pontos = set()
+    for no in ast.walk(arvore):
+        if not isinstance(no, ast.Compare):
+            continue
+        operandos = [no.left] + no.comparators
+        for esq, dir_ in zip(operandos, operandos[1:]):
+            for var, const in ((esq, dir_), (dir_, esq)):
+                if isinstance(var, ast.Name) and var.id == 't':
+                    try:
+                        valor = ast.literal_eval(const)
+                    except (ValueError, TypeError, SyntaxError):
+                        continue
+                    if isinstance(valor, (int, float)) and np.isfinite(valor):
+                        pontos.add(float(valor))
+    return sorted(pontos)
+
+def _sinc(x):
+    if x == 0:
+        return 1.0
+    return math.sin(math.pi * x) / (math.pi * x)
+
+# Tradução das funções NumPy para equivalentes escalares (módulo math)
+_EQUIVALENTES_ESCALARES = {
+    "np.sin": "math.sin", "np.cos": "math.cos", "np.tan": "math.tan",
+    "np.arcsin": "math.asin", "np.arccos": "math.acos", "np.arctan": "math.atan",
+    "np.arctan2": "math.atan2", "np.sinh": "math.sinh", "np.cosh": "math.cosh",
+    "np.tanh": "math.tanh", "np.exp": "math.exp", "np.log": "math.log",
+    "np.log10": "math.log10", "np.log2": "math.log2", "np.sqrt": "math.sqrt",
+    "np.abs": "abs", "np.floor": "math.floor", "np.ceil": "math.ceil",
+    "np.maximum": "max", "np.minimum": "min", "np.sinc": "_sinc",
+    "np.pi": "math.pi", "np.e": "math.e",
+}
+
+class _TradutorEscalar(ast.NodeTransformer):
+    """Reescreve a AST para t escalar: np.exp -> math.exp, np.where(c, a, b) -> (a if c else b)"""
+
+    def visit_Call(self, no):
+        if _nome_pontuado(no.func) == "np.where" and len(no.args) == 3 and not no.keywords:
+            teste, corpo, senao = (self.visit(arg) for arg in no.args)
+            return ast.IfExp(test=teste, body=corpo, orelse=senao)
+        # np.sum([...], axis=0) soma termos escalares quando t é escalar
+        if _nome_pontuado(no.func) == "np.sum" and len(no.args) == 1 and \
+                all(k.arg == "axis" and isinstance(k.value, ast.Constant) and k.value.value == 0
+                    for k in no.keywords):
+            return ast.Call(func=ast.Name(id="sum", ctx=ast.Load()), args=[self.visit(no.args[0])],
+                            keywords=[])
+        return self.generic_visit(no)
+
+    def visit_Attribute(self, no):
+        nome = _nome_pontuado(no)
+        if nome in _EQUIVALENTES_ESCALARES:
+            return ast.parse(_EQUIVALENTES_ESCALARES[nome], mode='eval').body
+        if nome is not None and nome.startswith("np."):
+            raise ValueError(f"Sem equivalente escalar para {nome}")
+        return self.generic_visit(no)
+
+# Tradução para a sintaxe do numexpr (funções sem o prefixo np.)
+_EQUIVALENTES_NUMEXPR = {
+    "np.sin": "sin", "np.cos": "cos", "np.tan": "tan", "np.arcsin": "arcsin",
+    "np.arccos": "arccos", "np.arctan": "arctan", "np.arctan2": "arctan2",
+    "np.sinh": "sinh", "np.cosh": "cosh", "np.tanh": "tanh", "np.exp": "exp",
+    "np.log": "log", "np.log10": "log10", "np.sqrt": "sqrt", "np.abs": "abs",
+    "np.where": "where",
+}
+
+class _TradutorNumexpr(ast.NodeTransformer):
+    """Reescreve a AST na sintaxe do numexpr; levanta ValueError para construções sem suporte"""
+
+    def visit_Attribute(self, no):
+        nome = _nome_pontuado(no)
+        if nome in _EQUIVALENTES_NUMEXPR:
+            return ast.Name(id=_EQUIVALENTES_NUMEXPR[nome], ctx=ast.Load())
+        if nome == "np.pi":
+            return ast.Constant(value=math.pi)
+        if nome == "np.e":
+            return ast.Constant(value=math.e)
+        raise ValueError(f"numexpr não suporta {nome}")
+
+    def __init__(self, variaveis=("t",)):
+        self.variaveis = variaveis
+
+    def visit_Name(self, no):
+        if no.id not in self.variaveis:
+            raise ValueError(f"numexpr não suporta {no.id}")
+        return no
+
+    def generic_visit(self, no):
+        if isinstance(no, (ast.ListComp, ast.GeneratorExp, ast.List, ast.Tuple,
+                           ast.Subscript, ast.IfExp, ast.BoolOp)):
+            raise ValueError(f"numexpr não suporta {type(no).__name__}")
+        return super().generic_visit(no)
+
+def _gerar_funcao(corpo, globais, nome, variaveis=("t",)):
+    """Compila o corpo de uma expressão como 'lambda t, ...: <corpo>' e retorna a função gerada"""
+    argumentos = ast.arguments(posonlyargs=[], args=[ast.arg(arg=v) for v in variaveis], kwonlyargs=[],
+                               kw_defaults=[], defaults=[])
+    arvore = ast.Expression(body=ast.Lambda(args=argumentos, body=corpo))
+    return eval(compile(ast.fix_missing_locations(arvore), nome, 'eval'), globais)
+
+class Expressao:
+    """Expressão do usuário já analisada, validada e compilada"""
+
+    def __init__(self, texto, parametros=()):
+        self.texto = texto
+        self.parametros = tuple(parametros)
+        self._variaveis = ("t",) + self.parametros
+        try:
+            self.arvore = ast.parse(texto.strip(), mode='eval')
+        except SyntaxError as e:
+            raise ValueError(f"Erro de sintaxe na expressão '{texto}': {e.msg}") from e
+        validar_arvore(self.arvore, self.parametros)
+        self.quebras = _extrair_quebras(self.arvore)
+        self.usa_aleatorio = any(
+            (_nome_pontuado(no) or "").startswith("np.random")
+            for no in ast.walk(self.arvore) if isinstance(no, ast.Attribute)
+        )
+        self._vetorial = _gerar_funcao(self.arvore.body, {'np': np, '__builtins__': BUILTINS_PERMITIDOS},
+                                       '<expressao>', self._variaveis)
+        # AST da forma escalar (só math e Python puro), também usada por nativo.py
+        self.arvore_escalar = None
+        self._escalar = self._compilar_escalar()
+        self._numexpr = self._traduzir_numexpr()
+
+    def _compilar_escalar(self):
+        """Gera uma função Python pura para t escalar, ou None se a expressão não permitir"""
+        if self.usa_aleatorio:
+            return None
+        try:
+            arvore = _TradutorEscalar().visit(ast.parse(self.texto.strip(), mode='eval'))
+        except ValueError:
+            return None
+        self.arvore_escalar = ast.fix_missing_locations(arvore)
+        globais = {'math': math, '_sinc': _sinc, '__builtins__': BUILTINS_PERMITIDOS}
+        return _gerar_funcao(arvore.body, globais, '<expressao-escalar>', self._variaveis)
+
+    def _traduzir_numexpr(self):
+        """Texto equivalente na sintaxe do numexpr, ou None se não houver tradução"""
+        if numexpr is None:
+            return None
+        try:
+            arvore = _TradutorNumexpr(self._variaveis).visit(ast.parse(self.texto.strip(), mode='eval'))
+        except ValueError:
+            return None
+        return ast.unparse(ast.fix_missing_locations(arvore))
+
+    def avaliar(self, t, *valores):
+        """Avalia a expressão para t (escalar ou vetor) e os valores dos parâmetros, se houver"""
+        if self._numexpr is not None and np.ndim(t) > 0 and np.size(t) >= LIMIAR_NUMEXPR:
+            variaveis = dict(zip(self.parametros, valores), t=np.asarray(t, dtype=float))
+            return numexpr.evaluate(self._numexpr, local_dict=variaveis)
+        return self._vetorial(t, *valores)
+
+    __call__ = avaliar
+
+    def escalar(self, t, *valores):
+        """Caminho rápido para t escalar (integrando do quad), com retorno ao caminho NumPy"""
+        if self._escalar is not None:
+            try:
+                valor = self._escalar(t, *valores)
+                if not isinstance(valor, complex):
+                    return valor
+            except (OverflowError, ValueError, ZeroDivisionError, TypeError):
+                pass
+        return self.avaliar(t, *valores)
+
+@lru_cache(maxsize=256)
+def compilar_expressao(texto, parametros=()):
+    """Retorna a Expressao compilada para o texto, reaproveitando compilações anteriores
+
+    parametros é uma tupla de nomes aceitos na expressão além de t.
+    """
+    return Expressao(texto, parametros)
+
+class FuncaoComIntervalo:
+    """Função do usuário restrita a um intervalo [inicio, fim] (limites podem ser infinitos)
+
+    Chamada com um vetor, zera os valores fora do intervalo via np.where; o método
+    escalar() faz o mesmo com comparações Python, sem criar arrays.
+    """
+
+    def __init__(self, expressao, inicio=-np.inf, fim=np.inf):
+        self.expressao = expressao
+        self.inicio = inicio
+        self.fim = fim
+
+    def __call__(self, t):
+        valor = self.expressao.avaliar(t)
+        if np.isinf(self.inicio) and np.isinf(self.fim):
+            return valor
+        return np.where((t >= self.inicio) & (t <= self.fim), valor, 0)
+
+    def escalar(self, t):
+        if t < self.inicio or t > self.fim:
+            return 0.0
+        return self.expressao.escalar(t)
+
+def limites_intervalo(interval_type, x1_str, x2_str):
+    """(inicio, fim) do intervalo, com limites infinitos onde o tipo não os usa"""
+    if interval_type == "semi_inf_esq":
+        return -np.inf, float(x2_str)
+    if interval_type == "semi_inf_dir":
+        return float(x1_str), np.inf
+    if interval_type == "finito":
+        return float(x1_str), float(x2_str)
+    # "infinito" ou tipo desconhecido: função base sem restrição de suporte
+    return -np.inf, np.inf
+
+def criar_funcao_intervalo(func_str, interval_type, x1_str, x2_str):
+    """Cria uma função que considera o intervalo especificado
+
+    Retorna (função, suporte), onde suporte é um dict com as chaves "inicio" e "fim"
+    (limites do intervalo, podendo ser infinitos) e "quebras" (descontinuidades
+    detectadas na expressão).
+    """
+    expressao = compilar_expressao(func_str)
+    inicio, fim = limites_intervalo(interval_type, x1_str, x2_str)
+    func = FuncaoComIntervalo(expressao, inicio, fim)
+    return func, {"inicio": inicio, "fim": fim, "quebras": list(expressao.quebras)}
+
+# Funções cujos argumentos precisam ser inteiros (não são oferecidos para variação)
+_CHAMADAS_INTEIRAS = {"range", "len", "int", "round"}
+
+def _constantes(texto):
+    """(inicio, fim, valor, base_de_potencia) de cada constante variável da expressão"""
+    arvore = ast.parse(texto, mode='eval')
+    ignorados = set()
+    bases = set()
+    for no in ast.walk(arvore):
+        if isinstance(no, ast.keyword):
+            ignorados.update(id(n) for n in ast.walk(no.value))
+        elif isinstance(no, ast.Call) and _nome_pontuado(no.func) in _CHAMADAS_INTEIRAS:
+            for arg in no.args:
+                ignorados.update(id(n) for n in ast.walk(arg))
+        elif isinstance(no, ast.BinOp) and isinstance(no.op, ast.Pow):
+            bases.add(id(no.left))
+
+    # Posições do AST são em bytes UTF-8; converte para índices de caracteres
+    bruto = texto.encode("utf-8")
+    def caractere(offset):
+        return len(bruto[:offset].decode("utf-8"))
+
+    constantes = []
+    for no in ast.walk(arvore):
+        # "-0.1" é uma constante com sinal: o slider varia o valor inteiro, sinal incluído
+        if isinstance(no, ast.UnaryOp) and isinstance(no.op, ast.USub) and isinstance(no.operand, ast.Constant):
+            numero, sinal = no.operand, -1
+        elif isinstance(no, ast.Constant):
+            numero, sinal = no, 1
+        else:
+            continue
+        if type(numero.value) not in (int, float) or id(no) in ignorados:
+            continue
+        ignorados.add(id(numero))
+        constantes.append((caractere(no.col_offset), caractere(no.end_col_offset),
+                           sinal * float(numero.value), id(no) in bases))
+    return sorted(constantes)
+
+def constantes_numericas(texto):
+    """Constantes numéricas de uma expressão que podem ser variadas (ex.: por sliders)
+
+    Retorna [(inicio, fim, valor)], com a posição de cada número no texto (em
+    caracteres), na ordem em que aparecem; "-0.1" conta como uma constante negativa.
+    Ficam de fora argumentos nomeados (axis=0) e argumentos de range()/len()/int()/round().
+    """
+    return [c[:3] for c in _constantes(texto)]
+
+def substituir_constante(texto, indice, valor):
+    """Troca a indice-ésima constante de constantes_numericas(texto) por valor"""
+    inicio, fim, _, base_de_potencia = _constantes(texto)[indice]
+    novo = f"{valor:.6g}"
+    ja_entre_parenteses = texto[inicio - 1:inicio] == "(" and texto[fim:fim + 1] == ")"
+    if valor < 0 and base_de_potencia and not ja_entre_parenteses:
+        novo = f"({novo})"  # -2**t seria -(2**t)
+    return texto[:inicio] + novo + texto[fim:]
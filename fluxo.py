@@ -0,0 +1,184 @@
+"""Convolução em fluxo: f chega em blocos (gerador ou arquivo), g é um núcleo finito
+
+Para sinais longos (horas de um sensor) ou sem fim, f não cabe num array. Aqui g é
+amostrada uma única vez como núcleo h de M amostras e a saída é produzida bloco a
+bloco por overlap-save: cada quadro de nfft amostras junta as M-1 últimas amostras
+de entrada com L novas e, com a FFT do núcleo calculada uma só vez, gera L amostras
+de saída. A memória usada não depende do comprimento de f.
+
+Nada aqui importa tkinter ou matplotlib.
+"""
+import itertools
+import os
+
+import numpy as np
+from scipy import fft as sp_fft
+
+from expressoes import criar_funcao_intervalo
+from nucleo import amostrar_grade, aparar_zeros
+
+# Tamanho do quadro da FFT em relação ao núcleo (como em nucleo._custo_overlap_add)
+FATOR_QUADRO = 8
+# Amostras por bloco lidas de arquivos e geradas a partir de expressões
+TAMANHO_BLOCO_PADRAO = 65536
+
+class ConvolucaoEmFluxo:
+    """Overlap-save de uma entrada em blocos com um núcleo fixo h (saída escalada por dt)
+
+    processar(bloco) recebe qualquer número de amostras e retorna as amostras de saída
+    já completas (possivelmente nenhuma); finalizar() retorna o restante, incluindo a
+    cauda de M-1 amostras. A saída concatenada é igual a np.convolve(f, h) * dt.
+
+    Normalmente a saída só sai a cada L amostras de entrada (um quadro cheio). Com
+    processar(bloco, imediato=True), o quadro incompleto é processado na hora: a
+    saída acompanha a entrada, ao custo de uma FFT por bloco.
+    """
+
+    def __init__(self, h, dt):
+        self.h = np.asarray(h, dtype=float)
+        self.dt = dt
+        self.M = max(self.h.size, 1)
+        self.nfft = sp_fft.next_fast_len(max(FATOR_QUADRO * self.M, 2 * self.M - 1), real=True)
+        self.L = self.nfft - self.M + 1           # amostras novas por quadro
+        self._H = sp_fft.rfft(self.h, self.nfft)  # FFT do núcleo, reaproveitada em todos os quadros
+        self._quadro = np.zeros(self.nfft)        # M-1 amostras anteriores + L novas
+        self._preenchido = 0                      # amostras novas já no quadro
+        self.n_entrada = 0
+        self.n_saida = 0
+
+    def _processar_quadro(self):
+        y = sp_fft.irfft(sp_fft.rfft(self._quadro, self.nfft) * self._H, self.nfft)
+        saida = y[self.M - 1:self.M - 1 + self._preenchido] * self.dt
+        # As últimas M-1 amostras de entrada viram o começo do próximo quadro
+        inicio = self._preenchido
+        self._quadro[:self.M - 1] = self._quadro[inicio:inicio + self.M - 1]
+        self._quadro[self.M - 1:] = 0.0
+        self._preenchido = 0
+        self.n_saida += saida.size
+        return saida
+
+    def processar(self, bloco, imediato=False):
+        bloco = np.asarray(bloco, dtype=float).ravel()
+        self.n_entrada += bloco.size
+        saidas = []
+        while bloco.size:
+            n = min(self.L - self._preenchido, bloco.size)
+            inicio = self.M - 1 + self._preenchido
+            self._quadro[inicio:inicio + n] = bloco[:n]
+            self._preenchido += n
+            bloco = bloco[n:]
+            if self._preenchido == self.L:
+                saidas.append(self._processar_quadro())
+        if imediato and self._preenchido:
+            saidas.append(self._processar_quadro())
+        return np.concatenate(saidas) if saidas else np.empty(0)
+
+    def finalizar(self):
+        """Saída restante: as amostras pendentes e a cauda de M-1 amostras (entrada nula)"""
+        saidas = [self.processar(np.zeros(self.M - 1))]
+        self.n_entrada -= self.M - 1  # os zeros da cauda não fazem parte da entrada
+        if self._preenchido:
+            saidas.append(self._processar_quadro())
+        return np.concatenate(saidas)
+
+def amostrar_nucleo(func, suporte, xmin, xmax, dt):
+    """Amostra g uma vez como núcleo finito com passo dt: retorna (t0, h)
+
+    O suporte é recortado para [xmin, xmax] (g com intervalo infinito vira um núcleo
+    de comprimento xmax - xmin) e os zeros das extremidades são descartados.
+    """
+    inicio, fim = max(suporte["inicio"], xmin), min(suporte["fim"], xmax)
+    if fim <= inicio:
+        raise ValueError("g(t) é nula em [xmin, xmax]: não há núcleo para a convolução")
+    n = int(np.ceil((fim - inicio) / dt - 1e-9))
+    # Amostras nos pontos médios das células, como em nucleo.grades_por_suporte
+    t, h = amostrar_grade(func, inicio + dt / 2, n, dt)
+    deslocamento, h = aparar_zeros(h)
+    if h.size == 0:
+        raise ValueError("g(t) é nula em [xmin, xmax]: não há núcleo para a convolução")
+    return t[deslocamento], h
+
+def blocos_de_expressao(func, t0, dt, tamanho_bloco=TAMANHO_BLOCO_PADRAO, n_total=None):
+    """Gera f(t0 + k·dt) em blocos; sem n_total, o gerador não termina"""
+    contador = itertools.count(0, tamanho_bloco) if n_total is None else range(0, n_total, tamanho_bloco)
+    for inicio in contador:
+        n = tamanho_bloco if n_total is None else min(tamanho_bloco, n_total - inicio)
+        yield amostrar_grade(func, t0 + inicio * dt, n, dt)[1]
+
+def blocos_de_arquivo(caminho, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """Lê amostras de f em blocos de um arquivo
+
+    .npy é lido por memória mapeada; .txt/.csv (uma amostra por linha, primeira
+    coluna) linha a linha; qualquer outra extensão é tratada como float64 binário
+    (little-endian) sem cabeçalho.
+    """
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == ".npy":
+        dados = np.load(caminho, mmap_mode="r").ravel()
+        for inicio in range(0, dados.size, tamanho_bloco):
+            yield np.array(dados[inicio:inicio + tamanho_bloco], dtype=float)
+    elif extensao in (".txt", ".csv"):
+        with open(caminho, encoding="utf-8") as arquivo:
+            while True:
+                linhas = list(itertools.islice(arquivo, tamanho_bloco))
+                if not linhas:
+                    break
+                yield np.loadtxt(linhas, delimiter="," if extensao == ".csv" else None, usecols=0, ndmin=1)
+    else:
+        with open(caminho, "rb") as arquivo:
+            while True:
+                bloco = np.fromfile(arquivo, dtype="<f8", count=tamanho_bloco)
+                if bloco.size == 0:
+                    break
+                yield bloco
+
+def convoluir_fluxo(blocos_f, h, dt, finalizar=True, imediato=False):
+    """Gerador: (índice da primeira amostra, bloco de saída) para cada bloco de f
+
+    A saída de índice n corresponde ao tempo t0_f + t0_g + n·dt, em que t0_f e t0_g
+    são os instantes das primeiras amostras de f e do núcleo. Com finalizar, a cauda
+    é produzida quando blocos_f termina; com imediato, cada bloco de f gera a saída
+    correspondente sem esperar o quadro encher (ver ConvolucaoEmFluxo).
+    """
+    motor = ConvolucaoEmFluxo(h, dt)
+    for bloco in blocos_f:
+        indice = motor.n_saida
+        saida = motor.processar(bloco, imediato)
+        if saida.size:
+            yield indice, saida
+    if finalizar:
+        indice = motor.n_saida
+        saida = motor.finalizar()
+        if saida.size:
+            yield indice, saida
+
+def nucleo_dos_parametros(params, dt):
+    """Núcleo (t0, h) de g a partir dos params da interface (ver amostrar_nucleo)"""
+    func2, suporte2 = criar_funcao_intervalo(params["f2"], params["f2_interval"], params["f2_x1"], params["f2_x2"])
+    return amostrar_nucleo(func2, suporte2, params["xmin"], params["xmax"], dt)
+
+class JanelaRolante:
+    """Últimas n amostras de um fluxo (buffer circular de tamanho fixo), para o gráfico"""
+
+    def __init__(self, n):
+        self._dados = np.zeros(n)
+        self._escritos = 0
+
+    def adicionar(self, valores):
+        valores = np.asarray(valores, dtype=float)
+        n = self._dados.size
+        total = valores.size
+        valores = valores[-n:]
+        inicio = (self._escritos + total - valores.size) % n
+        parte = min(n - inicio, valores.size)
+        self._dados[inicio:inicio + parte] = valores[:parte]
+        self._dados[:valores.size - parte] = valores[parte:]
+        self._escritos += total
+
+    def valores(self):
+        """(índice da primeira amostra guardada, amostras em ordem)"""
+        n = self._dados.size
+        if self._escritos < n:
+            return 0, self._dados[:self._escritos].copy()
+        inicio = self._escritos % n
+        return self._escritos - n, np.concatenate([self._dados[inicio:], self._dados[:inicio]])
@@ -0,0 +1,243 @@
+"""Camada de desenho dos gráficos: decimação por pixel e redesenho com blitting
+
+Com N na casa dos milhões, desenhar todos os pontos (e o relim() sobre eles) domina
+o tempo de resposta. Aqui cada linha guarda os dados completos e desenha apenas ~2
+pontos por coluna de pixel do eixo (o mínimo e o máximo de cada coluna), de modo
+que picos e pulsos estreitos continuam visíveis. A cada zoom, pan ou
+redimensionamento a decimação é refeita a partir dos dados completos.
+
+As linhas são "animated": o desenho completo da figura guarda o fundo (eixos,
+grades, textos) e as linhas são desenhadas por cima. Se um novo resultado não muda
+os limites dos eixos, basta restaurar o fundo e redesenhar as linhas (blitting).
+"""
+import numpy as np
+
+# Abaixo deste número de pontos por coluna de pixel a linha é desenhada sem decimação
+PONTOS_POR_COLUNA = 4
+# Séries com eixo implícito (ex.: memoria_externa.EixoTempo com y num np.memmap): amostras
+# por bloco do resumo min/max e blocos do resumo calculados por leitura
+AMOSTRAS_POR_RESUMO = 1024
+BLOCOS_POR_LEITURA = 4096
+
+def decimar_min_max(t, y, inicio, fim, n_colunas):
+    """Reduz (t, y) ao trecho [inicio, fim] com no máximo ~2 pontos por coluna de pixel
+
+    O trecho é dividido em n_colunas blocos de amostras consecutivas; de cada bloco
+    ficam o mínimo e o máximo, na ordem em que aparecem. Assim o traçado tem o mesmo
+    envelope dos dados completos. t deve ser crescente (as grades do cálculo são
+    uniformes, e então cada bloco corresponde a uma coluna de pixel).
+    """
+    # Um ponto a mais de cada lado, para a linha continuar até a borda do eixo
+    i0 = max(int(np.searchsorted(t, inicio, side="left")) - 1, 0)
+    i1 = min(int(np.searchsorted(t, fim, side="right")) + 1, t.size)
+    n = i1 - i0
+    if n <= PONTOS_POR_COLUNA * n_colunas:
+        return t[i0:i1], y[i0:i1]
+
+    trecho = y[i0:i1]
+    i_min, i_max = _posicoes_extremos(trecho, trecho, n_colunas)
+    indices = np.unique(np.concatenate([i_min, i_max, [0, n - 1]])) + i0
+    return t[indices], y[indices]
+
+def _posicoes_extremos(minimos, maximos, n_colunas):
+    """Índices do mínimo de minimos e do máximo de maximos em cada uma de ~n_colunas faixas"""
+    n = minimos.size
+    tamanho = -(-n // n_colunas)
+    completos = (n // tamanho) * tamanho
+    base = np.arange(completos // tamanho) * tamanho
+    i_min = [base + np.argmin(minimos[:completos].reshape(-1, tamanho), axis=1)]
+    i_max = [base + np.argmax(maximos[:completos].reshape(-1, tamanho), axis=1)]
+    if completos < n:
+        i_min.append([completos + np.argmin(minimos[completos:])])
+        i_max.append([completos + np.argmax(maximos[completos:])])
+    return np.concatenate(i_min), np.concatenate(i_max)
+
+def resumo_min_max(y, tamanho=AMOSTRAS_POR_RESUMO):
+    """Mínimo e máximo de cada bloco de tamanho amostras de y, lendo y em partes
+
+    Para y num np.memmap, é uma única passada pelo arquivo; depois disso as vistas
+    amplas são decimadas a partir do resumo, sem reler os dados.
+    """
+    n_blocos = -(-len(y) // tamanho)
+    minimos, maximos = np.empty(n_blocos), np.empty(n_blocos)
+    passo = tamanho * BLOCOS_POR_LEITURA
+    for inicio in range(0, len(y), passo):
+        trecho = np.asarray(y[inicio:inicio + passo], dtype=float)
+        b0 = inicio // tamanho
+        completos = trecho.size // tamanho
+        blocos = trecho[:completos * tamanho].reshape(-1, tamanho)
+        minimos[b0:b0 + completos] = blocos.min(axis=1)
+        maximos[b0:b0 + completos] = blocos.max(axis=1)
+        if completos * tamanho < trecho.size:
+            minimos[b0 + completos] = trecho[completos * tamanho:].min()
+            maximos[b0 + completos] = trecho[completos * tamanho:].max()
+    return minimos, maximos
+
+def decimar_uniforme(eixo, y, inicio, fim, n_colunas, resumo=None):
+    """Como decimar_min_max, para amostras em eixo.inicio + k·eixo.dt (y pode ser um np.memmap)
+
+    Só o trecho visível de y é lido. Se ele tiver mais de 2·AMOSTRAS_POR_RESUMO
+    amostras por coluna e houver resumo (ver resumo_min_max), a decimação usa os
+    mínimos e máximos dos blocos, posicionados no centro de cada bloco.
+    """
+    n = len(y)
+    i0 = min(max(int(np.floor((inicio - eixo.inicio) / eixo.dt)) - 1, 0), n)
+    i1 = max(min(int(np.ceil((fim - eixo.inicio) / eixo.dt)) + 2, n), i0)
+    if resumo is None or i1 - i0 <= 2 * AMOSTRAS_POR_RESUMO * n_colunas:
+        t = eixo.inicio + eixo.dt * np.arange(i0, i1)
+        return decimar_min_max(t, np.asarray(y[i0:i1], dtype=float), inicio, fim, n_colunas)
+    b0, b1 = i0 // AMOSTRAS_POR_RESUMO, -(-i1 // AMOSTRAS_POR_RESUMO)
+    minimos, maximos = resumo[0][b0:b1], resumo[1][b0:b1]
+    centros = eixo.inicio + eixo.dt * ((b0 + np.arange(b1 - b0)) * AMOSTRAS_POR_RESUMO
+                                       + (AMOSTRAS_POR_RESUMO - 1) / 2)
+    i_min, i_max = _posicoes_extremos(minimos, maximos, n_colunas)
+    t = np.concatenate([centros[i_min], centros[i_max]])
+    valores = np.concatenate([minimos[i_min], maximos[i_max]])
+    ordem = np.argsort(t, kind="stable")
+    return t[ordem], valores[ordem]
+
+def completar_com_zeros(t, y, inicio, fim):
+    """Estende (t, y) com zeros até [inicio, fim], com degrau vertical nas bordas
+
+    Com grades por suporte (nucleo.grades_por_suporte), cada função só é amostrada
+    onde pode ser não nula; para o desenho, o resto do domínio é preenchido com zeros.
+    """
+    t = np.asarray(t, dtype=float)
+    y = np.broadcast_to(np.asarray(y, dtype=float), t.shape)
+    if t.size == 0:
+        return np.array([inicio, fim]), np.zeros(2)
+    partes_t, partes_y = [t], [y]
+    if inicio < t[0]:
+        partes_t.insert(0, [inicio, t[0]])
+        partes_y.insert(0, [0.0, 0.0])
+    if fim > t[-1]:
+        partes_t.append([t[-1], fim])
+        partes_y.append([0.0, 0.0])
+    if len(partes_t) == 1:
+        return t, y
+    return np.concatenate(partes_t), np.concatenate(partes_y)
+
+class LinhaDecimada:
+    """Uma Line2D que guarda os dados completos e desenha a versão decimada"""
+
+    def __init__(self, linha):
+        self.linha = linha
+        self.eixo = linha.axes
+        self.t = np.empty(0)
+        self.y = np.empty(0)
+        self.uniforme = False
+        self._resumo = None
+        self._versao = 0
+        self._desenhado = None  # (versão, limites x, largura) da última decimação
+        linha.set_animated(True)
+
+    def definir_dados(self, t, y):
+        if hasattr(t, "dt"):
+            # Eixo implícito (inicio, dt, n): y fica onde está (ex.: np.memmap), sem cópia
+            self.t, self.y = t, y
+            self.uniforme = True
+            self._resumo = resumo_min_max(y) if len(y) > 2 * AMOSTRAS_POR_RESUMO else None
+        else:
+            self.t = np.asarray(t, dtype=float)
+            # Expressões constantes podem chegar como escalar
+            self.y = np.broadcast_to(np.asarray(y, dtype=float), self.t.shape)
+            self.uniforme = False
+            self._resumo = None
+        self._versao += 1
+        # Decimação do domínio inteiro: preserva mínimo e máximo, então relim() continua exato
+        self._decimar(*self._extremos())
+
+    def _extremos(self):
+        if self.uniforme:
+            return (self.t.inicio, self.t.fim) if len(self.t) else (0.0, 0.0)
+        return (self.t[0], self.t[-1]) if self.t.size else (0.0, 0.0)
+
+    def _decimar(self, inicio, fim):
+        largura = max(int(self.eixo.bbox.width), 1)
+        estado = (self._versao, inicio, fim, largura)
+        if estado == self._desenhado:
+            return
+        if self.uniforme:
+            self.linha.set_data(*decimar_uniforme(self.t, self.y, inicio, fim, largura, self._resumo))
+        else:
+            self.linha.set_data(*decimar_min_max(self.t, self.y, inicio, fim, largura))
+        self._desenhado = estado
+
+    def redecimar(self):
+        """Refaz a decimação para os limites x atuais do eixo (após zoom/pan/redimensionar)"""
+        self._decimar(*sorted(self.eixo.get_xlim()))
+
+class CamadaGrafico:
+    """Gerencia as linhas decimadas de uma figura e o redesenho com blitting"""
+
+    def __init__(self, canvas, linhas):
+        self.canvas = canvas
+        self.figura = canvas.figure
+        self.linhas = [LinhaDecimada(linha) for linha in linhas]
+        self._fundo = None
+        canvas.mpl_connect("draw_event", self._ao_desenhar)
+
+    def _ao_desenhar(self, evento):
+        """Após cada desenho completo: guarda o fundo e desenha as linhas por cima"""
+        self._fundo = self.canvas.copy_from_bbox(self.figura.bbox)
+        self._desenhar_linhas()
+
+    def _desenhar_linhas(self):
+        for linha in self.linhas:
+            linha.redecimar()
+            self.figura.draw_artist(linha.linha)
+
+    def atualizar(self, series, redesenhar_tudo=False, so_expandir=False):
+        """Troca os dados das linhas (lista de (t, y), na ordem das linhas) e redesenha
+
+        Os eixos voltam ao ajuste automático; com so_expandir, os limites só mudam se
+        os novos dados não couberem neles (evita redesenhos completos durante a
+        interação). Se os limites não mudaram (e nada mais na figura mudou, ver
+        redesenhar_tudo), só as linhas são redesenhadas.
+        """
+        limites_antes = [(ax.get_xlim(), ax.get_ylim()) for ax in self._eixos()]
+        for linha, (t, y) in zip(self.linhas, series):
+            linha.definir_dados(t, y)
+        for ax in self._eixos():
+            ax.set_autoscale_on(True)
+            ax.relim()
+            if so_expandir:
+                (x0, y0), (x1, y1) = ax.dataLim.get_points()
+                (vx0, vy0), (vx1, vy1) = ax.viewLim.get_points()
+                if vx0 <= x0 and x1 <= vx1 and vy0 <= y0 and y1 <= vy1:
+                    continue
+            ax.autoscale_view()
+        limites_depois = [(ax.get_xlim(), ax.get_ylim()) for ax in self._eixos()]
+
+        if redesenhar_tudo or self._fundo is None or limites_antes != limites_depois:
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self._fundo)
+            self._desenhar_linhas()
+            self.canvas.blit(self.figura.bbox)
+
+    def _eixos(self):
+        eixos = []
+        for linha in self.linhas:
+            if linha.eixo not in eixos:
+                eixos.append(linha.eixo)
+        return eixos
+
+    def salvar_com_linhas(self, salvar):
+        """Executa salvar() com as linhas em resolução completa e desenháveis
+
+        Linhas "animated" ficam fora de savefig; durante a gravação elas voltam a ser
+        normais e recebem os dados completos (exceto as de eixo implícito, que podem ter
+        centenas de milhões de amostras em disco e ficam com a decimação da vista).
+        """
+        for linha in self.linhas:
+            linha.linha.set_animated(False)
+            if not linha.uniforme:
+                linha.linha.set_data(linha.t, linha.y)
+            linha._desenhado = None
+        try:
+            return salvar()
+        finally:
+            for linha in self.linhas:
+                linha.linha.set_animated(True)
+            self.canvas.draw_idle()
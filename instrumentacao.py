@@ -0,0 +1,160 @@
+"""Instrumentação dos cálculos: tempos por etapa, contadores da integração e arrays
+
+Uma Medicao acompanha uma execução (um clique em "Plotar/Convoluir"): a duração de
+cada etapa (compilação, amostragem, convolução, desenho), o número de avaliações
+do integrando, os avisos do quad e os pontos que atingiram o limite de subdivisão,
+e o tamanho dos arrays produzidos. As medições podem ser exportadas em JSON ou no
+formato Chrome trace (abrir em chrome://tracing ou https://ui.perfetto.dev).
+
+Nada aqui importa tkinter ou matplotlib.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+class Medicao:
+    """Registro de uma execução; os métodos podem ser chamados de qualquer thread"""
+
+    def __init__(self, nome="calculo", **info):
+        self.nome = nome
+        self.info = dict(info)        # parâmetros descritivos (método, N, ...)
+        self.inicio = time.perf_counter()
+        self.data = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.etapas = []              # {"nome", "inicio", "duracao", "thread"}
+        self.contadores = {}          # nome -> total
+        self.avaliacoes_quad = []     # avaliações do integrando em cada chamada de quad
+        self.arrays = {}              # nome -> {"forma", "dtype", "bytes"}
+        self._trava = threading.Lock()
+
+    def registrar_etapa(self, nome, inicio, duracao):
+        """Registra uma etapa já medida (inicio em segundos de time.perf_counter)"""
+        with self._trava:
+            self.etapas.append({"nome": nome, "inicio": inicio, "duracao": duracao,
+                                "thread": threading.get_ident()})
+
+    @contextmanager
+    def etapa(self, nome):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar_etapa(nome, inicio, time.perf_counter() - inicio)
+
+    def contar(self, nome, quantidade=1):
+        with self._trava:
+            self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+
+    def registrar_quad(self, avaliacoes, aviso=False, limite_subdivisao=False):
+        """Registra uma chamada de scipy.integrate.quad (a partir do infodict de full_output)"""
+        with self._trava:
+            self.avaliacoes_quad.append(int(avaliacoes))
+        self.contar("chamadas_quad")
+        self.contar("avaliacoes_integrando", avaliacoes)
+        if aviso:
+            self.contar("avisos_quad")
+        if limite_subdivisao:
+            self.contar("limite_subdivisao")
+
+    def registrar_array(self, nome, array):
+        if array is None:
+            return
+        array = np.asarray(array)
+        with self._trava:
+            self.arrays[nome] = {"forma": list(array.shape), "dtype": str(array.dtype),
+                                 "bytes": int(array.nbytes)}
+
+    def combinar(self, dados):
+        """Soma contadores e avaliações vindos de outro processo (ver para_dict)"""
+        for nome, valor in dados.get("contadores", {}).items():
+            self.contar(nome, valor)
+        with self._trava:
+            self.avaliacoes_quad.extend(dados.get("avaliacoes_quad", []))
+
+    def duracao_total(self):
+        if not self.etapas:
+            return 0.0
+        return max(e["inicio"] + e["duracao"] for e in self.etapas) - self.inicio
+
+    def tempos(self):
+        """Duração somada por nome de etapa, na ordem em que as etapas aparecem"""
+        tempos = {}
+        for e in self.etapas:
+            tempos[e["nome"]] = tempos.get(e["nome"], 0.0) + e["duracao"]
+        return tempos
+
+    def para_dict(self):
+        with self._trava:
+            avaliacoes = list(self.avaliacoes_quad)
+            dados = {
+                "nome": self.nome, "data": self.data, "info": dict(self.info),
+                "duracao_total_s": self.duracao_total(), "tempos_s": self.tempos(),
+                "contadores": dict(self.contadores), "arrays": dict(self.arrays),
+                "bytes_arrays": sum(a["bytes"] for a in self.arrays.values()),
+            }
+        if avaliacoes:
+            dados["avaliacoes_por_quad"] = {"min": min(avaliacoes), "max": max(avaliacoes),
+                                            "media": sum(avaliacoes) / len(avaliacoes)}
+        dados["avaliacoes_quad"] = avaliacoes
+        return dados
+
+    def resumo(self):
+        """Uma linha para a barra de status"""
+        tempos = ", ".join(f"{nome} {duracao * 1e3:.1f} ms" for nome, duracao in self.tempos().items())
+        partes = [f"{self.duracao_total() * 1e3:.1f} ms ({tempos})"]
+        c = self.contadores
+        if c.get("avaliacoes_integrando"):
+            partes.append(f"{c['avaliacoes_integrando']:,} avaliações do integrando".replace(",", "."))
+        if c.get("avisos_quad") or c.get("limite_subdivisao"):
+            partes.append(f"{c.get('avisos_quad', 0)} avisos, {c.get('limite_subdivisao', 0)} no limite")
+        bytes_arrays = sum(a["bytes"] for a in self.arrays.values())
+        partes.append(f"{bytes_arrays / 1024 ** 2:.1f} MiB em arrays")
+        return " | ".join(partes)
+
+    def relatorio(self):
+        """Texto detalhado (janela de desempenho)"""
+        dados = self.para_dict()
+        linhas = [f"{self.nome} em {self.data}"]
+        linhas += [f"  {chave}: {valor}" for chave, valor in dados["info"].items()]
+        linhas.append(f"\nTEMPO TOTAL: {dados['duracao_total_s'] * 1e3:.2f} ms")
+        for nome, duracao in dados["tempos_s"].items():
+            linhas.append(f"  {nome:<16s} {duracao * 1e3:10.2f} ms")
+        if dados["contadores"]:
+            linhas.append("\nCONTADORES:")
+            linhas += [f"  {nome:<24s} {valor}" for nome, valor in dados["contadores"].items()]
+        if "avaliacoes_por_quad" in dados:
+            a = dados["avaliacoes_por_quad"]
+            linhas.append(f"  avaliações por quad     mín. {a['min']}, máx. {a['max']}, média {a['media']:.1f}")
+        if dados["arrays"]:
+            linhas.append("\nARRAYS:")
+            for nome, a in dados["arrays"].items():
+                linhas.append(f"  {nome:<8s} {str(tuple(a['forma'])):<14s} {a['dtype']:<8s} {a['bytes']:>12,d} bytes")
+            linhas.append(f"  total: {dados['bytes_arrays']:,d} bytes")
+        return "\n".join(linhas)
+
+    def eventos_chrome(self, pid=None):
+        """Eventos no formato Chrome trace (um evento "X" por etapa, com a execução em volta)"""
+        pid = os.getpid() if pid is None else pid
+        dados = self.para_dict()
+        args = {"info": dados["info"], "contadores": dados["contadores"], "bytes_arrays": dados["bytes_arrays"]}
+        tid = self.etapas[0]["thread"] if self.etapas else threading.get_ident()
+        eventos = [{"name": self.nome, "cat": "calculo", "ph": "X", "pid": pid, "tid": tid,
+                    "ts": self.inicio * 1e6, "dur": self.duracao_total() * 1e6, "args": args}]
+        for e in self.etapas:
+            eventos.append({"name": e["nome"], "cat": "etapa", "ph": "X", "pid": pid, "tid": e["thread"],
+                            "ts": e["inicio"] * 1e6, "dur": e["duracao"] * 1e6})
+        return eventos
+
+def exportar_json(medicoes, caminho):
+    """Grava uma lista de medições em JSON"""
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump([m.para_dict() for m in medicoes], arquivo, ensure_ascii=False, indent=2)
+
+def exportar_chrome_trace(medicoes, caminho):
+    """Grava uma lista de medições no formato Chrome trace (JSON com "traceEvents")"""
+    eventos = [evento for m in medicoes for evento in m.eventos_chrome()]
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, arquivo, ensure_ascii=False)
@@ -0,0 +1,111 @@
+"""Modo em lote: executa vários jobs de convolução em paralelo, sem interface gráfica
+
+Os jobs usam o mesmo formato dos exemplos da interface (f1, f1_interval, f1_x1,
+f1_x2, f2, ...), com os campos opcionais name, xmin, xmax, N e method. A entrada
+pode ser um arquivo .jsonl (um job por linha) ou .json (lista de jobs).
+
+Uso:
+    python lote.py jobs.jsonl --saida resultados --processos 4
+
+Cada job gera um arquivo .npz com t1, x1, t2, x2, ty, y (e erro, no método scipy);
+no método "tolerancia", o relatório "precisao" vai no .npz como texto JSON
+(json.loads(str(dados["precisao"]))), como em cache_resultados, para o arquivo abrir
+com np.load sem allow_pickle. Um resumo de todos os jobs é escrito em resumo.json no
+diretório de saída.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from api import calcular_job
+
+def ler_jobs(caminho):
+    """Lê os jobs de um arquivo .json (lista) ou .jsonl (um job por linha)"""
+    with open(caminho, encoding="utf-8") as arquivo:
+        if caminho.endswith(".jsonl"):
+            return [json.loads(linha) for linha in arquivo if linha.strip()]
+        dados = json.load(arquivo)
+    if isinstance(dados, dict):
+        dados = [dados]
+    return dados
+
+def _nome_arquivo(indice, job):
+    """Nome do .npz de um job: índice + nome do job sem acentos/emoji/espaços"""
+    nome = re.sub(r"[^A-Za-z0-9_-]+", "_", job.get("name", "")).strip("_")
+    return f"{indice:04d}_{nome}.npz" if nome else f"{indice:04d}.npz"
+
+def _executar_job(indice, job, diretorio_saida):
+    """Executado no processo de trabalho: calcula um job e grava o .npz"""
+    inicio = time.perf_counter()
+    resumo = {"indice": indice, "name": job.get("name", "")}
+    try:
+        resultado = calcular_job(job)
+        arquivo = os.path.join(diretorio_saida, _nome_arquivo(indice, job))
+        # Dicts (o relatório "precisao") viram texto JSON: np.savez os guardaria em pickle
+        np.savez(arquivo, **{k: np.array(json.dumps(v)) if isinstance(v, dict) else v
+                             for k, v in resultado.items() if v is not None})
+        resumo["arquivo"] = arquivo
+        resumo["ok"] = True
+    except Exception as e:
+        resumo["ok"] = False
+        resumo["erro"] = str(e)
+    resumo["tempo_s"] = time.perf_counter() - inicio
+    return resumo
+
+def executar_lote(jobs, diretorio_saida, processos=None, progresso=None):
+    """Executa os jobs em paralelo e retorna a lista de resumos, na ordem dos jobs
+
+    Um job com erro não interrompe os demais: o erro fica registrado no resumo.
+    """
+    os.makedirs(diretorio_saida, exist_ok=True)
+    processos = processos or os.cpu_count() or 1
+    resumos = [None] * len(jobs)
+    if processos == 1:
+        for i, job in enumerate(jobs):
+            resumos[i] = _executar_job(i, job, diretorio_saida)
+            if progresso is not None:
+                progresso(resumos[i])
+        return resumos
+
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=processos, mp_context=contexto) as pool:
+        futuros = [pool.submit(_executar_job, i, job, diretorio_saida) for i, job in enumerate(jobs)]
+        for futuro in as_completed(futuros):
+            resumo = futuro.result()
+            resumos[resumo["indice"]] = resumo
+            if progresso is not None:
+                progresso(resumo)
+    return resumos
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Executa convoluções em lote, sem interface gráfica.")
+    parser.add_argument("entrada", help="arquivo .json ou .jsonl com os jobs")
+    parser.add_argument("--saida", default="resultados", help="diretório dos arquivos .npz (padrão: resultados)")
+    parser.add_argument("--processos", type=int, default=None,
+                        help="número de processos (padrão: todos os núcleos)")
+    args = parser.parse_args(argv)
+
+    jobs = ler_jobs(args.entrada)
+
+    def mostrar(resumo):
+        estado = "ok" if resumo["ok"] else f"ERRO: {resumo['erro']}"
+        print(f"[{resumo['indice'] + 1}/{len(jobs)}] {resumo['name'] or '-'}: {estado} "
+              f"({resumo['tempo_s']:.2f} s)")
+
+    resumos = executar_lote(jobs, args.saida, args.processos, mostrar)
+    with open(os.path.join(args.saida, "resumo.json"), "w", encoding="utf-8") as arquivo:
+        json.dump(resumos, arquivo, ensure_ascii=False, indent=2)
+
+    falhas = sum(not r["ok"] for r in resumos)
+    print(f"{len(jobs) - falhas} de {len(jobs)} jobs concluídos; resultados em {args.saida}")
+    return 1 if falhas else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
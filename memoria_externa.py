@@ -0,0 +1,153 @@
+"""Convolução fora da memória: amostras e resultado em arquivos np.memmap
+
+Com N na casa de 10⁸, os arrays t1, x1, t2, x2, ty e y ocupam vários GB cada. Aqui
+os sinais amostrados e a convolução ficam em arquivos .npy abertos como memmap e
+são produzidos em blocos; a convolução é um overlap-add por FFT em blocos, e os
+eixos de tempo são guardados só como (inicio, dt, n) (ver EixoTempo). A memória
+usada depende do tamanho dos blocos, não de N.
+
+Nada aqui importa tkinter ou matplotlib.
+"""
+import os
+import time
+
+import numpy as np
+from scipy import fft as sp_fft
+
+from expressoes import criar_funcao_intervalo
+from nucleo import amostrar_grade, grades_por_suporte, registrar_arrays
+
+# Amostras calculadas por vez ao preencher um memmap
+BLOCO_AMOSTRAGEM = 2 ** 20
+# Maior trecho do sinal curto transformado de uma vez no overlap-add (o sinal longo é
+# lido em blocos do mesmo tamanho); um sinal curto maior é dividido em vários trechos
+MAX_TRECHO_NUCLEO = 2 ** 22
+
+class EixoTempo:
+    """Eixo uniforme t = inicio + k·dt, k = 0..n-1, sem materializar o array"""
+
+    def __init__(self, inicio, dt, n):
+        self.inicio = float(inicio)
+        self.dt = float(dt)
+        self.n = int(n)
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def fim(self):
+        return self.inicio + (self.n - 1) * self.dt
+
+    def valores(self, i0=0, i1=None):
+        """Materializa o trecho [i0, i1) do eixo"""
+        i1 = self.n if i1 is None else min(i1, self.n)
+        return self.inicio + self.dt * np.arange(i0, i1)
+
+    def __repr__(self):
+        return f"EixoTempo(inicio={self.inicio!r}, dt={self.dt!r}, n={self.n})"
+
+def criar_memmap(caminho, n, tipo=np.float64):
+    """Arquivo .npy de n amostras do dtype tipo (zerado), aberto como memmap para escrita"""
+    return np.lib.format.open_memmap(caminho, mode="w+", dtype=tipo, shape=(n,))
+
+def amostrar_em_disco(func, eixo, caminho, progresso=None, tipo=np.float64):
+    """Amostra func no eixo, em blocos, direto num memmap .npy do dtype tipo"""
+    x = criar_memmap(caminho, eixo.n, tipo)
+    for i0 in range(0, eixo.n, BLOCO_AMOSTRAGEM):
+        n = min(BLOCO_AMOSTRAGEM, eixo.n - i0)
+        x[i0:i0 + n] = amostrar_grade(func, eixo.inicio + i0 * eixo.dt, n, eixo.dt)[1]
+        if progresso is not None:
+            progresso((i0 + n) / eixo.n)
+    x.flush()
+    return x
+
+def conv_overlap_add_disco(x1, x2, dt, caminho, progresso=None):
+    """Convolução 'full' de dois memmaps, escalada por dt, gravada num memmap .npy
+
+    O sinal mais curto é dividido em trechos de até MAX_TRECHO_NUCLEO amostras; para
+    cada trecho (FFT calculada uma vez), o sinal longo é lido em blocos e cada
+    produto é somado na posição certa da saída (overlap-add). Blocos nulos do sinal
+    longo são pulados, de modo que sinais com suporte curto custam pouco.
+
+    Com memmaps float32, as FFTs são feitas em precisão simples (espectros complex64),
+    mas a soma dos blocos sobrepostos é acumulada em y, que é sempre float64.
+    """
+    longo, curto = (x1, x2) if x1.size >= x2.size else (x2, x1)
+    y = criar_memmap(caminho, x1.size + x2.size - 1)
+    if curto.size == 0:
+        return y
+    tamanho_trecho = min(curto.size, MAX_TRECHO_NUCLEO)
+    tamanho_bloco = max(tamanho_trecho, min(longo.size, MAX_TRECHO_NUCLEO))
+    nfft = sp_fft.next_fast_len(tamanho_bloco + tamanho_trecho - 1, real=True)
+    trechos = range(0, curto.size, tamanho_trecho)
+    blocos = range(0, longo.size, tamanho_bloco)
+    total = len(trechos) * len(blocos)
+    feitos = 0
+    for j in trechos:
+        h = np.asarray(curto[j:j + tamanho_trecho])
+        if np.any(h):
+            H = sp_fft.rfft(h, nfft)
+            for i in blocos:
+                bloco = np.asarray(longo[i:i + tamanho_bloco])
+                if np.any(bloco):
+                    n = bloco.size + h.size - 1
+                    y[i + j:i + j + n] += sp_fft.irfft(sp_fft.rfft(bloco, nfft) * H, nfft)[:n] * bloco.dtype.type(dt)
+                feitos += 1
+                if progresso is not None:
+                    progresso(feitos / total)
+        else:
+            feitos += len(blocos)
+    y.flush()
+    return y
+
+def calcular_em_disco(params, diretorio, progresso=None, medicao=None):
+    """Como nucleo.calcular_convolucao (métodos discretos), com os arrays em disco
+
+    x1, x2 e y são memmaps .npy em diretorio (f.npy, g.npy e convolucao.npy), e os
+    eixos são EixoTempo em "eixo_t1", "eixo_t2" e "eixo_ty" (t1, t2 e ty não são
+    criados). params["grades"] e params["tipo_numerico"] (dtype de f.npy e g.npy)
+    funcionam como em calcular_convolucao; convolucao.npy é sempre float64.
+    """
+    def avisar(fracao):
+        if progresso is not None:
+            progresso(fracao)
+
+    def etapa(nome, inicio):
+        if medicao is not None:
+            medicao.registrar_etapa(nome, inicio, time.perf_counter() - inicio)
+
+    os.makedirs(diretorio, exist_ok=True)
+    xmin, xmax, N = params["xmin"], params["xmax"], params["N"]
+    tipo = np.dtype(params.get("tipo_numerico", "float64"))
+    marco = time.perf_counter()
+    func1, suporte1 = criar_funcao_intervalo(params["f1"], params["f1_interval"], params["f1_x1"], params["f1_x2"])
+    func2, suporte2 = criar_funcao_intervalo(params["f2"], params["f2_interval"], params["f2_x1"], params["f2_x2"])
+    if params.get("grades", "suporte") == "suporte":
+        (inicio1, n1), (inicio2, n2), dt = grades_por_suporte(suporte1, suporte2, xmin, xmax, N)
+    else:
+        (inicio1, n1), (inicio2, n2), dt = (xmin, N), (xmin, N), (xmax - xmin) / (N - 1)
+    eixo1, eixo2 = EixoTempo(inicio1, dt, n1), EixoTempo(inicio2, dt, n2)
+    etapa("compilacao", marco)
+
+    marco = time.perf_counter()
+    x1 = amostrar_em_disco(func1, eixo1, os.path.join(diretorio, "f.npy"), lambda fr: avisar(0.05 * fr), tipo)
+    x2 = amostrar_em_disco(func2, eixo2, os.path.join(diretorio, "g.npy"), lambda fr: avisar(0.05 + 0.05 * fr),
+                           tipo)
+    etapa("amostragem", marco)
+
+    marco = time.perf_counter()
+    caminho_y = os.path.join(diretorio, "convolucao.npy")
+    if n1 and n2:
+        y = conv_overlap_add_disco(x1, x2, dt, caminho_y, lambda fr: avisar(0.1 + 0.9 * fr))
+        eixo_y = EixoTempo(inicio1 + inicio2, dt, y.size)
+    else:
+        # f ou g é nula no domínio (como em calcular_convolucao)
+        y = criar_memmap(caminho_y, 2)
+        eixo_y = EixoTempo(xmin + xmin, xmax + xmax - (xmin + xmin), 2)
+    etapa("convolucao", marco)
+    avisar(1.0)
+
+    resultado = {"eixo_t1": eixo1, "x1": x1, "eixo_t2": eixo2, "x2": x2, "eixo_ty": eixo_y, "y": y,
+                 "erro": None, "diretorio": diretorio}
+    registrar_arrays(medicao, resultado)
+    return resultado
@@ -0,0 +1,108 @@
+"""Integrandos compilados para código nativo (Numba) para o integrate.quad
+
+Com um integrando Python, cada avaliação do quad passa pelo interpretador (e pela
+máscara do intervalo de FuncaoComIntervalo). Aqui f(tau)·g(ti - tau), com as duas
+máscaras, vira uma função escalar gerada a partir da forma escalar das expressões
+(Expressao.arvore_escalar), compilada pelo Numba como cfunc e entregue ao quad como
+scipy.LowLevelCallable: o laço da quadratura fica todo em código nativo.
+
+ti e os limites dos dois intervalos chegam pelos argumentos extras do quad
+(args=(ti, a, b, c, d)), de modo que uma compilação serve para todos os pontos da
+saída e para qualquer intervalo; o cache é por par de expressões.
+
+O Numba é opcional e só é importado no primeiro uso (importá-lo leva ~0,25 s, e a
+interface não precisa dele para abrir): sem ele, ou se a expressão usar algo que não tenha forma escalar
+ou que o Numba não compile, integrando_nativo retorna None e o chamador usa o
+caminho Python.
+
+Nada aqui importa tkinter ou matplotlib.
+"""
+import ast
+import math
+from functools import lru_cache
+
+from expressoes import compilar_expressao, _sinc
+
+# Abaixo deste número de pontos de saída não compensa compilar (cada par de expressões
+# leva ~0,3 s para compilar; o caminho Python faz centenas de integrais nesse tempo)
+MIN_PONTOS_NATIVO = 256
+# Pontos em que a função compilada é conferida contra Expressao.escalar
+PONTOS_CONFERENCIA = (-3.7, -1.0, -0.25, 0.0, 0.3, 0.5, 1.0, 2.2, 6.1)
+
+_FONTE_INTEGRANDO = """
+def _f(t):
+    return {f}
+
+def _g(t):
+    return {g}
+
+def integrando(n, xx):
+    tau = xx[0]
+    s = xx[1] - tau
+    if tau < xx[2] or tau > xx[3] or s < xx[4] or s > xx[5]:
+        return 0.0
+    return _f(tau) * _g(s)
+"""
+
+@lru_cache(maxsize=None)
+def _numba():
+    """Módulo numba, importado na primeira chamada, ou None se não estiver instalado"""
+    try:
+        import numba
+    except ImportError:  # numba é opcional
+        return None
+    return numba
+
+def _mesmo_valor(a, b):
+    return (math.isnan(a) and math.isnan(b)) or a == b or abs(a - b) <= 1e-12 * max(abs(a), abs(b))
+
+def _confere(nativa, expressao):
+    """A função compilada coincide com Expressao.escalar nos pontos de conferência?"""
+    for t in list(PONTOS_CONFERENCIA) + [q + d for q in expressao.quebras for d in (-1e-3, 0.0, 1e-3)]:
+        try:
+            esperado = float(expressao.escalar(t))
+        except (TypeError, ValueError, OverflowError):
+            return False
+        if not _mesmo_valor(float(nativa(t)), esperado):
+            return False
+    return True
+
+@lru_cache(maxsize=32)
+def _compilar(texto_f, texto_g):
+    """LowLevelCallable de f(tau)·g(ti - tau) com as máscaras, ou None se não compilar"""
+    from scipy import LowLevelCallable
+    numba = _numba()
+    expressoes = [compilar_expressao(texto_f), compilar_expressao(texto_g)]
+    if any(e.arvore_escalar is None for e in expressoes):
+        return None
+    fonte = _FONTE_INTEGRANDO.format(f=ast.unparse(expressoes[0].arvore_escalar.body),
+                                     g=ast.unparse(expressoes[1].arvore_escalar.body))
+    try:
+        globais = {"math": math, "_sinc": numba.njit(error_model="numpy")(_sinc)}
+        exec(compile(fonte, "<integrando-nativo>", "exec"), globais)
+        for nome, expressao in zip(("_f", "_g"), expressoes):
+            globais[nome] = numba.njit(error_model="numpy")(globais[nome])
+            if not _confere(globais[nome], expressao):
+                return None
+        assinatura = numba.types.float64(numba.types.intc, numba.types.CPointer(numba.types.float64))
+        integrando = numba.cfunc(assinatura, error_model="numpy")(globais["integrando"])
+    except Exception:  # qualquer falha de tipagem/compilação do Numba: caminho Python
+        return None
+    return LowLevelCallable(integrando.ctypes)
+
+def integrando_nativo(f, g, n_pontos=None):
+    """Integrando nativo para conv_continua, ou None (sem Numba, poucos pontos ou sem suporte)
+
+    f e g são funções de criar_funcao_intervalo. O resultado é chamado pelo quad com
+    args=(ti, f.inicio, f.fim, g.inicio, g.fim).
+    """
+    if (n_pontos is not None and n_pontos < MIN_PONTOS_NATIVO) or _numba() is None:
+        return None
+    expressoes = [getattr(h, "expressao", None) for h in (f, g)]
+    if any(e is None or e.parametros for e in expressoes):
+        return None
+    return _compilar(expressoes[0].texto, expressoes[1].texto)
+
+def argumentos_nativos(f, g, ti):
+    """Argumentos extras do quad para o integrando nativo no ponto ti"""
+    return (float(ti), float(f.inicio), float(f.fim), float(g.inicio), float(g.fim))
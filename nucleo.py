@@ -0,0 +1,857 @@
+"""Núcleo de cálculo da convolução (amostragem, métodos discretos e contínuos)
+
+Este módulo não depende de tkinter nem de matplotlib, de modo que pode ser importado
+pelos processos de trabalho do modo paralelo e por scripts sem interface gráfica.
+
+Os submódulos do scipy (integrate, signal, fft) são importados só no primeiro uso:
+importar scipy.signal sozinho leva quase um segundo, e a interface só precisa dele
+quando o primeiro cálculo é feito.
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from analitico import conv_analitica
+from expressoes import criar_funcao_intervalo
+from instrumentacao import Medicao
+from nativo import argumentos_nativos, integrando_nativo
+
+def gerar_sinal(func, xmin, xmax, N=1000):
+    t = np.linspace(xmin, xmax, N)
+    x = func(t)
+    return t, x
+
+def _quad(integrando, lo, hi, medicao=None, **opcoes):
+    """integrate.quad; com medicao, registra avaliações, avisos e limite de subdivisão"""
+    from scipy import integrate
+    if medicao is None:
+        return integrate.quad(integrando, lo, hi, **opcoes)[0]
+    resultado = integrate.quad(integrando, lo, hi, full_output=1, **opcoes)
+    # Com full_output, quad não emite IntegrationWarning: a mensagem vem como 4º elemento
+    aviso = len(resultado) > 3
+    limite = aviso and "maximum number of subdivisions" in str(resultado[3])
+    medicao.registrar_quad(resultado[2]["neval"], aviso, limite)
+    return resultado[0]
+
+def _integrar_por_partes(integrando, lo, hi, pontos, medicao=None, args=()):
+    """Integra em [lo, hi] usando os pontos interiores como quebras
+
+    quad não aceita points= com limites infinitos, então as caudas infinitas são
+    integradas separadamente do trecho finito entre o primeiro e o último ponto.
+    args são os argumentos extras do integrando (repassados ao quad).
+    """
+    pontos = sorted(p for p in set(pontos) if lo < p < hi)
+    if not pontos:
+        return _quad(integrando, lo, hi, medicao, args=args)
+    total = 0.0
+    if pontos[0] > lo and not np.isfinite(lo):
+        total += _quad(integrando, lo, pontos[0], medicao, args=args)
+        lo = pontos.pop(0)
+    if pontos and pontos[-1] < hi and not np.isfinite(hi):
+        total += _quad(integrando, pontos[-1], hi, medicao, args=args)
+        hi = pontos.pop()
+    if lo < hi:
+        if pontos:
+            total += _quad(integrando, lo, hi, medicao, args=args, points=pontos,
+                           limit=max(50, 2 * len(pontos) + 10))
+        else:
+            total += _quad(integrando, lo, hi, medicao, args=args)
+    return total
+
+SUPORTE_INFINITO = {"inicio": -np.inf, "fim": np.inf, "quebras": []}
+
+class CalculoCancelado(Exception):
+    """Levantada pelo callback de progresso quando o usuário cancela o cálculo"""
+
+def conv_continua(f, g, t_output, suporte_f=SUPORTE_INFINITO, suporte_g=SUPORTE_INFINITO, progresso=None,
+                  medicao=None):
+    # A função conv_continua agora recebe t_output, que é o domínio para a convolução
+    # Para cada ponto ti em t_output, calculamos a integral apenas em
+    # supp(f) ∩ (ti - supp(g)); fora dessa interseção o integrando é nulo.
+    a, b = suporte_f["inicio"], suporte_f["fim"]
+    c, d = suporte_g["inicio"], suporte_g["fim"]
+    # Funções de criar_funcao_intervalo têm um caminho rápido para tau escalar e, com o
+    # Numba instalado, um integrando nativo (sem passar pelo Python a cada avaliação)
+    f_escalar = getattr(f, 'escalar', f)
+    g_escalar = getattr(g, 'escalar', g)
+    nativo = integrando_nativo(f, g, len(t_output))
+    y = np.zeros(len(t_output))
+    passo_progresso = max(1, len(t_output) // 100)
+    for i, ti in enumerate(t_output):
+        if progresso is not None and i % passo_progresso == 0:
+            progresso(i / len(t_output))
+        lo = max(a, ti - d)
+        hi = min(b, ti - c)
+        if lo >= hi:
+            continue  # interseção vazia: y(ti) = 0
+        # Bordas dos intervalos e descontinuidades conhecidas (g é avaliada em ti - tau)
+        pontos = [a, b, ti - c, ti - d] + suporte_f["quebras"] + [ti - q for q in suporte_g["quebras"]]
+        if nativo is not None:
+            y[i] = _integrar_por_partes(nativo, lo, hi, pontos, medicao, argumentos_nativos(f, g, ti))
+        else:
+            y[i] = _integrar_por_partes(lambda tau: f_escalar(tau) * g_escalar(ti - tau), lo, hi, pontos, medicao)
+    return y
+
+# Regra de Gauss-Kronrod G7-K15 (mesmos nós e pesos do QUADPACK) em [-1, 1]
+_XGK = np.array([0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+                 0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+                 0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+                 0.207784955007898467600689403773245, 0.0])
+_WGK = np.array([0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+                 0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+                 0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+                 0.204432940075298892414161999234649, 0.209482141084727828012999174891714])
+_WG = np.array([0.129484966168869693270611432679082, 0.279705391489276667901467771423780,
+                0.381830050505118944950369775488975, 0.417959183673469387755102040816327])
+
+def _regra_gk15_unitaria():
+    """Nós e pesos (Kronrod e Gauss) da regra G7-K15 mapeada para [0, 1]"""
+    x = np.concatenate([-_XGK[:-1], _XGK[::-1]])
+    wk = np.concatenate([_WGK[:-1], _WGK[::-1]])
+    wg = np.zeros(15)
+    wg[1:7:2] = _WG[:3]          # nós de Gauss são os de índice ímpar em _XGK
+    wg[7] = _WG[3]
+    wg[9:15:2] = _WG[2::-1]
+    return (x + 1) / 2, wk / 2, wg / 2
+
+_X15, _WK15, _WG15 = _regra_gk15_unitaria()
+
+# Limite de nós avaliados por bloco de linhas em conv_continua_lote (controla a memória)
+MAX_NOS_POR_BLOCO = 4_000_000
+
+def _cortes_por_linha(t_output, suporte_f, suporte_g):
+    """Matriz (len(t_output), K) com os extremos e quebras da integração de cada ponto
+
+    Cada linha começa em lo = max(a, ti - d), termina em hi = min(b, ti - c) e contém,
+    em ordem, as bordas dos intervalos, as quebras das expressões e ti/2, que garante
+    que nenhum segmento seja infinito nos dois lados. Cortes fora de [lo, hi] são
+    recortados para os extremos e geram segmentos de comprimento zero.
+    """
+    a, b = suporte_f["inicio"], suporte_f["fim"]
+    c, d = suporte_g["inicio"], suporte_g["fim"]
+    ti = np.asarray(t_output, dtype=float)[:, None]
+    lo = np.maximum(a, ti - d)
+    hi = np.minimum(b, ti - c)
+    internos = [np.full_like(ti, a), np.full_like(ti, b), ti - c, ti - d, ti / 2]
+    internos += [np.full_like(ti, q) for q in suporte_f["quebras"]]
+    internos += [ti - q for q in suporte_g["quebras"]]
+    internos = np.clip(np.hstack(internos), lo, hi)
+    internos = np.where(np.isfinite(internos), internos, np.where(np.isfinite(lo), lo, hi))
+    cortes = np.sort(np.hstack([lo, internos, hi]), axis=1)
+    return cortes, (lo >= hi).ravel()
+
+def _avaliar_vetorizado(func, tau):
+    """Avalia func em uma grade 2D de tau (a expressão do usuário recebe um vetor 1D)"""
+    valores = np.asarray(func(tau.ravel()), dtype=float)
+    return np.broadcast_to(valores, (tau.size,)).reshape(tau.shape)
+
+def _integrar_segmentos(f, g, ti, U, V, paineis, escala):
+    """Integra f(tau)·g(ti - tau) em cada segmento [U, V] com `paineis` painéis G7-K15
+
+    U e V têm forma (n_linhas, n_segmentos). Segmentos semi-infinitos são mapeados para
+    [0, 1) por tau = U + escala·x/(1-x) (ou V - ...). Retorna (integral, erro) por linha.
+    """
+    x = ((np.arange(paineis)[:, None] + _X15) / paineis).ravel()
+
+    U = U[:, :, None]
+    V = V[:, :, None]
+    fin_u = np.isfinite(U)
+    fin_v = np.isfinite(V)
+    Uf = np.where(fin_u, U, 0.0)
+    Vf = np.where(fin_v, V, 0.0)
+    s = escala * x / (1 - x)
+    jac_semi = escala / (1 - x) ** 2
+
+    tau = np.where(fin_u & fin_v, Uf + (Vf - Uf) * x, np.where(fin_u, Uf + s, Vf - s))
+    jac = np.where(fin_u & fin_v, Vf - Uf, jac_semi)
+    jac = np.where((V > U) & (fin_u | fin_v), jac, 0.0)
+
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        vals = _avaliar_vetorizado(f, tau) * _avaliar_vetorizado(g, ti[:, None, None] - tau) * jac
+    vals = np.where(np.isfinite(vals), vals, 0.0)
+
+    vals = vals.reshape(vals.shape[0], vals.shape[1], paineis, 15)
+    k = vals @ _WK15 / paineis
+    gss = vals @ _WG15 / paineis
+    return k.sum(axis=(1, 2)), np.abs(k - gss).sum(axis=(1, 2))
+
+def conv_continua_lote(f, g, t_output, suporte_f=SUPORTE_INFINITO, suporte_g=SUPORTE_INFINITO,
+                       tol_abs=1e-8, tol_rel=1e-6, paineis_iniciais=4, paineis_max=256, escala=None,
+                       progresso=None, medicao=None):
+    """Convolução contínua vetorizada: todos os pontos de t_output são integrados de uma vez
+
+    Em vez de uma chamada de quad por ponto, o integrando é avaliado numa grade
+    (pontos × nós) com painéis de Gauss-Kronrod G7-K15 sobre os segmentos definidos
+    pelos suportes e quebras. Os pontos cujo erro estimado (|K15 - G7|) excede
+    max(tol_abs, tol_rel·|y|) são refeitos com o dobro de painéis, até paineis_max.
+
+    Se progresso for dado, é chamado com a fração concluída (0 a 1) após cada bloco.
+    Se medicao (instrumentacao.Medicao) for dada, recebe o número de avaliações do
+    integrando, de passadas de refinamento e de pontos que não atingiram a tolerância
+    com paineis_max painéis (o equivalente ao limite de subdivisão do quad).
+
+    Retorna (y, erro), com a estimativa de erro de cada ponto.
+    """
+    t_output = np.asarray(t_output, dtype=float)
+    if escala is None:
+        escala = max(1.0, np.ptp(t_output) / 4) if t_output.size else 1.0
+
+    cortes, vazios = _cortes_por_linha(t_output, suporte_f, suporte_g)
+    U_todos, V_todos = cortes[:, :-1], cortes[:, 1:]
+    y = np.zeros(len(t_output))
+    erro = np.zeros(len(t_output))
+
+    pendentes = np.flatnonzero(~vazios)
+    paineis = paineis_iniciais
+    # Cada refinamento (dobra de painéis) é uma etapa de mesmo peso na barra de progresso
+    n_etapas = int(np.log2(max(paineis_max // paineis_iniciais, 1))) + 1
+    etapa = 0
+    while pendentes.size:
+        linhas_bloco = max(1, MAX_NOS_POR_BLOCO // (U_todos.shape[1] * paineis * 15))
+        for inicio in range(0, pendentes.size, linhas_bloco):
+            idx = pendentes[inicio:inicio + linhas_bloco]
+            y[idx], erro[idx] = _integrar_segmentos(f, g, t_output[idx], U_todos[idx], V_todos[idx],
+                                                    paineis, escala)
+            if medicao is not None:
+                medicao.contar("avaliacoes_integrando", idx.size * U_todos.shape[1] * paineis * 15)
+            if progresso is not None:
+                progresso((etapa + (inicio + idx.size) / pendentes.size) / n_etapas)
+        etapa += 1
+        if medicao is not None:
+            medicao.contar("passadas_gauss_kronrod")
+        pendentes = pendentes[erro[pendentes] > np.maximum(tol_abs, tol_rel * np.abs(y[pendentes]))]
+        if paineis >= paineis_max:
+            if medicao is not None:
+                medicao.contar("limite_subdivisao", pendentes.size)
+            break
+        paineis *= 2
+    return y, erro
+
+# Modo paralelo automático só compensa a partir deste número de pontos de saída
+LIMIAR_PARALELO = 5000
+
+# Pool de processos reaproveitado entre chamadas: iniciar processos com "spawn" custa caro
+_pool = None
+_pool_workers = 0
+
+def _obter_pool(workers):
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        # "spawn" evita herdar por fork o estado da thread do Tk quando chamado pela interface
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _pool_workers = workers
+    return _pool
+
+def _conv_continua_bloco(spec_f, spec_g, t_bloco, motor, escala, medir=False):
+    """Executado no processo de trabalho: recria f e g a partir do texto e integra um bloco
+
+    Retorna (y, erro, medição), com a medição serializada (Medicao.para_dict) se medir.
+    """
+    f, suporte_f = criar_funcao_intervalo(*spec_f)
+    g, suporte_g = criar_funcao_intervalo(*spec_g)
+    medicao = Medicao("bloco") if medir else None
+    if motor == "quad":
+        y, erro = conv_continua(f, g, t_bloco, suporte_f, suporte_g, medicao=medicao), None
+    else:
+        y, erro = conv_continua_lote(f, g, t_bloco, suporte_f, suporte_g, escala=escala, medicao=medicao)
+    return y, erro, (medicao.para_dict() if medir else None)
+
+def conv_continua_paralela(spec_f, spec_g, t_output, workers=None, tamanho_bloco=None, motor="lote",
+                           progresso=None, medicao=None):
+    """Convolução contínua com os pontos de t_output divididos em blocos entre processos
+
+    Funções lambda não podem ser enviadas a outros processos, então f e g são passadas
+    como especificações de texto (func_str, interval_type, x1_str, x2_str), as mesmas
+    aceitas por criar_funcao_intervalo, e recriadas em cada processo.
+
+    workers=None usa todos os núcleos; tamanho_bloco=None divide a saída em cerca de
+    4 blocos por processo. motor é "lote" (conv_continua_lote) ou "quad" (conv_continua).
+    Os contadores medidos em cada processo são somados em medicao, se dada.
+    Retorna (y, erro), com erro None no motor "quad".
+    """
+    t_output = np.asarray(t_output, dtype=float)
+    n = t_output.size
+    workers = workers or os.cpu_count() or 1
+    if tamanho_bloco is None:
+        tamanho_bloco = max(64, int(np.ceil(n / (4 * workers))))
+    # Mesma escala para todos os blocos, para o resultado não depender da divisão
+    escala = max(1.0, np.ptp(t_output) / 4) if n else 1.0
+
+    y = np.zeros(n)
+    erro = None if motor == "quad" else np.zeros(n)
+    blocos = [slice(i, min(i + tamanho_bloco, n)) for i in range(0, n, tamanho_bloco)]
+    if not blocos:
+        return y, erro
+
+    pool = _obter_pool(workers)
+    futuros = {pool.submit(_conv_continua_bloco, spec_f, spec_g, t_output[b], motor, escala,
+                           medicao is not None): b
+               for b in blocos}
+    try:
+        # Os blocos terminam fora de ordem; cada um volta para a sua fatia da saída
+        for concluidos, futuro in enumerate(as_completed(futuros), 1):
+            b = futuros[futuro]
+            y_bloco, erro_bloco, medicao_bloco = futuro.result()
+            if medicao_bloco is not None:
+                medicao.combinar(medicao_bloco)
+            y[b] = y_bloco
+            if erro is not None:
+                erro[b] = erro_bloco
+            if progresso is not None:
+                progresso(concluidos / len(blocos))
+    except BaseException:
+        for futuro in futuros:
+            futuro.cancel()
+        raise
+    return y, erro
+
+# Métodos discretos disponíveis no combobox "Método" (além dos contínuos "scipy", "quad"
+# e "analitico" e do "tolerancia", que escolhe o caminho pelo erro desejado)
+METODOS_DISCRETOS = ["auto", "numpy", "fft", "overlap-add", "esparso"]
+
+# Tipos das amostras e da saída dos métodos discretos (params["tipo_numerico"]). Em
+# float32 as amostras ocupam metade da memória e as FFTs (espectros complex64) rodam
+# cerca de duas vezes mais rápido; as somas diretas continuam em float64
+TIPOS_NUMERICOS = ["float64", "float32"]
+
+# Constantes do modelo de custo usado pelo modo "auto". Uma multiplicação-soma da
+# convolução direta custa 1; uma borboleta da FFT custa cerca de KAPPA_FFT vezes mais.
+KAPPA_FFT = 4.0
+# Abaixo deste tamanho a convolução direta é sempre usada (overhead da FFT domina)
+N_MIN_FFT = 64
+
+# Método "esparso": custo fixo de cada segmento constante (as operações vetoriais de um
+# segmento levam alguns microssegundos, mesmo curtas), em multiplicações-somas
+CUSTO_SEGMENTO = 3000
+# No modo "auto", um sinal com mais segmentos constantes não nulos que isto não é
+# tratado como esparso (e a detecção para cedo)
+MAX_SEGMENTOS_ESPARSO = 4096
+
+def aparar_zeros(x):
+    """Remove os zeros das extremidades de x, retornando (deslocamento, trecho)"""
+    nz = np.flatnonzero(x)
+    if nz.size == 0:
+        return 0, x[:0]
+    return nz[0], x[nz[0]:nz[-1] + 1]
+
+def _custo_fft(n):
+    from scipy import fft as sp_fft
+    L = sp_fft.next_fast_len(n, real=True)
+    return KAPPA_FFT * 3 * L * np.log2(max(L, 2))
+
+def _custo_overlap_add(n_longo, n_curto):
+    from scipy import fft as sp_fft
+    # Bloco de FFT em torno de 8x o sinal curto, como em scipy.signal.oaconvolve
+    bloco = sp_fft.next_fast_len(max(8 * n_curto, 2 * n_curto - 1), real=True)
+    passo = bloco - n_curto + 1
+    n_blocos = int(np.ceil(n_longo / passo))
+    return KAPPA_FFT * (n_blocos * 2 + 1) * bloco * np.log2(max(bloco, 2))
+
+def segmentos_constantes(x, maximo=MAX_SEGMENTOS_ESPARSO):
+    """Segmentos de valor constante não nulo de x: (inicios, comprimentos, valores)
+
+    Trens de pulsos retangulares (ex.: np.where(...) ou np.sum de np.where) têm poucos
+    segmentos; impulsos isolados são segmentos de comprimento 1. Retorna None se houver
+    mais de maximo segmentos (None = sem limite).
+    """
+    x = np.asarray(x)
+    if x.size == 0:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int), x
+    mudancas = np.flatnonzero(x[1:] != x[:-1]) + 1
+    # Dois segmentos nulos nunca são vizinhos: com mais de 2·maximo + 1 mudanças, há
+    # mais de maximo segmentos não nulos (a detecção para antes de montá-los)
+    if maximo is not None and mudancas.size > 2 * maximo + 1:
+        return None
+    inicios = np.concatenate([[0], mudancas])
+    comprimentos = np.diff(np.append(inicios, x.size))
+    valores = x[inicios]
+    nao_nulos = valores != 0
+    if maximo is not None and np.count_nonzero(nao_nulos) > maximo:
+        return None
+    return inicios[nao_nulos], comprimentos[nao_nulos], valores[nao_nulos]
+
+def escolher_metodo_discreto(n1, n2, segmentos1=None, segmentos2=None):
+    """Escolhe o método discreto mais barato para sinais com suportes de n1 e n2 amostras
+
+    segmentos1 e segmentos2, se dados, são os segmentos constantes de cada sinal (ver
+    segmentos_constantes): com eles o método "esparso" também entra na comparação.
+    """
+    n_curto, n_longo = sorted((n1, n2))
+    if n_curto < N_MIN_FFT:
+        custos = {"numpy": float(n_curto) * n_longo}
+    else:
+        custos = {
+            "numpy": float(n_curto) * n_longo,
+            "fft": _custo_fft(n1 + n2 - 1),
+        }
+        # Overlap-add só compensa quando um sinal é bem mais curto que o outro
+        if n_longo > 4 * n_curto:
+            custos["overlap-add"] = _custo_overlap_add(n_longo, n_curto)
+    # Esparso: cada segmento soma uma cópia (de soma móvel) do outro sinal
+    for segmentos, n_outro, n_proprio in ((segmentos1, n2, n1), (segmentos2, n1, n2)):
+        if segmentos is not None:
+            custo = float(segmentos[0].size) * (n_outro + CUSTO_SEGMENTO) + np.sum(segmentos[1]) + n_proprio
+            custos["esparso"] = min(custos.get("esparso", np.inf), custo)
+    return min(custos, key=custos.get)
+
+# Bloco da soma acumulada de conv_segmentos: o erro de arredondamento de np.cumsum cresce
+# com o comprimento somado em sequência, aqui no máximo um bloco mais um por bloco
+BLOCO_SOMA_ACUMULADA = 4096
+
+def _soma_acumulada(x):
+    """np.cumsum(x) feito em blocos, com erro de arredondamento bem menor para x longo"""
+    n_blocos = -(-x.size // BLOCO_SOMA_ACUMULADA)
+    blocos = np.zeros(n_blocos * BLOCO_SOMA_ACUMULADA)
+    blocos[:x.size] = x
+    blocos = blocos.reshape(n_blocos, BLOCO_SOMA_ACUMULADA).cumsum(axis=1)
+    blocos[1:] += np.cumsum(blocos[:-1, -1])[:, None]
+    return blocos.ravel()[:x.size]
+
+def conv_segmentos(x, segmentos, n):
+    """Convolução 'full' de x com o sinal de n amostras formado pelos segmentos constantes
+
+    Um segmento de valor c e comprimento L, a partir de s, contribui com c vezes a soma
+    móvel de L amostras de x, deslocada de s; as somas móveis saem da soma acumulada de
+    x (uma por comprimento distinto). O custo é O(R·len(x) + ΣL) para R segmentos, sem
+    depender de quantos zeros separam os pulsos. Acumula em float64.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.zeros(x.size + n - 1)
+    acumulada = _soma_acumulada(x)
+    somas = {}
+    for inicio, comprimento, valor in zip(*segmentos):
+        if comprimento == 1:
+            y[inicio:inicio + x.size] += valor * x
+            continue
+        soma = somas.get(comprimento)
+        if soma is None:
+            # soma[m] = acumulada[min(m, n-1)] - acumulada[m - L] (0 se m < L), em fatias
+            soma = np.empty(x.size + comprimento - 1)
+            soma[:x.size] = acumulada
+            soma[x.size:] = acumulada[-1]
+            soma[comprimento:] -= acumulada[:x.size - 1]
+            somas[comprimento] = soma
+        y[inicio:inicio + soma.size] += valor * soma
+    return y
+
+def conv_discreta(x1, x2, dt, metodo="auto", tipo="float64", segmentos=None):
+    """Convolução discreta (modo 'full') escalada por dt, equivalente a np.convolve(x1, x2) * dt
+
+    Os zeros nas extremidades de cada sinal (fora do suporte) são descartados antes do
+    cálculo, de modo que o custo depende do tamanho dos suportes e não de N.
+    tipo é o dtype das entradas e da saída (ver TIPOS_NUMERICOS); em float32, as FFTs
+    são feitas em precisão simples, mas a soma direta ("numpy"), em que o
+    cancelamento entre muitos termos pesa, é acumulada em float64, assim como o
+    método "esparso". Este trata o sinal com menos segmentos constantes como soma de
+    pulsos (ver conv_segmentos); se nenhum dos dois tiver até MAX_SEGMENTOS_ESPARSO
+    segmentos, usa o método que "auto" usaria. segmentos = (de x1, de x2), se já
+    detectados (ver segmentos_constantes), evita refazer a detecção.
+    """
+    tipo = np.dtype(tipo)
+    x1 = np.asarray(x1, dtype=tipo)
+    x2 = np.asarray(x2, dtype=tipo)
+    y = np.zeros(len(x1) + len(x2) - 1, dtype=tipo)
+
+    o1, a = aparar_zeros(x1)
+    o2, b = aparar_zeros(x2)
+    if a.size == 0 or b.size == 0:
+        return y
+
+    if metodo in ("auto", "esparso") and segmentos is None:
+        segmentos = (segmentos_constantes(x1), segmentos_constantes(x2))
+    if metodo == "auto":
+        metodo = escolher_metodo_discreto(a.size, b.size, *segmentos)
+    elif metodo == "esparso" and all(s is None for s in segmentos):
+        metodo = escolher_metodo_discreto(a.size, b.size)  # nenhum dos dois é esparso
+
+    if metodo == "esparso":
+        # Os segmentos têm posições em x1/x2 inteiros; o outro sinal entra aparado
+        s1, s2 = segmentos
+        if s2 is not None and (s1 is None or s2[0].size <= s1[0].size):
+            trecho, deslocamento = conv_segmentos(a, s2, x2.size), o1
+        else:
+            trecho, deslocamento = conv_segmentos(b, s1, x1.size), o2
+        y[deslocamento:deslocamento + trecho.size] = trecho
+        return y * tipo.type(dt)
+    if metodo == "numpy":
+        trecho = np.convolve(np.asarray(a, dtype=float), np.asarray(b, dtype=float), mode='full')
+    elif metodo == "fft":
+        from scipy import signal
+        trecho = signal.fftconvolve(a, b, mode='full')
+    elif metodo == "overlap-add":
+        from scipy import signal
+        trecho = signal.oaconvolve(a, b, mode='full')
+    else:
+        raise ValueError(f"Método discreto desconhecido: {metodo}")
+
+    y[o1 + o2:o1 + o2 + trecho.size] = trecho
+    return y * tipo.type(dt)
+
+# Grades por suporte: a grade da função de suporte mais largo tem no máximo este
+# múltiplo de N amostras (acima disso o dt comum é aumentado)
+MAX_FATOR_GRADE_LARGA = 4
+
+def grades_por_suporte(suporte_f, suporte_g, xmin, xmax, N):
+    """Grades de amostragem independentes para f e g, cada uma no próprio suporte
+
+    Cada suporte é recortado para [xmin, xmax] e dividido em células de largura dt,
+    amostradas no ponto médio: nenhuma amostra cai sobre a borda do suporte (onde
+    costuma haver um salto), e a soma discreta vira a regra do ponto médio. As duas
+    grades têm o mesmo dt (exigência da convolução discreta), escolhido para que a
+    função de suporte mais estreito receba N amostras; se com isso a outra passar de
+    MAX_FATOR_GRADE_LARGA·N amostras, dt aumenta até esse limite.
+
+    Retorna ((t0_f, n_f), (t0_g, n_g), dt), com as amostras em t0 + k·dt; uma função
+    cujo suporte não cruza o domínio (ou tem largura nula) recebe n = 0.
+    """
+    (grade_f, grade_g), dt = grades_por_suportes([suporte_f, suporte_g], xmin, xmax, N)
+    return grade_f, grade_g, dt
+
+def grades_por_suportes(suportes, xmin, xmax, N):
+    """Como grades_por_suporte, para qualquer número de funções: ([(t0, n), ...], dt)"""
+    trechos = [(max(suporte["inicio"], xmin), min(suporte["fim"], xmax)) for suporte in suportes]
+    larguras = [max(fim - inicio, 0.0) for inicio, fim in trechos]
+    positivas = [largura for largura in larguras if largura > 0]
+    if positivas:
+        dt = max(min(positivas) / N, max(positivas) / (MAX_FATOR_GRADE_LARGA * N))
+    else:
+        dt = (xmax - xmin) / N
+    # A última célula pode passar do fim do suporte (lá a função vale 0)
+    grades = [(inicio + dt / 2, int(np.ceil(largura / dt - 1e-9)))
+              for (inicio, _), largura in zip(trechos, larguras)]
+    return grades, dt
+
+def amostrar_grade(func, t0, n, dt, tipo="float64"):
+    """Amostra func em t0 + k·dt, k = 0..n-1, retornando (t, x); x é guardado com o dtype tipo"""
+    t = t0 + dt * np.arange(n)
+    # Expressões constantes (ex.: "1") retornam escalar
+    return t, np.broadcast_to(np.asarray(func(t), dtype=float), t.shape).astype(tipo)
+
+def intervalo_convolucao(suporte_f, suporte_g, xmin, xmax):
+    """Trecho de [2·xmin, 2·xmax] dentro de supp(f) + supp(g), ou None se for vazio
+
+    Fora de supp(f) + supp(g) a convolução é identicamente nula e não precisa ser
+    calculada.
+    """
+    inicio = max(xmin + xmin, suporte_f["inicio"] + suporte_g["inicio"])
+    fim = min(xmax + xmax, suporte_f["fim"] + suporte_g["fim"])
+    return (inicio, fim) if inicio < fim else None
+
+# Modo "tolerancia": maior número de amostras por sinal tentado pelos métodos discretos
+# antes de passar para a quadratura
+N_MAX_TOLERANCIA = 2 ** 20 + 1
+# Ordem de convergência assumida para prever quantas duplicações faltam enquanto só há
+# uma estimativa de erro (funções suaves); o erro informado usa ordem 1 até ela ser medida
+ORDEM_PADRAO = 2.0
+# Máximo de painéis por segmento na etapa de quadratura e faixa de painéis da última
+# etapa (quadratura refinada, só nos pontos que não atingiram o alvo)
+PAINEIS_QUADRATURA = 256
+PAINEIS_REFINADOS = (512, 8192)
+# Máximo de avaliações do integrando na última etapa; descontinuidades que não aparecem
+# como constantes na expressão (ex.: t>k*0.1) fariam a quadratura dobrar painéis sem fim
+MAX_AVALIACOES_REFINO = 30_000_000
+
+def _suporte_no_dominio(suporte, xmin, xmax):
+    """Suporte restrito a [xmin, xmax]: os métodos discretos só enxergam o sinal no domínio"""
+    return {"inicio": max(suporte["inicio"], xmin), "fim": min(suporte["fim"], xmax),
+            "quebras": suporte["quebras"]}
+
+def _tem_descontinuidade(suporte, xmin, xmax):
+    """Se há quebras ou bordas de intervalo dentro do domínio (onde o erro discreto é errático)"""
+    pontos = [suporte["inicio"], suporte["fim"]] + list(suporte["quebras"])
+    return any(xmin < p < xmax for p in pontos)
+
+def _amostrar_e_convoluir(f, g, xmin, xmax, N):
+    t = np.linspace(xmin, xmax, N)
+    x1 = np.broadcast_to(np.asarray(f(t), dtype=float), t.shape)
+    x2 = np.broadcast_to(np.asarray(g(t), dtype=float), t.shape)
+    return conv_discreta(x1, x2, t[1] - t[0], "auto")
+
+def conv_com_tolerancia(f, g, suporte_f, suporte_g, xmin, xmax, N, tol_abs=1e-6, tol_rel=1e-4,
+                        n_max=N_MAX_TOLERANCIA, progresso=None, medicao=None):
+    """Convolução no domínio [xmin, xmax] com erro estimado abaixo de max(tol_abs, tol_rel·pico)
+
+    Calcula o mesmo que os métodos discretos (f e g restritos ao domínio), escalando só
+    o necessário:
+      1. métodos discretos (motor "auto") com N, 2N-1, 4N-3... amostras: as grades são
+         aninhadas e a diferença entre dois níveis estima o erro (Richardson), com a
+         ordem de convergência observada. Se o número de amostras necessário para o
+         alvo passar de n_max, desiste deste caminho. Com descontinuidades dentro do
+         domínio (quebras de np.where, bordas de intervalo) esta etapa é pulada: se
+         uma borda cai sobre a grade, o arredondamento decide de que lado fica a
+         amostra e a diferença entre níveis deixa de estimar o erro;
+      2. quadratura de Gauss-Kronrod vetorizada com os suportes e quebras
+         (conv_continua_lote) na grade de saída de N amostras;
+      3. a mesma quadratura com muito mais painéis, só nos pontos que ainda excedem o alvo.
+
+    Retorna (ty, y, erro, info): erro é a estimativa por ponto, e info descreve a etapa
+    usada ("estrategia"), o erro estimado máximo, o alvo e se ele foi atingido.
+    """
+    def avisar(fracao):
+        if progresso is not None:
+            progresso(fracao)
+
+    niveis = []
+    alvo = tol_abs
+    n, y_ant, e_ant = N, None, None
+    descontinuo = _tem_descontinuidade(suporte_f, xmin, xmax) or _tem_descontinuidade(suporte_g, xmin, xmax)
+    # 1. Discreto com grades aninhadas (cada nível tem dt/2)
+    while not descontinuo:
+        y = _amostrar_e_convoluir(f, g, xmin, xmax, n)
+        if y_ant is not None:
+            diferenca = np.abs(y[::2] - y_ant)
+            e = float(np.max(diferenca))
+            ordem = 1.0
+            if e_ant is not None and e > 0:
+                ordem = float(np.clip(np.log2(e_ant / e), 1.0, 4.0))
+            alvo = max(tol_abs, tol_rel * float(np.max(np.abs(y))))
+            # Erro do nível fino ≈ diferença / (2^p - 1)
+            erro_max = e / (2 ** ordem - 1)
+            niveis.append({"N": n, "erro_estimado": erro_max, "ordem": ordem})
+            if medicao is not None:
+                medicao.contar("niveis_discretos")
+            if erro_max <= alvo:
+                erro = np.repeat(diferenca / (2 ** ordem - 1), 2)[:y.size]
+                ty = np.linspace(2 * xmin, 2 * xmax, y.size)
+                info = {"estrategia": f"discreto N={n}", "erro_estimado": erro_max, "alvo": alvo,
+                        "atingida": True, "niveis": niveis}
+                avisar(1.0)
+                return ty, y, erro, info
+            # Quantas duplicações ainda faltariam, pela ordem observada
+            ordem_prevista = ordem if e_ant is not None else ORDEM_PADRAO
+            faltam = int(np.ceil(np.log2(erro_max / alvo) / ordem_prevista))
+            e_ant = e
+            if (n - 1) * 2 ** faltam + 1 > n_max:
+                break
+        if 2 * n - 1 > n_max:
+            break
+        y_ant, n = y, 2 * n - 1
+        avisar(min(0.3, 0.05 * len(niveis) + 0.05))
+
+    # 2. Quadratura com suportes e quebras, na grade de saída de N amostras
+    suporte_f = _suporte_no_dominio(suporte_f, xmin, xmax)
+    suporte_g = _suporte_no_dominio(suporte_g, xmin, xmax)
+    ty = np.linspace(2 * xmin, 2 * xmax, 2 * N - 1)
+    y, erro = conv_continua_lote(f, g, ty, suporte_f, suporte_g, tol_abs=alvo, tol_rel=tol_rel,
+                                 paineis_max=PAINEIS_QUADRATURA, progresso=lambda fr: avisar(0.3 + 0.6 * fr), medicao=medicao)
+    alvo = max(tol_abs, tol_rel * float(np.max(np.abs(y), initial=0)))
+    estrategia = "quadratura"
+
+    # 3. Quadratura refinada, só nos pontos acima do alvo
+    acima = np.flatnonzero(erro > alvo)
+    paineis_iniciais, paineis_max = PAINEIS_REFINADOS
+    if acima.size:
+        # Limita os painéis para que, no pior caso (todas as dobras), o custo caiba no orçamento
+        n_segmentos = _cortes_por_linha(ty[acima], suporte_f, suporte_g)[0].shape[1] - 1
+        while paineis_max > PAINEIS_QUADRATURA and \
+                acima.size * n_segmentos * 15 * 2 * paineis_max > MAX_AVALIACOES_REFINO:
+            paineis_max //= 2
+    if acima.size and paineis_max > PAINEIS_QUADRATURA:
+        estrategia = "quadratura refinada"
+        paineis_iniciais = min(paineis_iniciais, paineis_max)
+        y[acima], erro[acima] = conv_continua_lote(f, g, ty[acima], suporte_f, suporte_g, tol_abs=alvo,
+                                                   tol_rel=0.0, paineis_iniciais=paineis_iniciais,
+                                                   paineis_max=paineis_max,
+                                                   escala=max(1.0, np.ptp(ty) / 4),
+                                                   progresso=lambda fr: avisar(0.9 + 0.1 * fr),
+                                                   medicao=medicao)
+    erro_max = float(np.max(erro, initial=0))
+    info = {"estrategia": estrategia, "erro_estimado": erro_max, "alvo": alvo,
+            "atingida": erro_max <= alvo, "niveis": niveis}
+    avisar(1.0)
+    return ty, y, erro, info
+
+def calcular_convolucao(params, progresso=None, tempos=None, medicao=None):
+    """Amostra f e g e calcula a convolução pelo método escolhido
+
+    params usa as mesmas chaves dos exemplos ("f1", "f1_interval", "f1_x1", "f1_x2",
+    "f2", ...) mais "xmin", "xmax", "N" e "method". As chaves opcionais "workers"
+    (processos do método contínuo; None = automático, padrão 1) e "bloco" (pontos por
+    bloco) controlam o modo paralelo; "tol_abs" e "tol_rel" são as tolerâncias do
+    método "tolerancia" (ver conv_com_tolerancia). O método "analitico" calcula o mesmo
+    que "scipy" pela forma fechada (ver analitico.conv_analitica) quando f e g são
+    reconhecidas, e pela integração numérica caso contrário. O método "quad" integra
+    ponto a ponto com integrate.quad (conv_continua), com o integrando nativo do
+    Numba quando instalado (ver nativo.integrando_nativo). "grades" = "suporte" (padrão)
+    amostra cada função só no próprio suporte, com dt comum (ver grades_por_suporte);
+    "dominio" amostra as duas em linspace(xmin, xmax, N). progresso, se dado, é
+    chamado com a fração concluída (0 a 1) e pode levantar CalculoCancelado para
+    interromper. Se tempos
+    for um dict, recebe a duração em segundos das etapas "compilacao", "amostragem"
+    e "convolucao". Se medicao (instrumentacao.Medicao) for dada, recebe as mesmas
+    etapas, os contadores da integração e os tamanhos dos arrays. "tipo_numerico" =
+    "float32" guarda x1 e x2 (e y, nos métodos discretos) em precisão simples; os
+    eixos de tempo e os métodos contínuos continuam em float64 (ver relatorio_precisao).
+
+    Retorna um dict com t1, x1, t2, x2, ty, y e erro (None nos métodos discretos, no
+    "quad" e na forma fechada); no método "tolerancia", também "precisao" (o info de
+    conv_com_tolerancia), e no "analitico", "forma_fechada" (True se foi usada).
+    """
+    def avisar(fracao):
+        if progresso is not None:
+            progresso(fracao)
+
+    xmin, xmax, N = params["xmin"], params["xmax"], params["N"]
+    tipo = np.dtype(params.get("tipo_numerico", "float64"))
+    if tempos is None:
+        tempos = {}
+    marco = time.perf_counter()
+
+    def fim_etapa(nome):
+        nonlocal marco
+        agora = time.perf_counter()
+        tempos[nome] = agora - marco
+        if medicao is not None:
+            medicao.registrar_etapa(nome, marco, agora - marco)
+        marco = agora
+
+    # Criar funções com intervalos
+    func1_with_interval, suporte1 = criar_funcao_intervalo(params["f1"], params["f1_interval"],
+                                                           params["f1_x1"], params["f1_x2"])
+    func2_with_interval, suporte2 = criar_funcao_intervalo(params["f2"], params["f2_interval"],
+                                                           params["f2_x1"], params["f2_x2"])
+    fim_etapa("compilacao")
+
+    # Gerar sinais: cada função na própria grade ("suporte") ou as duas em
+    # linspace(xmin, xmax, N) ("dominio"; o modo "tolerancia" sempre usa o domínio)
+    avisar(0.0)
+    if amostra_por_suporte(params):
+        (inicio1, n1), (inicio2, n2), dt = grades_por_suporte(suporte1, suporte2, xmin, xmax, N)
+        t1, x1 = amostrar_grade(func1_with_interval, inicio1, n1, dt, tipo)
+        avisar(0.05)
+        t2, x2 = amostrar_grade(func2_with_interval, inicio2, n2, dt, tipo)
+    else:
+        dt = (xmax - xmin) / (N - 1)
+        t1, x1 = gerar_sinal(func1_with_interval, xmin, xmax, N)
+        avisar(0.05)
+        t2, x2 = gerar_sinal(func2_with_interval, xmin, xmax, N)
+        if tipo != np.float64:
+            x1, x2 = x1.astype(tipo), x2.astype(tipo)
+    avisar(0.1)
+    fim_etapa("amostragem")
+
+    ty, y, erro, precisao = convoluir_amostras(params, (func1_with_interval, func2_with_interval),
+                                               (suporte1, suporte2), (t1, x1, t2, x2), dt,
+                                               progresso=lambda fr: avisar(0.1 + 0.9 * fr), medicao=medicao)
+    fim_etapa("convolucao")
+    avisar(1.0)
+    return montar_resultado(params, (t1, x1, t2, x2), ty, y, erro, precisao, medicao)
+
+def amostra_por_suporte(params):
+    """Se f e g são amostradas cada uma no próprio suporte (ver grades_por_suporte)"""
+    return params.get("grades", "suporte") == "suporte" and params["method"] != "tolerancia"
+
+def convoluir_amostras(params, funcoes, suportes, amostras, dt, progresso=None, medicao=None,
+                       discreta=conv_discreta):
+    """Etapa de convolução de calcular_convolucao, com f e g já amostradas
+
+    funcoes e suportes são os pares (f, g) de criar_funcao_intervalo e amostras é
+    (t1, x1, t2, x2), com espaçamento dt. Os métodos discretos usam
+    discreta(x1, x2, dt, metodo, tipo) (PipelineConvolucao passa uma versão com
+    espectros e segmentos memorizados); os contínuos usam as funções. progresso
+    recebe a fração concluída desta etapa. Retorna (ty, y, erro, precisao), com
+    precisao None fora do método "tolerancia".
+    """
+    def avisar(fracao):
+        if progresso is not None:
+            progresso(fracao)
+
+    xmin, xmax, N, method = params["xmin"], params["xmax"], params["N"], params["method"]
+    tipo = np.dtype(params.get("tipo_numerico", "float64"))
+    (func1, func2), (suporte1, suporte2), (t1, x1, t2, x2) = funcoes, suportes, amostras
+    precisao = None
+    if method in METODOS_DISCRETOS:
+        erro = None
+        if t1.size and t2.size:
+            y = discreta(x1, x2, dt, method, tipo)
+            ty = t1[0] + t2[0] + dt * np.arange(len(y))
+        else:
+            ty, y = np.array([xmin + xmin, xmax + xmax]), np.zeros(2, dtype=tipo)  # f ou g é nula no domínio
+    elif method == "tolerancia":
+        ty, y, erro, precisao = conv_com_tolerancia(func1, func2, suporte1, suporte2, xmin, xmax, N,
+                                                    params.get("tol_abs", 1e-6), params.get("tol_rel", 1e-4),
+                                                    progresso=avisar, medicao=medicao)
+    else:  # scipy, quad ou analitico
+        # O domínio da convolução contínua é a soma dos domínios das funções originais;
+        # com grades por suporte, só o trecho em supp(f) + supp(g) é integrado
+        spec1 = (params["f1"], params["f1_interval"], params["f1_x1"], params["f1_x2"])
+        spec2 = (params["f2"], params["f2_interval"], params["f2_x1"], params["f2_x2"])
+        if amostra_por_suporte(params):
+            trecho = intervalo_convolucao(suporte1, suporte2, xmin, xmax)
+        else:
+            trecho = (xmin + xmin, xmax + xmax)
+        if trecho is None:
+            ty, y, erro = np.array([xmin + xmin, xmax + xmax]), np.zeros(2), np.zeros(2)
+        else:
+            ty = np.linspace(*trecho, N * 2) # Dobrar o número de pontos para melhor resolução
+            workers = params.get("workers", 1)
+            if workers is None and len(ty) < LIMIAR_PARALELO:
+                workers = 1
+            y = conv_analitica(spec1, spec2, ty) if method == "analitico" else None
+            if y is not None:
+                erro = None
+            elif method == "quad" and workers == 1:
+                y, erro = conv_continua(func1, func2, ty, suporte1, suporte2, progresso=avisar,
+                                        medicao=medicao), None
+            elif workers == 1:
+                y, erro = conv_continua_lote(func1, func2, ty, suporte1, suporte2, progresso=avisar,
+                                             medicao=medicao)
+            else:
+                y, erro = conv_continua_paralela(spec1, spec2, ty, workers, params.get("bloco"),
+                                                 motor="quad" if method == "quad" else "lote",
+                                                 progresso=avisar, medicao=medicao)
+    return ty, y, erro, precisao
+
+def montar_resultado(params, amostras, ty, y, erro, precisao, medicao=None):
+    """Dict de resultado de calcular_convolucao (e registro dos arrays em medicao)"""
+    t1, x1, t2, x2 = amostras
+    resultado = {"t1": t1, "x1": x1, "t2": t2, "x2": x2, "ty": ty, "y": y, "erro": erro}
+    if params["method"] == "analitico":
+        resultado["forma_fechada"] = erro is None
+    if precisao is not None:
+        resultado["precisao"] = precisao
+        if medicao is not None:
+            medicao.info["precisao"] = {k: v for k, v in precisao.items() if k != "niveis"}
+    registrar_arrays(medicao, resultado)
+    return resultado
+
+def relatorio_precisao(params):
+    """Calcula params em float32 e em float64 e compara os dois resultados
+
+    Retorna {"x1": ..., "x2": ..., "y": ...} com o erro máximo de cada array em float32
+    ("erro_abs" e "erro_rel", relativo ao pico em float64), mais "bytes" e "tempos_s"
+    (de x1 + x2 + y e do cálculo, por tipo). Expressões com np.random recebem os
+    mesmos sorteios nos dois cálculos.
+    """
+    estado_aleatorio = np.random.get_state()
+    # Um cálculo pequeno antes, para que a compilação das expressões e as importações do
+    # scipy não entrem no tempo do primeiro tipo
+    calcular_convolucao(dict(params, N=min(params["N"], 256)))
+    resultados, tempos = {}, {}
+    for tipo in TIPOS_NUMERICOS:
+        np.random.set_state(estado_aleatorio)
+        inicio = time.perf_counter()
+        resultados[tipo] = calcular_convolucao(dict(params, tipo_numerico=tipo))
+        tempos[tipo] = time.perf_counter() - inicio
+    relatorio = {"tempos_s": tempos,
+                 "bytes": {tipo: sum(np.asarray(r[nome]).nbytes for nome in ("x1", "x2", "y"))
+                           for tipo, r in resultados.items()}}
+    for nome in ("x1", "x2", "y"):
+        referencia = np.asarray(resultados["float64"][nome], dtype=float)
+        erro_abs = float(np.max(np.abs(np.asarray(resultados["float32"][nome], dtype=float) - referencia),
+                                initial=0.0))
+        escala = float(np.max(np.abs(referencia), initial=0.0))
+        relatorio[nome] = {"erro_abs": erro_abs, "erro_rel": erro_abs / escala if escala > 0 else None}
+    return relatorio
+
+def registrar_arrays(medicao, resultado):
+    """Registra em medicao (se dada) a forma e os bytes de cada array do resultado"""
+    if medicao is None:
+        return
+    for nome in ("t1", "x1", "t2", "x2", "ty", "y", "erro"):
+        medicao.registrar_array(nome, resultado.get(nome))
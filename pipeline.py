@@ -0,0 +1,264 @@
+"""Recalculo incremental: cada etapa do cálculo é memorizada pelas suas próprias entradas
+
+Etapas:
+    amostragem de f  -> depende só de f (expressão + intervalo) e da grade
+    amostragem de g  -> depende só de g e da grade
+    espectros        -> FFT de cada amostragem (usada quando o método discreto é FFT)
+    segmentos        -> trechos constantes de cada amostragem (método "auto"/"esparso")
+    convolução       -> depende das duas amostragens (ou dos espectros) e do método
+
+Assim, editar apenas g reaproveita as amostras e o espectro de f. As amostras ficam
+guardadas numa rede t0 + k·dt: se a nova grade tiver o mesmo dt e cair na mesma rede
+(por exemplo, ao ampliar o domínio mantendo dt), apenas as amostras novas são
+calculadas.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from cache_resultados import normalizar_funcao
+from expressoes import criar_funcao_intervalo
+from nucleo import (amostra_por_suporte, aparar_zeros, conv_discreta, convoluir_amostras, escolher_metodo_discreto,
+                    grades_por_suporte, montar_resultado, segmentos_constantes, METODOS_DISCRETOS)
+
+# Quantas entradas cada etapa guarda (as menos usadas recentemente são descartadas)
+MAX_ENTRADAS_POR_ETAPA = 8
+# Uma rede de amostras só é estendida até este múltiplo de N; acima disso recomeça
+MAX_EXTENSAO_REDE = 4
+
+class _Memo:
+    """Dict LRU pequeno e protegido por trava (a pipeline é usada pela thread de trabalho)"""
+
+    def __init__(self, max_entradas=MAX_ENTRADAS_POR_ETAPA):
+        self.max_entradas = max_entradas
+        self._itens = OrderedDict()
+        self._trava = threading.Lock()
+
+    def obter(self, chave):
+        with self._trava:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                return self._itens[chave]
+        return None
+
+    def guardar(self, chave, valor):
+        with self._trava:
+            self._itens[chave] = valor
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_entradas:
+                self._itens.popitem(last=False)
+
+    def itens(self):
+        with self._trava:
+            return list(self._itens.items())
+
+    def limpar(self):
+        with self._trava:
+            self._itens.clear()
+
+def _como_vetor(valores, t, tipo=np.float64):
+    """Expressões constantes (ex.: "1") retornam escalar; expande para o tamanho de t"""
+    return np.broadcast_to(np.asarray(valores, dtype=float), t.shape).astype(tipo)
+
+class PipelineConvolucao:
+    """Calcula a convolução reaproveitando as etapas cujas entradas não mudaram
+
+    calcular() aceita os mesmos params e retorna o mesmo dict que
+    nucleo.calcular_convolucao, mais a chave "etapas", que indica para cada etapa se
+    ela foi "reusada", "parcial" (só amostras novas) ou "calculada". A escolha e o
+    cálculo do método ficam em nucleo.convoluir_amostras; aqui só a amostragem, os
+    espectros, os segmentos e as convoluções são memorizados.
+    """
+
+    def __init__(self):
+        self._redes = _Memo()        # chave da função -> lista de redes (t0, dt, valores)
+        self._espectros = _Memo()    # (chave da amostra, nfft) -> rfft
+        self._segmentos = _Memo()    # chave da amostra -> (segmentos_constantes ou None,)
+        self._convolucoes = _Memo()  # (amostra f, amostra g, método) -> (ty, y, erro, precisão)
+
+    def limpar(self):
+        for memo in (self._redes, self._espectros, self._segmentos, self._convolucoes):
+            memo.limpar()
+
+    def _amostrar(self, relatorio, nome, chave_funcao, func, xmin, xmax, N, tipo=np.float64):
+        """Amostra func em linspace(xmin, xmax, N), reaproveitando redes com o mesmo dt
+
+        As amostras são guardadas com o dtype tipo; chave_funcao deve distinguir os tipos.
+        relatorio[nome] recebe como a etapa foi feita.
+        """
+        t = np.linspace(xmin, xmax, N)
+        if chave_funcao is None or N < 2:
+            # Expressões aleatórias (ou grades degeneradas) não são memorizadas
+            relatorio[nome] = "calculada"
+            return t, _como_vetor(func(t), t, tipo), None
+        dt = (xmax - xmin) / (N - 1)
+
+        redes = self._redes.obter(chave_funcao) or []
+        for i, (t0, dt_rede, valores) in enumerate(redes):
+            if not math.isclose(dt, dt_rede, rel_tol=1e-12):
+                continue
+            deslocamento = (xmin - t0) / dt
+            k = round(deslocamento)
+            if abs(deslocamento - k) > 1e-6:
+                continue  # mesmo dt, mas a grade não cai sobre a rede
+            n_rede = valores.size
+            inicio, fim = k, k + N  # índices da nova grade na rede, [inicio, fim)
+            if fim < 0 or inicio > n_rede or max(fim, n_rede) - min(inicio, 0) > MAX_EXTENSAO_REDE * N:
+                continue
+            # Calcula só os trechos da nova grade que ficam fora da rede
+            partes = []
+            if inicio < 0:
+                t_esq = t0 + np.arange(inicio, 0) * dt
+                partes.append(_como_vetor(func(t_esq), t_esq, tipo))
+            partes.append(valores)
+            if fim > n_rede:
+                t_dir = t0 + np.arange(n_rede, fim) * dt
+                partes.append(_como_vetor(func(t_dir), t_dir, tipo))
+            novos = np.concatenate(partes) if len(partes) > 1 else valores
+            novo_t0 = t0 + min(inicio, 0) * dt
+            redes = redes[:i] + [(novo_t0, dt, novos)] + redes[i + 1:]
+            self._redes.guardar(chave_funcao, redes)
+            relatorio[nome] = "reusada" if len(partes) == 1 else "parcial"
+            desloc = inicio - min(inicio, 0)
+            x = novos[desloc:desloc + N]
+            return t, x, (chave_funcao, novo_t0 + desloc * dt, dt, N)
+
+        x = _como_vetor(func(t), t, tipo)
+        self._redes.guardar(chave_funcao, (redes + [(xmin, dt, x)])[-MAX_ENTRADAS_POR_ETAPA:])
+        relatorio[nome] = "calculada"
+        return t, x, (chave_funcao, xmin, dt, N)
+
+    def _espectro(self, relatorio, nome, chave_amostra, x, nfft):
+        chave = None if chave_amostra is None else (chave_amostra, nfft)
+        espectro = None if chave is None else self._espectros.obter(chave)
+        if espectro is not None:
+            relatorio[nome] = "reusada"
+            return espectro
+        from scipy import fft as sp_fft
+        espectro = sp_fft.rfft(x, nfft)
+        if chave is not None:
+            self._espectros.guardar(chave, espectro)
+        relatorio[nome] = "calculada"
+        return espectro
+
+    def _detectar_segmentos(self, chave_amostra, x):
+        """Segmentos constantes de uma amostra (ver nucleo.segmentos_constantes), memorizados"""
+        memorizado = None if chave_amostra is None else self._segmentos.obter(chave_amostra)
+        if memorizado is not None:
+            return memorizado[0]
+        segmentos = segmentos_constantes(x)
+        if chave_amostra is not None:
+            self._segmentos.guardar(chave_amostra, (segmentos,))
+        return segmentos
+
+    def calcular(self, params, progresso=None, tempos=None, medicao=None):
+        """Mesma interface de nucleo.calcular_convolucao, com reaproveitamento de etapas"""
+        def avisar(fracao):
+            if progresso is not None:
+                progresso(fracao)
+
+        if tempos is None:
+            tempos = {}
+        marco = time.perf_counter()
+
+        def fim_etapa(etapa):
+            nonlocal marco
+            agora = time.perf_counter()
+            tempos[etapa] = agora - marco
+            if medicao is not None:
+                medicao.registrar_etapa(etapa, marco, agora - marco)
+            marco = agora
+
+        relatorio = {}  # por chamada: uma tarefa descartada pela interface não o altera
+        xmin, xmax, N, method = params["xmin"], params["xmax"], params["N"], params["method"]
+        spec1 = (params["f1"], params["f1_interval"], params["f1_x1"], params["f1_x2"])
+        spec2 = (params["f2"], params["f2_interval"], params["f2_x1"], params["f2_x2"])
+        func1, suporte1 = criar_funcao_intervalo(*spec1)
+        func2, suporte2 = criar_funcao_intervalo(*spec2)
+        chave1 = normalizar_funcao(*spec1)
+        chave2 = normalizar_funcao(*spec2)
+        tipo = np.dtype(params.get("tipo_numerico", "float64"))
+        if tipo != np.float64:
+            # Amostras (e, por consequência, espectros e convoluções) memorizadas por tipo
+            chave1 = None if chave1 is None else (chave1, tipo.name)
+            chave2 = None if chave2 is None else (chave2, tipo.name)
+        fim_etapa("compilacao")
+
+        avisar(0.0)
+        por_suporte = amostra_por_suporte(params)
+        if por_suporte:
+            # Cada função na própria grade (mesmo dt); ver nucleo.grades_por_suporte
+            (inicio1, n1), (inicio2, n2), dt = grades_por_suporte(suporte1, suporte2, xmin, xmax, N)
+            t1, x1, amostra1 = self._amostrar(relatorio, "f", chave1, func1, inicio1, inicio1 + (n1 - 1) * dt, n1,
+                                              tipo)
+            avisar(0.05)
+            t2, x2, amostra2 = self._amostrar(relatorio, "g", chave2, func2, inicio2, inicio2 + (n2 - 1) * dt, n2,
+                                              tipo)
+        else:
+            dt = (xmax - xmin) / (N - 1)
+            t1, x1, amostra1 = self._amostrar(relatorio, "f", chave1, func1, xmin, xmax, N, tipo)
+            avisar(0.05)
+            t2, x2, amostra2 = self._amostrar(relatorio, "g", chave2, func2, xmin, xmax, N, tipo)
+        avisar(0.1)
+        fim_etapa("amostragem")
+
+        memorizavel = amostra1 is not None and amostra2 is not None
+        if method in METODOS_DISCRETOS:
+            chave_conv = (amostra1, amostra2, method) if memorizavel else None
+        else:
+            tolerancias = (params.get("tol_abs"), params.get("tol_rel")) if method == "tolerancia" else None
+            chave_conv = ((chave1, chave2, xmin, xmax, N, method, tolerancias, por_suporte)
+                          if memorizavel else None)
+        memorizado = None if chave_conv is None else self._convolucoes.obter(chave_conv)
+
+        def discreta(x1, x2, dt, metodo, tipo):
+            """conv_discreta com os segmentos e os espectros memorizados por amostragem"""
+            segmentos = None
+            if metodo == "auto":
+                # Pulsos e trens de pulsos são detectados uma vez por amostragem
+                segmentos = (self._detectar_segmentos(amostra1, x1), self._detectar_segmentos(amostra2, x2))
+                metodo = escolher_metodo_discreto(aparar_zeros(x1)[1].size, aparar_zeros(x2)[1].size, *segmentos)
+            if metodo != "fft":
+                return conv_discreta(x1, x2, dt, metodo, tipo, segmentos)
+            from scipy import fft as sp_fft
+            # nfft depende só do tamanho das grades, não dos valores: editar g sem mudar o
+            # seu suporte reaproveita o espectro de f. Amostras float32 dão espectros complex64
+            n_saida = x1.size + x2.size - 1
+            nfft = sp_fft.next_fast_len(n_saida, real=True)
+            espectro1 = self._espectro(relatorio, "espectro_f", amostra1, x1, nfft)
+            espectro2 = self._espectro(relatorio, "espectro_g", amostra2, x2, nfft)
+            return sp_fft.irfft(espectro1 * espectro2, nfft)[:n_saida] * tipo.type(dt)
+
+        if memorizado is not None:
+            ty, y, erro, precisao = memorizado
+            relatorio["convolucao"] = "reusada"
+        else:
+            ty, y, erro, precisao = convoluir_amostras(params, (func1, func2), (suporte1, suporte2),
+                                                       (t1, x1, t2, x2), dt,
+                                                       progresso=lambda fr: avisar(0.1 + 0.9 * fr),
+                                                       medicao=medicao, discreta=discreta)
+            relatorio["convolucao"] = "calculada"
+            if chave_conv is not None:
+                self._convolucoes.guardar(chave_conv, (ty, y, erro, precisao))
+        fim_etapa("convolucao")
+        avisar(1.0)
+
+        if medicao is not None:
+            medicao.info["etapas"] = dict(relatorio)
+        resultado = montar_resultado(params, (t1, x1, t2, x2), ty, y, erro, precisao, medicao)
+        resultado["etapas"] = relatorio
+        return resultado
+
+def ajustar_dominio_a_rede(xmin_ant, xmax_ant, N_ant, xmin, xmax):
+    """Ajusta um novo domínio para a rede do anterior (mesmo dt), retornando (xmin, xmax, N)
+
+    Usado pela opção "manter dt": os limites são arredondados para o múltiplo de dt
+    mais próximo, de modo que as amostras já calculadas sejam reaproveitadas.
+    """
+    dt = (xmax_ant - xmin_ant) / (N_ant - 1)
+    xmin = xmin_ant + round((xmin - xmin_ant) / dt) * dt
+    xmax = xmin_ant + round((xmax - xmin_ant) / dt) * dt
+    return xmin, xmax, int(round((xmax - xmin) / dt)) + 1
@@ -0,0 +1,140 @@
+"""Varredura de parâmetro: convolução de uma f fixa com uma família g(t; a)
+
+A expressão de g usa um parâmetro além de t (ex.: "np.exp(-a*t)"), com uma faixa
+de valores. Todas as variantes são amostradas numa única avaliação vetorizada
+(array 2D valores × amostras) e convoluídas com f por uma FFT em lote contra o
+espectro de f, calculado uma só vez. O eixo do parâmetro é processado em blocos,
+de modo que a memória de trabalho não depende do número de valores.
+
+Nada aqui importa tkinter ou matplotlib.
+"""
+import time
+
+import numpy as np
+from scipy import fft as sp_fft
+
+from expressoes import BUILTINS_PERMITIDOS, compilar_expressao, criar_funcao_intervalo, limites_intervalo
+from nucleo import amostrar_grade, grades_por_suporte, registrar_arrays
+
+# Memória de trabalho aproximada de cada bloco de variantes (amostras, espectros e saída)
+MAX_BYTES_BLOCO = 64 * 1024 ** 2
+
+def valores_parametro(inicio, fim, n, escala="linear"):
+    """n valores de inicio a fim, espaçados linearmente ou em escala logarítmica"""
+    if escala == "log":
+        if inicio <= 0 or fim <= 0:
+            raise ValueError("A escala logarítmica exige início e fim positivos")
+        return np.geomspace(inicio, fim, n)
+    return np.linspace(inicio, fim, n)
+
+def validar_parametro(nome):
+    """Levanta ValueError se nome não puder ser usado como parâmetro da expressão"""
+    if not nome.isidentifier() or nome in ("t", "np") or nome in BUILTINS_PERMITIDOS:
+        raise ValueError(f"Nome de parâmetro inválido: '{nome}'")
+
+def amostrar_familia(expressao, valores, t, inicio=-np.inf, fim=np.inf):
+    """Amostra expressao(t; a) para todos os valores de a, retornando (len(valores), len(t))
+
+    A avaliação é feita de uma vez, com t como linha e os valores como coluna. Se a
+    expressão não se comportar bem com arrays 2D (ex.: usa len(t)), a primeira linha
+    difere da avaliação 1D e cada valor é avaliado separadamente.
+    """
+    valores = np.asarray(valores, dtype=float)
+    forma = (valores.size, t.size)
+    linha0 = np.broadcast_to(np.asarray(expressao.avaliar(t, valores[0]), dtype=float), t.shape)
+    try:
+        familia = np.broadcast_to(np.asarray(expressao.avaliar(t[None, :], valores[:, None]), dtype=float),
+                                  forma)
+        vetorizada = np.allclose(familia[0], linha0, equal_nan=True)
+    except (ValueError, TypeError, IndexError):
+        vetorizada = False
+    if not vetorizada:
+        familia = np.empty(forma)
+        for i, a in enumerate(valores):
+            familia[i] = np.broadcast_to(np.asarray(expressao.avaliar(t, a), dtype=float), t.shape)
+    if np.isfinite(inicio) or np.isfinite(fim):
+        familia = np.where((t >= inicio) & (t <= fim), familia, 0.0)
+    return np.array(familia, dtype=float)  # cópia contígua (broadcast_to é só leitura)
+
+def _linhas_por_bloco(n2, nfft):
+    """Variantes por bloco: amostras (n2), espectro (nfft/2+1 complexos) e saída (nfft)"""
+    bytes_por_linha = 8 * (n2 + 2 * (nfft // 2 + 1) + nfft)
+    return max(1, MAX_BYTES_BLOCO // bytes_por_linha)
+
+def iterar_varredura(params, parametro, valores, progresso=None, medicao=None):
+    """Gerador da varredura: primeiro (t1, x1, t2, ty), depois (indices, x2, y) por bloco
+
+    params usa as mesmas chaves de nucleo.calcular_convolucao; f2 é a expressão com o
+    parâmetro. Os blocos podem ser gravados em disco à medida que chegam (ver
+    conv_varredura para o resultado completo em memória).
+    """
+    validar_parametro(parametro)
+    valores = np.asarray(valores, dtype=float)
+    xmin, xmax, N = params["xmin"], params["xmax"], params["N"]
+    marco = time.perf_counter()
+
+    func1, suporte1 = criar_funcao_intervalo(params["f1"], params["f1_interval"], params["f1_x1"], params["f1_x2"])
+    # O intervalo de g não depende do parâmetro; a expressão é compilada com ele
+    inicio_g, fim_g = limites_intervalo(params["f2_interval"], params["f2_x1"], params["f2_x2"])
+    suporte2 = {"inicio": inicio_g, "fim": fim_g, "quebras": []}
+    expressao2 = compilar_expressao(params["f2"], (parametro,))
+    if medicao is not None:
+        medicao.registrar_etapa("compilacao", marco, time.perf_counter() - marco)
+
+    if params.get("grades", "suporte") == "suporte":
+        (inicio1, n1), (inicio2, n2), dt = grades_por_suporte(suporte1, suporte2, xmin, xmax, N)
+    else:
+        (inicio1, n1), (inicio2, n2), dt = (xmin, N), (xmin, N), (xmax - xmin) / (N - 1)
+    t1, x1 = amostrar_grade(func1, inicio1, n1, dt)
+    t2 = inicio2 + dt * np.arange(n2)
+    if n1 and n2:
+        n_saida = n1 + n2 - 1
+        ty = (inicio1 + inicio2) + dt * np.arange(n_saida)
+    else:
+        n_saida = 0  # f ou g é nula no domínio (como em nucleo.calcular_convolucao)
+        ty = np.array([xmin + xmin, xmax + xmax])
+    yield t1, x1, t2, ty
+
+    nfft = sp_fft.next_fast_len(max(n_saida, 1), real=True)
+    marco = time.perf_counter()
+    espectro1 = sp_fft.rfft(x1, nfft)  # compartilhado por todas as variantes
+    if medicao is not None:
+        medicao.registrar_etapa("espectro_f", marco, time.perf_counter() - marco)
+
+    passo = _linhas_por_bloco(n2, nfft)
+    for inicio in range(0, valores.size, passo):
+        indices = np.arange(inicio, min(inicio + passo, valores.size))
+        marco = time.perf_counter()
+        x2 = amostrar_familia(expressao2, valores[indices], t2, inicio_g, fim_g)
+        meio = time.perf_counter()
+        if n_saida:
+            y = sp_fft.irfft(espectro1 * sp_fft.rfft(x2, nfft, axis=1), nfft, axis=1)[:, :n_saida] * dt
+        else:
+            y = np.zeros((indices.size, ty.size))
+        if medicao is not None:
+            medicao.registrar_etapa("amostragem", marco, meio - marco)
+            medicao.registrar_etapa("convolucao", meio, time.perf_counter() - meio)
+            medicao.contar("blocos_varredura")
+        if progresso is not None:
+            progresso(indices[-1] / valores.size)
+        yield indices, x2, y
+
+def conv_varredura(params, parametro, valores, progresso=None, medicao=None):
+    """Convolução de f com g(t; a) para cada a em valores
+
+    Retorna um dict com t1, x1, t2, ty (comuns a todas as variantes), "valores", e
+    os arrays 2D x2 (len(valores), len(t2)) e y (len(valores), len(ty)).
+    """
+    valores = np.asarray(valores, dtype=float)
+    blocos = iterar_varredura(params, parametro, valores, progresso, medicao)
+    t1, x1, t2, ty = next(blocos)
+    x2 = np.empty((valores.size, t2.size))
+    y = np.empty((valores.size, ty.size))
+    for indices, x2_bloco, y_bloco in blocos:
+        x2[indices] = x2_bloco
+        y[indices] = y_bloco
+    resultado = {"t1": t1, "x1": x1, "t2": t2, "x2": x2, "ty": ty, "y": y, "valores": valores}
+    registrar_arrays(medicao, resultado)
+    if progresso is not None:
+        progresso(1.0)
+    return resultado